@@ -0,0 +1,65 @@
+# bench_fetch.py
+# Compare words/sec for different WORD_API batch sizes against a local stub
+#
+#   python -m benchmarks.bench_fetch --words 200 --latency 0.05
+#
+# Fetched stub words go to a word cache in a temporary directory, never
+# to the real word_cache.db.
+
+import argparse
+import os
+import tempfile
+import time
+import retrieve_word_fn
+from benchmarks.stub_api import StubWordServer
+from word_cache import WordCache
+
+
+def run(words: int, batch_sizes: list[int], latency: float, length: int = 6) -> list[dict]:
+    """Fetch `words` words for each batch size and return timing rows"""
+    results: list[dict] = []
+    saved_api, saved_cache = retrieve_word_fn.WORD_API, retrieve_word_fn.word_cache
+    with tempfile.TemporaryDirectory() as directory, StubWordServer(latency=latency) as server:
+        retrieve_word_fn.WORD_API = server.url
+        retrieve_word_fn.word_cache = WordCache(os.path.join(directory, "word_cache.db"))
+        try:
+            for batch_size in batch_sizes:
+                retrieve_word_fn.BATCH_SIZE = batch_size
+                retrieve_word_fn._word_buffer.clear()
+                served_before: int = server.requests_served
+
+                start: float = time.perf_counter()
+                for _ in range(words):
+                    if retrieve_word_fn.fetch_remote_word(length) is None:
+                        raise RuntimeError("stub server returned no words")
+                elapsed: float = time.perf_counter() - start
+
+                results.append({
+                    'batch_size': batch_size,
+                    'requests': server.requests_served - served_before,
+                    'seconds': elapsed,
+                    'words_per_sec': words / elapsed,
+                    'ms_per_word': elapsed / words * 1000,
+                })
+        finally:
+            retrieve_word_fn.word_cache.close()
+            retrieve_word_fn.WORD_API, retrieve_word_fn.word_cache = saved_api, saved_cache
+            retrieve_word_fn._word_buffer.clear()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark WORD_API batch sizes against a local stub")
+    parser.add_argument('--words', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.05, help="stub latency per request (s)")
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 5, 10, 50, 100])
+    args = parser.parse_args()
+
+    print(f"{'batch':>6} {'requests':>9} {'seconds':>9} {'words/s':>10} {'ms/word':>9}")
+    for row in run(args.words, args.batch_sizes, args.latency):
+        print(f"{row['batch_size']:>6} {row['requests']:>9} {row['seconds']:>9.3f} "
+              f"{row['words_per_sec']:>10.1f} {row['ms_per_word']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# bench_render.py
+# Frames/sec and bytes written per guess: os.system('clear') + full reprint
+# (the old display_game_state) against the ANSI diff renderer
+#
+#   python -m benchmarks.bench_render --games 20
+
+import argparse
+import io
+import os
+import random
+import sys
+import time
+import login_signup
+from engine import HangmanEngine
+from game import HangmanGame
+from render_cache import render_cache
+from renderer import Renderer
+
+LETTER_ORDER: str = "esiarntolcdupmghbyfvkwzxqj"
+
+
+class FakeTTY(io.BytesIO):
+    """Byte sink that claims to be a terminal"""
+
+    def isatty(self) -> bool:
+        return True
+
+
+def game_frames(games: int, seed: int = 0) -> list[list[bytes]]:
+    """Frames a player would see, one per guess"""
+    rng = random.Random(seed)
+    login_signup.current_user = None
+    game = HangmanGame.__new__(HangmanGame)
+    game.reset_game()
+    frames: list[list[bytes]] = []
+    for _ in range(games):
+        game.reset_game()
+        game.difficulty = rng.choice(list(HangmanGame.word_lists))
+        game.engine = HangmanEngine(rng.choice(["kaleidoscope", "banana", "lighthouse",
+                                                "sophisticated", "marble"]),
+                                    game.difficulty, rng=rng)
+        game.max_wrong_guesses = game.engine.max_wrong_guesses
+        for letter in LETTER_ORDER:
+            frames.append(game.game_state_frame())
+            game.process_guess(letter)
+            if game.engine.finished:
+                break
+    return frames
+
+
+def bench_old(frames: list[list[bytes]]) -> tuple[float, int]:
+    """Spawn `clear` and print every line of every frame (to /dev/null)"""
+    written: int = 0
+    clear_bytes: int = len(b"\x1b[H\x1b[2J\x1b[3J")
+    with open(os.devnull, 'w') as devnull:
+        saved = sys.stdout
+        sys.stdout = devnull
+        try:
+            start: float = time.perf_counter()
+            for frame in frames:
+                os.system('clear > /dev/null 2>&1' if os.name != 'nt' else 'cls > NUL')
+                for line in frame:
+                    print(line.decode())
+                    written += len(line) + 1
+                written += clear_bytes
+            elapsed: float = time.perf_counter() - start
+        finally:
+            sys.stdout = saved
+    return elapsed, written
+
+
+def bench_new(frames: list[list[bytes]]) -> tuple[float, int]:
+    sink = FakeTTY()
+    # shutil.get_terminal_size honours LINES; use a typical terminal height
+    os.environ.setdefault('LINES', '50')
+    renderer = Renderer(io.TextIOWrapper(sink, encoding='utf-8'))
+    start: float = time.perf_counter()
+    for frame in frames:
+        renderer.render_frame(frame)
+    return time.perf_counter() - start, renderer.bytes_written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the game screen renderer")
+    parser.add_argument('--games', type=int, default=20)
+    args = parser.parse_args()
+
+    start: float = time.perf_counter()
+    frames = game_frames(args.games)
+    build: float = time.perf_counter() - start
+    for name, bench in (("clear + print", bench_old), ("ANSI diff", bench_new)):
+        elapsed, written = bench(frames)
+        print(f"{name:>14}: {len(frames) / elapsed:>10.0f} frames/s, "
+              f"{written / len(frames):>7.0f} bytes/guess")
+    stats = render_cache.stats()
+    print(f"frame build incl. guesses: {build / len(frames) * 1e6:.1f} us/frame; render cache: "
+          f"{stats['entries']} entries, {stats['bytes']} bytes, "
+          f"{stats['hits']} hits / {stats['misses']} misses")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# bench_user_store.py
+# Per-update cost of recording a game result at different user counts:
+# today's whole-file save_users path against the sharded store
+#
+#   python -m benchmarks.bench_user_store --shards 256     (1k, 100k and 1M users, ~25 s)
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import user_store
+
+
+def make_users(count: int) -> dict[str, dict]:
+    """Deterministic fake user records"""
+    rng = random.Random(count)
+    users: dict[str, dict] = {}
+    for index in range(count):
+        wins: int = rng.randrange(50)
+        losses: int = rng.randrange(50)
+        users[f"user{index:07d}"] = {
+            'password': f"Password{index}", 'wins': wins, 'losses': losses, 'plays': wins + losses,
+        }
+    return users
+
+
+def time_updates(store: user_store.UserStore, usernames: list[str]) -> float:
+    """Average seconds per record_result over the given users"""
+    start: float = time.perf_counter()
+    for username in usernames:
+        if store.record_result(username, won=True) is None:
+            raise RuntimeError(f"{username} missing from store")
+    return (time.perf_counter() - start) / len(usernames)
+
+
+def time_whole_file_updates(path: str, usernames: list[str]) -> float:
+    """Average seconds per update using load_users + save_users, as update_user_stats used to"""
+    store = user_store.JsonUserStore(path)
+    start: float = time.perf_counter()
+    for username in usernames:
+        # Drop the process cache so every update pays the full parse, like the original code
+        user_store._users_cache.pop(path, None)
+        users = dict(store.load())
+        users[username] = user_store.apply_result(dict(users[username]), won=True)
+        store.save(users)
+    return (time.perf_counter() - start) / len(usernames)
+
+
+def run(user_counts: list[int], shards: int, updates: int) -> list[dict]:
+    results: list[dict] = []
+    for count in user_counts:
+        users = make_users(count)
+        sample: list[str] = random.Random(0).sample(sorted(users), min(updates, count))
+
+        with tempfile.TemporaryDirectory() as directory:
+            users_file: str = os.path.join(directory, "users.json")
+            with open(users_file, 'w') as file:
+                json.dump(users, file, indent=2)
+
+            # Fewer whole-file updates at large sizes; each one rewrites everything
+            whole_sample: list[str] = sample[:max(1, min(len(sample), 10_000_000 // (count * 10)))]
+            whole: float = time_whole_file_updates(users_file, whole_sample)
+
+            user_store.reshard(users_file, os.path.join(directory, "users.d"), shards)
+            sharded_store = user_store.ShardedUserStore(os.path.join(directory, "users.d"),
+                                                         migrate_from=None)
+            sharded: float = time_updates(sharded_store, sample)
+
+        results.append({
+            'users': count,
+            'shards': shards,
+            'whole_file_ms': whole * 1000,
+            'sharded_ms': sharded * 1000,
+            'speedup': whole / sharded if sharded else float("inf"),
+        })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark per-update cost of user stores")
+    parser.add_argument('--users', type=int, nargs='+', default=[1000, 100_000, 1_000_000])
+    parser.add_argument('--shards', type=int, default=256)
+    parser.add_argument('--updates', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'users':>9} {'shards':>7} {'whole-file ms':>14} {'sharded ms':>11} {'speedup':>8}")
+    for row in run(args.users, args.shards, args.updates):
+        print(f"{row['users']:>9} {row['shards']:>7} {row['whole_file_ms']:>14.3f} "
+              f"{row['sharded_ms']:>11.3f} {row['speedup']:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
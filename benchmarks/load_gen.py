@@ -0,0 +1,146 @@
+# load_gen.py
+# Drive many concurrent quick-game sessions against server.py and report
+# sessions/sec and guess round-trip latency
+#
+#   python -m benchmarks.load_gen --clients 1000 --games 2
+#   python -m benchmarks.load_gen --words stub    (in-process server fed by stub_api)
+#   python -m benchmarks.load_gen --port 8765     (against a running server)
+#
+# The in-process server runs offline by default, so a run never calls the
+# real WORD_API; --words live opts in to it. Stub words go to a word cache
+# in a temporary directory, never to the real word_cache.db.
+
+import argparse
+import asyncio
+import contextlib
+import random
+import os
+import statistics
+import tempfile
+import time
+from typing import Optional
+import retrieve_word_fn
+from benchmarks.stub_api import StubWordServer
+from server import GameServer
+from word_cache import WordCache
+from word_prefetch import prefetcher
+
+# Guess order for the bot players
+LETTER_ORDER: str = "esiarntolcdupmghbyfvkwzxqj"
+
+# Where the in-process server gets words: local only, stub_api, or the real WORD_API
+WORD_SOURCES: list[str] = ["offline", "stub", "live"]
+
+# Simulated WORD_API latency per request with --words stub (seconds)
+STUB_LATENCY: float = 0.05
+
+
+async def read_prompt(reader: asyncio.StreamReader) -> Optional[str]:
+    """Skip output lines until the next '? ' prompt (None on disconnect)"""
+    while True:
+        line: bytes = await reader.readline()
+        if not line:
+            return None
+        text: str = line.decode(errors="ignore")
+        if text.startswith("? "):
+            return text[2:].strip()
+
+
+async def client(host: str, port: int, games: int, latencies: list[float]) -> bool:
+    """Play `games` quick games; returns True if the session completed normally"""
+    reader, writer = await asyncio.open_connection(host, port)
+    games_played: int = 0
+    letters: list[str] = []
+    try:
+        prompt: Optional[str] = await read_prompt(reader)
+        while prompt is not None:
+            if "choice (1-4)" in prompt:
+                answer: str = "1" if games_played < games else "4"
+            elif "difficulty" in prompt:
+                answer = random.choice("123")
+                letters = list(LETTER_ORDER)
+            elif "Guess a letter" in prompt:
+                answer = letters.pop(0)
+            elif "play again" in prompt:
+                games_played += 1
+                answer = "y" if games_played < games else "n"
+            else:
+                answer = "quit"
+
+            sent: float = time.perf_counter()
+            writer.write(answer.encode() + b"\n")
+            await writer.drain()
+            prompt = await read_prompt(reader)
+            if "Guess a letter" in (prompt or "") and answer in LETTER_ORDER:
+                latencies.append(time.perf_counter() - sent)
+        return games_played >= games
+    finally:
+        writer.close()
+
+
+async def run(clients: int, games: int, host: Optional[str], port: int,
+              words: str = "offline") -> dict:
+    if host is not None:
+        return await drive(clients, games, host, port)
+
+    saved = retrieve_word_fn.WORD_API, retrieve_word_fn.OFFLINE, retrieve_word_fn.word_cache
+    stub_server = StubWordServer(latency=STUB_LATENCY) if words == "stub" else contextlib.nullcontext()
+    with tempfile.TemporaryDirectory() as directory, stub_server as stub:
+        if words == "offline":
+            retrieve_word_fn.set_offline()
+        elif words == "stub":
+            retrieve_word_fn.WORD_API = stub.url
+            retrieve_word_fn.word_cache = WordCache(os.path.join(directory, "word_cache.db"))
+        server = GameServer("127.0.0.1", 0)
+        try:
+            await server.start()
+            return await drive(clients, games, "127.0.0.1", server.port)
+        finally:
+            await server.stop()
+            prefetcher.stop()
+            if retrieve_word_fn.word_cache is not saved[2]:
+                retrieve_word_fn.word_cache.close()
+            retrieve_word_fn.WORD_API, retrieve_word_fn.OFFLINE, retrieve_word_fn.word_cache = saved
+
+
+async def drive(clients: int, games: int, host: str, port: int) -> dict:
+    """Run `clients` concurrent sessions against a server and summarise them"""
+    latencies: list[float] = []
+    start: float = time.perf_counter()
+    results = await asyncio.gather(
+        *(client(host, port, games, latencies) for _ in range(clients)),
+        return_exceptions=True,
+    )
+    elapsed: float = time.perf_counter() - start
+
+    completed: int = sum(1 for result in results if result is True)
+    latencies.sort()
+    return {
+        'clients': clients,
+        'completed_sessions': completed,
+        'failed_sessions': clients - completed,
+        'seconds': elapsed,
+        'sessions_per_sec': completed / elapsed,
+        'guesses': len(latencies),
+        'rtt_ms_p50': statistics.median(latencies) * 1000 if latencies else None,
+        'rtt_ms_p99': latencies[int(len(latencies) * 0.99)] * 1000 if latencies else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the hangman server")
+    parser.add_argument('--clients', type=int, default=1000)
+    parser.add_argument('--games', type=int, default=1, help="games per session")
+    parser.add_argument('--host', default=None, help="server to test (default: start one in-process)")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--words', choices=WORD_SOURCES, default="offline",
+                        help="word source for the in-process server; 'live' calls the real WORD_API")
+    args = parser.parse_args()
+
+    report: dict = asyncio.run(run(args.clients, args.games, args.host, args.port, args.words))
+    for key, value in report.items():
+        print(f"{key:>20}: {value:.3f}" if isinstance(value, float) else f"{key:>20}: {value}")
+
+
+if __name__ == "__main__":
+    main()
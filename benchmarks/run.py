@@ -0,0 +1,394 @@
+# run.py
+# Benchmark suite for the game's hot paths, with JSON output and a
+# comparison mode that flags regressions against a stored baseline
+#
+#   python -m benchmarks.run --output baseline.json
+#   python -m benchmarks.run --compare baseline.json --tolerance 0.25
+#   python -m benchmarks.run --only users --users 1000 100000 1000000
+#   python -m benchmarks.run --only startup --startup-budget 0.06
+#   python -m benchmarks.run --only snapshot
+#
+# Everything runs inside a temporary directory, so the real users.json,
+# word cache and dictionary are never touched. --compare exits with
+# status 1 when any benchmark got slower than the tolerance allows, and
+# every run exits with status 1 when starting the game offline goes over
+# the startup budget or imports the HTTP stack.
+
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Optional
+import game as game_module
+import game_snapshot
+import login_signup
+import retrieve_word_fn
+import user_store
+from benchmarks.bench_render import FakeTTY
+from benchmarks.bench_user_store import make_users
+from benchmarks.stub_api import StubWordServer
+from circuit_breaker import CircuitBreaker
+from game import HangmanGame
+from renderer import Renderer
+
+DEFAULT_USERS: list[int] = [1000, 100_000, 1_000_000]
+
+# Keep calling an operation until one sample takes at least this long
+MIN_SAMPLE_TIME: float = 0.05
+
+# Longest `import main` may take in offline mode (seconds, -X importtime)
+STARTUP_BUDGET: float = 0.06
+
+# Modules that must not be imported when starting offline
+HTTP_MODULES: tuple[str, ...] = ('requests', 'urllib3', 'charset_normalizer', 'idna', 'certifi')
+
+REPO_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(operation: Callable[[], Any], repeat: int = 5, calls: int = 1,
+            setup: Optional[Callable[[], Any]] = None) -> dict[str, float]:
+    """Seconds per call of `operation` (median and best of `repeat` samples)
+
+    `calls` is how many calls of the measured thing one operation makes;
+    `setup` runs untimed before each operation.
+    """
+    def sample(number: int) -> float:
+        elapsed: float = 0.0
+        for _ in range(number):
+            if setup is not None:
+                setup()
+            start: float = time.perf_counter()
+            operation()
+            elapsed += time.perf_counter() - start
+        return elapsed
+
+    number: int = 1
+    first: float = sample(number)
+    while first < MIN_SAMPLE_TIME and number < 1_000_000:
+        number *= 10
+        first = sample(number)
+
+    samples: list[float] = [first] + [sample(number) for _ in range(repeat - 1)]
+    per_call: list[float] = [t / (number * calls) for t in samples]
+    return {'median': statistics.median(per_call), 'min': min(per_call),
+            'calls': number * calls * repeat}
+
+
+def new_game(difficulty: str, word: str) -> HangmanGame:
+    """A game at its first guess, without starting the prefetcher"""
+    game = HangmanGame.__new__(HangmanGame)
+    game.reset_game()
+    game.difficulty = difficulty
+    game.set_word(word)
+    return game
+
+
+def bench_network(repeat: int) -> dict[str, dict]:
+    """retrieve_word against a stub API that is too slow, then one that fails"""
+    results: dict[str, dict] = {}
+    saved_api, saved_breaker = retrieve_word_fn.WORD_API, retrieve_word_fn.breaker
+    with StubWordServer(latency=retrieve_word_fn.LATENCY_BUDGET * 2) as server:
+        retrieve_word_fn.WORD_API = server.url
+        retrieve_word_fn.breaker = CircuitBreaker(failure_threshold=3, cooldown=60.0)
+        try:
+            # Let the previous call's late fetch land, then drop it so every call pays the budget
+            def settle() -> None:
+                time.sleep(server.latency)
+                retrieve_word_fn._word_buffer.clear()
+
+            results['retrieve_word.slow_api'] = measure(
+                lambda: retrieve_word_fn.retrieve_word(6), repeat=repeat, setup=settle)
+
+            server.latency = 0.0
+            server.failing = True
+            for _ in range(retrieve_word_fn.breaker.failure_threshold):
+                retrieve_word_fn.fetch_words(6)
+            results['retrieve_word.breaker_open'] = measure(
+                lambda: retrieve_word_fn.retrieve_word(6), repeat=repeat)
+        finally:
+            retrieve_word_fn.WORD_API, retrieve_word_fn.breaker = saved_api, saved_breaker
+            retrieve_word_fn._word_buffer.clear()
+
+    results['get_local_word'] = measure(lambda: retrieve_word_fn.get_local_word(6), repeat=repeat)
+    return results
+
+
+def bench_users(counts: list[int], repeat: int) -> dict[str, dict]:
+    """load_users, save_users and update_user_stats at each user count"""
+    results: dict[str, dict] = {}
+    saved_users_file: str = login_signup.USERS_FILE
+    for count in counts:
+        users = make_users(count)
+        username: str = next(iter(users))
+        users_file: str = os.path.abspath(f"users-{count}.json")
+        with open(users_file, 'w') as file:
+            json.dump(users, file, indent=2)
+        login_signup.USERS_FILE = users_file
+
+        def load_cold() -> None:
+            user_store._users_cache.pop(users_file, None)
+            login_signup.load_users()
+
+        results[f'load_users.cold[users={count}]'] = measure(load_cold, repeat=repeat)
+        results[f'load_users.cached[users={count}]'] = measure(login_signup.load_users, repeat=repeat)
+        results[f'save_users[users={count}]'] = measure(lambda: login_signup.save_users(users),
+                                                        repeat=repeat)
+
+        # The configured backend, pointed at this run's files
+        saved_store = user_store._user_store
+        if user_store.USER_STORE_BACKEND == "sqlite":
+            store = user_store.SqliteUserStore(f"users-{count}.db", migrate_from=users_file)
+        elif user_store.USER_STORE_BACKEND == "sharded":
+            store = user_store.ShardedUserStore(f"users-{count}.d", migrate_from=users_file)
+        elif user_store.USER_STORE_BACKEND == "journal":
+            store = user_store.JournalUserStore(users_file)
+        else:
+            store = user_store.JsonUserStore(users_file)
+        user_store._user_store = store
+        login_signup.current_user = {'username': username, 'data': store.get_user(username)}
+        try:
+            results[f'update_user_stats.{user_store.USER_STORE_BACKEND}[users={count}]'] = measure(
+                lambda: login_signup.update_user_stats(won=True), repeat=repeat)
+        finally:
+            login_signup.current_user = None
+            user_store._user_store = saved_store
+            store.close()
+    login_signup.USERS_FILE = saved_users_file
+    return results
+
+
+def bench_game(repeat: int) -> dict[str, dict]:
+    """process_guess, add_hints and display_game_state"""
+    results: dict[str, dict] = {}
+    games: list[HangmanGame] = []
+
+    # Six correct guesses that never finish the word
+    def make_games() -> None:
+        games[:] = [new_game('beginner', "sophisticated")]
+
+    def guesses() -> None:
+        for letter in "sophit":
+            games[0].process_guess(letter)
+
+    results['process_guess'] = measure(guesses, repeat=repeat, calls=6, setup=make_games)
+    results['add_hints'] = measure(lambda: games[0].add_hints(), repeat=repeat, setup=make_games)
+
+    # Alternate two different screens so every frame has changed lines
+    os.environ.setdefault('LINES', '50')
+    saved_renderer = game_module.renderer
+    game_module.renderer = Renderer(io.TextIOWrapper(FakeTTY(), encoding='utf-8'))
+    first, second = new_game('beginner', "kaleidoscope"), new_game('professional', "lighthouse")
+    for letter in "eaz":
+        second.process_guess(letter)
+    try:
+        def frames() -> None:
+            first.display_game_state()
+            second.display_game_state()
+        results['display_game_state'] = measure(frames, repeat=repeat, calls=2)
+    finally:
+        game_module.renderer = saved_renderer
+    return results
+
+
+def bench_snapshot(repeat: int) -> dict[str, dict]:
+    """Saving, loading and restoring an in-progress game, and a guess that saves one"""
+    results: dict[str, dict] = {}
+    store = game_snapshot.SnapshotStore("snapshots.d")
+    game: HangmanGame = new_game('intermediate', "kaleidoscope")
+    for letter in "eoz":
+        game.process_guess(letter)
+
+    results['snapshot.save'] = measure(lambda: store.save("player", game.snapshot()),
+                                       repeat=repeat)
+    results['snapshot.load'] = measure(lambda: store.load("player"), repeat=repeat)
+    snapshot: game_snapshot.GameSnapshot = store.load("player")
+    restored: HangmanGame = HangmanGame.__new__(HangmanGame)
+    results['snapshot.restore'] = measure(lambda: restored.restore(snapshot), repeat=repeat)
+    results['snapshot.resume'] = measure(lambda: restored.restore(store.load("player")),
+                                         repeat=repeat)
+
+    # The same six guesses as process_guess, but logged in, so each one saves the game
+    games: list[HangmanGame] = []
+
+    def make_games() -> None:
+        games[:] = [new_game('beginner', "sophisticated")]
+
+    def guesses() -> None:
+        for letter in "sophit":
+            games[0].process_guess(letter)
+
+    saved_store = game_snapshot._snapshot_store
+    game_snapshot._snapshot_store = store
+    login_signup.current_user = {'username': "player", 'data': {}}
+    try:
+        results['process_guess.with_snapshot'] = measure(guesses, repeat=repeat, calls=6,
+                                                         setup=make_games)
+    finally:
+        login_signup.current_user = None
+        game_snapshot._snapshot_store = saved_store
+    return results
+
+
+def import_times(module: str, env: dict[str, str]) -> dict[str, float]:
+    """Cumulative import time (seconds) of `module` and every module it loads, from -X importtime
+
+    Modules the interpreter loads before running `import module` (site and
+    anything its .pth files pull in) are left out.
+    """
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                             env=env, capture_output=True, text=True, check=True)
+    times: dict[str, float] = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or line.count("|") != 2:
+            continue
+        _, cumulative, field = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        times[field.strip()] = int(cumulative) / 1e6
+        # Lines are printed as imports finish, nested ones indented; a
+        # top-level line closes everything printed since the previous one
+        if not field.startswith("  "):
+            if field.strip() == module:
+                return times
+            times.clear()
+    raise ValueError(f"-X importtime output has no entry for {module}")
+
+
+def bench_startup(repeat: int) -> dict[str, dict]:
+    """Time to import main.py in a fresh interpreter, offline and online"""
+    results: dict[str, dict] = {}
+    for mode, offline in (('offline', '1'), ('online', '0')):
+        env: dict[str, str] = dict(os.environ, HANGMAN_OFFLINE=offline,
+                                   PYTHONPATH=os.pathsep.join(
+                                       filter(None, [REPO_DIR, os.environ.get('PYTHONPATH')])))
+        samples: list[float] = []
+        http_modules: set[str] = set()
+        for _ in range(repeat):
+            times = import_times("main", env)
+            samples.append(times["main"])
+            http_modules.update(name for name in times if name.split(".")[0] in HTTP_MODULES)
+        results[f'startup.import_main[{mode}]'] = {
+            'median': statistics.median(samples), 'min': min(samples), 'calls': repeat,
+            'http_modules': sorted(http_modules),
+        }
+    return results
+
+
+def startup_problems(results: dict[str, dict], budget: float) -> list[str]:
+    """Ways the offline startup breaks its budget"""
+    result: Optional[dict] = results.get('startup.import_main[offline]')
+    if result is None:
+        return []
+    problems: list[str] = []
+    if result['median'] > budget:
+        problems.append(f"importing main took {format_time(result['median'])} "
+                        f"(budget {format_time(budget)})")
+    if result['http_modules']:
+        problems.append(f"offline startup imported {', '.join(result['http_modules'])}")
+    return problems
+
+
+SUITES: dict[str, Callable[[argparse.Namespace], dict[str, dict]]] = {
+    'startup': lambda args: bench_startup(args.repeat),
+    'network': lambda args: bench_network(args.repeat),
+    'users': lambda args: bench_users(args.users, args.repeat),
+    'game': lambda args: bench_game(args.repeat),
+    'snapshot': lambda args: bench_snapshot(args.repeat),
+}
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], tolerance: float) -> list[str]:
+    """Print current vs baseline medians; return the benchmarks that regressed"""
+    regressions: list[str] = []
+    print(f"{'benchmark':<44} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name:<44} {'-':>12} {format_time(result['median']):>12} {'new':>8}")
+            continue
+        before: float = baseline[name]['median']
+        ratio: float = result['median'] / before if before else float("inf")
+        flag: str = ""
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<44} {format_time(before):>12} {format_time(result['median']):>12} "
+              f"{(ratio - 1) * 100:>+7.1f}%{flag}")
+    return regressions
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the hot-path benchmark suite")
+    parser.add_argument('--only', nargs='+', choices=list(SUITES), default=list(SUITES))
+    parser.add_argument('--users', type=int, nargs='+', default=DEFAULT_USERS)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help="write the results as JSON")
+    parser.add_argument('--compare', metavar='BASELINE', help="JSON from an earlier --output run")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="slowdown allowed before --compare reports a regression (0.25 = 25%%)")
+    parser.add_argument('--startup-budget', type=float, default=STARTUP_BUDGET,
+                        help="seconds `import main` may take offline (default %(default)s)")
+    args = parser.parse_args(argv)
+
+    output: Optional[str] = os.path.abspath(args.output) if args.output else None
+    baseline: Optional[dict] = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)['results']
+
+    results: dict[str, dict] = {}
+    cwd: str = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            for suite in args.only:
+                results.update(SUITES[suite](args))
+        finally:
+            # Write back served words while this run's word cache still exists
+            retrieve_word_fn.word_cache.close()
+            os.chdir(cwd)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+    else:
+        regressions = []
+        print(f"{'benchmark':<44} {'median':>12} {'best':>12}")
+        for name, result in results.items():
+            print(f"{name:<44} {format_time(result['median']):>12} {format_time(result['min']):>12}")
+
+    if output:
+        with open(output, 'w') as file:
+            json.dump({
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'timestamp': time.time(),
+                'results': results,
+            }, file, indent=2)
+        print(f"Wrote {len(results)} results to {output}")
+
+    problems: list[str] = startup_problems(results, args.startup_budget)
+    for problem in problems:
+        print(f"Startup budget exceeded: {problem}")
+
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) slower than the baseline by more than "
+              f"{args.tolerance * 100:.0f}%: {', '.join(regressions)}")
+    if regressions or problems:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+# stress_stats.py
+# Many processes recording game results against one user store at once;
+# exits non-zero if any update is lost
+#
+#   python -m benchmarks.stress_stats --backend json --processes 8 --games 200
+#   python -m benchmarks.stress_stats --backend json --threads 1 --group-commit-ms 20
+#
+# For the json backend it also reports how many results each rewrite of
+# users.json carried, which shows group commit merging across processes.
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+import user_store
+
+USERS: list[str] = ["alpha", "bravo", "charlie", "delta"]
+
+
+def make_store(backend: str, directory: str, group_commit_ms: float) -> user_store.UserStore:
+    users_file: str = os.path.join(directory, "users.json")
+    if backend == "json":
+        return user_store.JsonUserStore(users_file, group_commit_window=group_commit_ms / 1000)
+    if backend == "journal":
+        return user_store.JournalUserStore(users_file, compact_after=250)
+    if backend == "sqlite":
+        return user_store.SqliteUserStore(os.path.join(directory, "users.db"), migrate_from=None)
+    if backend == "sharded":
+        return user_store.ShardedUserStore(os.path.join(directory, "users.d"), shards=4,
+                                           migrate_from=None)
+    raise ValueError(f"Unknown backend: {backend}")
+
+
+def worker(backend: str, directory: str, group_commit_ms: float,
+           worker_id: int, games: int, threads: int, stats: multiprocessing.Queue) -> None:
+    """Record `games` results per thread, winning every other game"""
+    store = make_store(backend, directory, group_commit_ms)
+
+    def play(thread_id: int) -> None:
+        for game in range(games):
+            username: str = USERS[(worker_id + thread_id + game) % len(USERS)]
+            if store.record_result(username, won=game % 2 == 0) is None:
+                raise RuntimeError(f"{username} disappeared")
+
+    pool = [threading.Thread(target=play, args=(i,)) for i in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    stats.put(getattr(store, 'commit_stats', None))
+    store.close()
+
+
+def stress(backend: str, processes: int, games: int, threads: int,
+           group_commit_ms: float) -> dict[str, object]:
+    """Run the workers and return what was expected, what was recorded and the commit stats"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = make_store(backend, directory, group_commit_ms)
+        for username in USERS:
+            store.add_user(username, "Password1")
+        store.close()
+
+        stats: multiprocessing.Queue = multiprocessing.Queue()
+        start: float = time.perf_counter()
+        procs = [
+            multiprocessing.Process(
+                target=worker,
+                args=(backend, directory, group_commit_ms, worker_id, games, threads, stats),
+            )
+            for worker_id in range(processes)
+        ]
+        for proc in procs:
+            proc.start()
+        commit_stats = [stats.get() for _ in procs]
+        for proc in procs:
+            proc.join()
+        elapsed: float = time.perf_counter() - start
+
+        store = make_store(backend, directory, group_commit_ms)
+        users = store.all_users()
+        store.close()
+
+    return {
+        'expected': processes * threads * games,
+        'plays': sum(users[name]['plays'] for name in USERS),
+        'wins': sum(users[name]['wins'] for name in USERS),
+        'losses': sum(users[name]['losses'] for name in USERS),
+        'seconds': elapsed,
+        # Per-process rewrite counts (json backend only)
+        'commit_stats': commit_stats if all(commit_stats) else None,
+    }
+
+
+def run(backend: str, processes: int, games: int, threads: int, group_commit_ms: float) -> bool:
+    """Stress one backend, print a report and return False if any update was lost"""
+    report = stress(backend, processes, games, threads, group_commit_ms)
+    expected, plays, wins, losses = (report['expected'], report['plays'],
+                                     report['wins'], report['losses'])
+    print(f"backend={backend} processes={processes} threads={threads} "
+          f"group_commit_ms={group_commit_ms}")
+    print(f"  expected plays {expected}, recorded {plays} (wins {wins} + losses {losses})")
+    print(f"  {expected / report['seconds']:.0f} updates/sec")
+    if report['commit_stats'] is not None:
+        writes: int = sum(stat['writes'] for stat in report['commit_stats'])
+        results: int = sum(stat['results'] for stat in report['commit_stats'])
+        print(f"  {writes} rewrites of users.json for {results} results "
+              f"({results / max(writes, 1):.1f} per rewrite)")
+    return plays == expected and wins + losses == expected
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stress concurrent stats updates")
+    parser.add_argument('--backend', choices=["json", "journal", "sqlite", "sharded"], default="json")
+    parser.add_argument('--processes', type=int, default=8)
+    parser.add_argument('--threads', type=int, default=1, help="threads per process")
+    parser.add_argument('--games', type=int, default=100, help="games per thread")
+    parser.add_argument('--group-commit-ms', type=float, default=0.0)
+    args = parser.parse_args()
+
+    ok: bool = run(args.backend, args.processes, args.games, args.threads, args.group_commit_ms)
+    print("  OK: no lost updates" if ok else "  FAILED: updates were lost")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
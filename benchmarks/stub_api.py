@@ -0,0 +1,66 @@
+# stub_api.py
+# Local stand-in for the random-word API so benchmarks never touch the network
+
+import json
+import random
+import string
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class StubWordHandler(BaseHTTPRequestHandler):
+    """Answer /word?length=N&number=K with K random lowercase words"""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        query = parse_qs(urlparse(self.path).query)
+        length: int = int(query.get('length', ['5'])[0])
+        number: int = int(query.get('number', ['1'])[0])
+
+        # Simulated server/network latency per request
+        time.sleep(self.server.latency)
+        self.server.requests_served += 1
+
+        if self.server.failing:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        words = [''.join(random.choices(string.ascii_lowercase, k=length)) for _ in range(number)]
+        body: bytes = json.dumps(words).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+class StubWordServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency: float = 0.05) -> None:
+        super().__init__(("127.0.0.1", 0), StubWordHandler)
+        self.latency: float = latency
+        self.failing: bool = False
+        self.requests_served: int = 0
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """Base URL in the same form as retrieve_word_fn.WORD_API"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/word?"
+
+    def __enter__(self) -> "StubWordServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,70 @@
+# circuit_breaker.py
+# Circuit breaker for calls to WORD_API
+
+import threading
+import time
+
+CLOSED: str = "closed"
+OPEN: str = "open"
+HALF_OPEN: str = "half_open"
+
+class CircuitBreaker:
+    """Stop calling a failing service for a cool-down, then probe it with one request"""
+
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 30.0) -> None:
+        self.failure_threshold: int = failure_threshold
+        self.cooldown: float = cooldown
+        self.state: str = CLOSED
+        self.consecutive_failures: int = 0
+        self.opened_at: float = 0.0
+        self.trips: int = 0
+        self.rejected: int = 0
+        self._probe_in_flight: bool = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Return True if a call may go through right now"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = HALF_OPEN
+
+            # Half-open lets exactly one probe through at a time
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+
+            self.rejected += 1
+            return False
+
+    def is_open(self) -> bool:
+        """True while calls are being rejected and the cool-down hasn't elapsed"""
+        with self._lock:
+            return self.state == OPEN and time.monotonic() - self.opened_at < self.cooldown
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            self._probe_in_flight = False
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.trips += 1
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'trips': self.trips,
+                'rejected': self.rejected,
+            }
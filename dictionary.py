@@ -0,0 +1,180 @@
+# dictionary.py
+# Compact, length-indexed word dictionary built once from a plain wordlist
+#
+# Index file layout (little-endian):
+#   magic      8 bytes   b"HMDICT1\0"
+#   n_lengths  uint32
+#   n_lengths x (length uint32, count uint32, offset uint64)
+#   word data  for each length, `count` words of exactly `length` ASCII
+#              letters stored back to back, so word i starts at
+#              offset + i * length
+#
+# Build an index with:
+#   python dictionary.py build wordlist.txt [words.idx]
+
+import mmap
+import os
+import random
+import struct
+import sys
+from typing import Iterable, Iterator, Optional, Union
+
+DICTIONARY_FILE: str = os.environ.get("HANGMAN_DICTIONARY", "words.idx")
+
+MIN_LENGTH: int = 4
+MAX_LENGTH: int = 14
+
+MAGIC: bytes = b"HMDICT1\0"
+_HEADER = struct.Struct("<8sI")
+_ENTRY = struct.Struct("<IIQ")
+
+
+def is_valid_word(word: str, min_length: int = MIN_LENGTH, max_length: int = MAX_LENGTH) -> bool:
+    """Check a word is plain ASCII letters and within the playable length range"""
+    return min_length <= len(word) <= max_length and word.isascii() and word.isalpha()
+
+
+def group_words(words: Iterable[str]) -> dict[int, list[str]]:
+    """Normalise, validate and de-duplicate words, grouped by their real length"""
+    grouped: dict[int, list[str]] = {}
+    seen: set[str] = set()
+    for word in words:
+        word = word.strip().lower()
+        if word in seen or not is_valid_word(word):
+            continue
+        seen.add(word)
+        grouped.setdefault(len(word), []).append(word)
+    return grouped
+
+
+def encode_index(grouped: dict[int, list[str]]) -> bytes:
+    """Serialise grouped words into the index file format"""
+    lengths: list[int] = sorted(grouped)
+    offset: int = _HEADER.size + _ENTRY.size * len(lengths)
+
+    table: list[bytes] = []
+    data: list[bytes] = []
+    for length in lengths:
+        words: list[str] = grouped[length]
+        table.append(_ENTRY.pack(length, len(words), offset))
+        data.append("".join(words).encode("ascii"))
+        offset += length * len(words)
+
+    return _HEADER.pack(MAGIC, len(lengths)) + b"".join(table) + b"".join(data)
+
+
+def build_dictionary(wordlist_path: str, index_path: str = DICTIONARY_FILE) -> dict[int, int]:
+    """Build an index file from a wordlist (one word per line); returns counts per length"""
+    with open(wordlist_path, "r", encoding="utf-8", errors="ignore") as file:
+        grouped = group_words(file)
+
+    # Write to a temporary file first so readers never see a half-written index
+    temp_path: str = f"{index_path}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(encode_index(grouped))
+    os.replace(temp_path, index_path)
+
+    return {length: len(words) for length, words in sorted(grouped.items())}
+
+
+class WordDictionary:
+    """Read-only view over an index buffer with O(1) random word selection"""
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap]) -> None:
+        magic, n_lengths = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a hangman dictionary index")
+
+        self._buffer = buffer
+        # length -> (count, offset)
+        self._table: dict[int, tuple[int, int]] = {}
+        for i in range(n_lengths):
+            length, count, offset = _ENTRY.unpack_from(buffer, _HEADER.size + i * _ENTRY.size)
+            if count:
+                self._table[length] = (count, offset)
+
+    @classmethod
+    def open(cls, path: str = DICTIONARY_FILE) -> "WordDictionary":
+        """Memory-map an index file so its pages are shared between processes"""
+        with open(path, "rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer)
+
+    @classmethod
+    def from_words(cls, words: Iterable[str]) -> "WordDictionary":
+        """Build an in-memory dictionary without touching the disk"""
+        return cls(encode_index(group_words(words)))
+
+    def lengths(self) -> list[int]:
+        return sorted(self._table)
+
+    def count(self, length: int) -> int:
+        return self._table.get(length, (0, 0))[0]
+
+    def __len__(self) -> int:
+        return sum(count for count, _ in self._table.values())
+
+    def __contains__(self, length: int) -> bool:
+        return length in self._table
+
+    def word_at(self, length: int, index: int) -> str:
+        """Return word number `index` among words of the given length"""
+        count, offset = self._table[length]
+        if not 0 <= index < count:
+            raise IndexError(f"word index {index} out of range for length {length}")
+        start: int = offset + index * length
+        return self._buffer[start:start + length].decode("ascii")
+
+    def random_word(self, length: int) -> str:
+        """Return a random word of the given length"""
+        if length not in self._table:
+            raise ValueError(f"No words available for length {length}")
+        return self.word_at(length, random.randrange(self._table[length][0]))
+
+    def word_block(self, length: int) -> memoryview:
+        """Raw ASCII of every word of the given length, back to back, without copying"""
+        count, offset = self._table.get(length, (0, 0))
+        return memoryview(self._buffer)[offset:offset + count * length]
+
+    def words(self, length: int) -> Iterator[str]:
+        """Iterate over every word of the given length"""
+        for index in range(self.count(length)):
+            yield self.word_at(length, index)
+
+
+_dictionary: Optional[WordDictionary] = None
+
+
+def get_dictionary(fallback_words: Iterable[str] = ()) -> WordDictionary:
+    """Return the shared dictionary, memory-mapping DICTIONARY_FILE on first use.
+
+    When no index file exists the dictionary is built in memory from
+    `fallback_words` instead.
+    """
+    global _dictionary
+    if _dictionary is None:
+        if os.path.exists(DICTIONARY_FILE):
+            try:
+                _dictionary = WordDictionary.open(DICTIONARY_FILE)
+            except (OSError, ValueError, struct.error) as e:
+                print(f"Error loading dictionary {DICTIONARY_FILE}: {e}")
+        if _dictionary is None:
+            _dictionary = WordDictionary.from_words(fallback_words)
+    return _dictionary
+
+
+def main(argv: list[str]) -> int:
+    if len(argv) < 2 or argv[0] != "build":
+        print("Usage: python dictionary.py build WORDLIST [INDEX]")
+        return 1
+
+    index_path: str = argv[2] if len(argv) > 2 else DICTIONARY_FILE
+    counts = build_dictionary(argv[1], index_path)
+    for length, count in counts.items():
+        print(f"{length:>3} letters: {count} words")
+    print(f"Wrote {sum(counts.values())} words to {index_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,196 @@
+# difficulty_index.py
+# Per-word difficulty scores, built offline and memory-mapped at startup
+#
+# A word's score is how many wrong guesses a strong solver makes on it: the
+# solver knows the word length and always guesses the letter found in the
+# most remaining candidate words. Ties are broken by total guesses.
+#
+# Index file layout (little-endian):
+#   magic      8 bytes   b"HMDIFF1\0"
+#   n_words    uint32
+#   n_words x  (wrong uint8, guesses uint8, word 14 bytes NUL-padded),
+#              sorted by (wrong, guesses, word)
+#
+# Build an index from the current dictionary with:
+#   python difficulty_index.py build [difficulty.idx]
+
+import mmap
+import os
+import random
+import struct
+import sys
+from typing import Iterable, Optional, Union
+from dictionary import MAX_LENGTH, WordDictionary, get_dictionary
+from engine import DIFFICULTY_SETTINGS
+
+DIFFICULTY_INDEX_FILE: str = os.environ.get("HANGMAN_DIFFICULTY_INDEX", "difficulty.idx")
+
+MAGIC: bytes = b"HMDIFF1\0"
+_HEADER = struct.Struct("<8sI")
+_RECORD = struct.Struct(f"<BB{MAX_LENGTH}s")
+
+# Words must keep at least this many blanks after the level's hints
+MIN_BLANKS: int = 3
+
+# Random draws from a band before giving up on finding a long enough word
+PICK_ATTEMPTS: int = 20
+
+
+def solver_scores(words: Iterable[str]) -> dict[str, tuple[int, int]]:
+    """(wrong guesses, total guesses) the solver needs for each word
+
+    Words are grouped by length and each group is solved as one decision
+    tree, so every candidate set is only partitioned once.
+    """
+    by_length: dict[int, list[str]] = {}
+    for word in words:
+        by_length.setdefault(len(word), []).append(word)
+
+    scores: dict[str, tuple[int, int]] = {}
+    for candidates in by_length.values():
+        # (candidates, guessed letters, wrong guesses, guesses so far)
+        stack: list[tuple[list[str], set[str], int, int]] = [(candidates, set(), 0, 0)]
+        while stack:
+            candidates, guessed, wrong, guesses = stack.pop()
+            if len(candidates) == 1:
+                # Known word: the rest of its letters are all hits
+                word: str = candidates[0]
+                scores[word] = (wrong, guesses + len(set(word) - guessed))
+                continue
+
+            counts: dict[str, int] = {}
+            for word in candidates:
+                for letter in set(word) - guessed:
+                    counts[letter] = counts.get(letter, 0) + 1
+            letter = min(counts, key=lambda l: (-counts[l], l))
+
+            # Split the candidates by where the letter shows up; () is a miss
+            groups: dict[tuple[int, ...], list[str]] = {}
+            for word in candidates:
+                pattern = tuple(i for i, c in enumerate(word) if c == letter)
+                groups.setdefault(pattern, []).append(word)
+            for pattern, group in groups.items():
+                stack.append((group, guessed | {letter}, wrong + (not pattern), guesses + 1))
+    return scores
+
+
+def encode_index(scores: dict[str, tuple[int, int]]) -> bytes:
+    """Serialise solver scores into the index file format"""
+    ranked = sorted(scores.items(), key=lambda item: (item[1], item[0]))
+    records: list[bytes] = [
+        _RECORD.pack(min(wrong, 255), min(guesses, 255), word.encode("ascii"))
+        for word, (wrong, guesses) in ranked
+    ]
+    return _HEADER.pack(MAGIC, len(records)) + b"".join(records)
+
+
+def build_difficulty_index(dictionary: WordDictionary,
+                           index_path: str = DIFFICULTY_INDEX_FILE) -> int:
+    """Score every word in the dictionary and write the index; returns the word count"""
+    scores = solver_scores(word for length in dictionary.lengths()
+                           for word in dictionary.words(length))
+
+    # Write to a temporary file first so readers never see a half-written index
+    temp_path: str = f"{index_path}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(encode_index(scores))
+    os.replace(temp_path, index_path)
+    return len(scores)
+
+
+class DifficultyIndex:
+    """Read-only view over a score index; records are addressed directly"""
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap]) -> None:
+        magic, count = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a hangman difficulty index")
+        self._buffer = buffer
+        self._count: int = count
+
+    @classmethod
+    def open(cls, path: str = DIFFICULTY_INDEX_FILE) -> "DifficultyIndex":
+        with open(path, "rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer)
+
+    @classmethod
+    def from_words(cls, words: Iterable[str]) -> "DifficultyIndex":
+        """Score words in memory without touching the disk"""
+        return cls(encode_index(solver_scores(words)))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def entry(self, rank: int) -> tuple[str, int, int]:
+        """(word, wrong guesses, total guesses) of the word at `rank`, easiest first"""
+        if not 0 <= rank < self._count:
+            raise IndexError(f"rank {rank} out of range")
+        wrong, guesses, word = _RECORD.unpack_from(self._buffer, _HEADER.size + rank * _RECORD.size)
+        return word.rstrip(b"\0").decode("ascii"), wrong, guesses
+
+    def band(self, low: float, high: float) -> range:
+        """Ranks between two fractions of the corpus, e.g. (0.0, 0.4) is the easiest 40%"""
+        return range(int(low * self._count), int(high * self._count))
+
+    def pick_word(self, difficulty: str, rng: random.Random = random) -> Optional[str]:
+        """Random word from the difficulty's score band that survives its hints"""
+        settings: dict = DIFFICULTY_SETTINGS[difficulty]
+        min_length: int = settings['hints'][1] + MIN_BLANKS
+        ranks: range = self.band(*settings['score_band'])
+        if not ranks:
+            return None
+        for _ in range(PICK_ATTEMPTS):
+            word, _, _ = self.entry(rng.choice(ranks))
+            if len(word) >= min_length:
+                return word
+        return None
+
+
+_difficulty_index: Optional[DifficultyIndex] = None
+_index_loaded: bool = False
+
+
+def get_difficulty_index() -> Optional[DifficultyIndex]:
+    """The shared index, memory-mapped on first use; None when it hasn't been built"""
+    global _difficulty_index, _index_loaded
+    if not _index_loaded:
+        _index_loaded = True
+        if os.path.exists(DIFFICULTY_INDEX_FILE):
+            try:
+                _difficulty_index = DifficultyIndex.open(DIFFICULTY_INDEX_FILE)
+            except (OSError, ValueError, struct.error) as e:
+                print(f"Error loading difficulty index {DIFFICULTY_INDEX_FILE}: {e}")
+    return _difficulty_index
+
+
+def pick_word(difficulty: str, rng: random.Random = random) -> Optional[str]:
+    """Word for the level from the difficulty index, or None to fall back to word length"""
+    index = get_difficulty_index()
+    return index.pick_word(difficulty, rng) if index is not None else None
+
+
+def main(argv: list[str]) -> int:
+    if not argv or argv[0] != "build":
+        print("Usage: python difficulty_index.py build [INDEX]")
+        return 1
+
+    from local_words import LOCAL_WORDS
+    dictionary = get_dictionary(word for words in LOCAL_WORDS.values() for word in words)
+    index_path: str = argv[1] if len(argv) > 1 else DIFFICULTY_INDEX_FILE
+    count: int = build_difficulty_index(dictionary, index_path)
+
+    index = DifficultyIndex.open(index_path)
+    for difficulty, settings in DIFFICULTY_SETTINGS.items():
+        ranks = index.band(*settings['score_band'])
+        if not ranks:
+            print(f"{difficulty:>13}: no words")
+            continue
+        easiest, hardest = index.entry(ranks[0]), index.entry(ranks[-1])
+        print(f"{difficulty:>13}: {len(ranks)} words, {easiest[1]}-{hardest[1]} wrong guesses")
+    print(f"Wrote {count} words to {index_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,242 @@
+# engine.py
+# Headless hangman rules: no input(), print() or screen handling, so games
+# can be driven by the terminal UI, bots, servers and benchmarks alike
+
+import random
+from typing import Optional
+
+# Word lengths for different difficulty levels
+WORD_LISTS: dict[str, list[int]] = {
+    'beginner': [
+        5, 6, 7
+    ],
+    'intermediate': [
+        10, 11, 12
+    ],
+    'professional': [
+        13, 14
+    ]
+}
+
+# Difficulty stage settings; score_band is the slice of the difficulty index
+# (easiest word 0.0, hardest 1.0) words are drawn from when it has been built
+DIFFICULTY_SETTINGS: dict[str, dict] = {
+    'beginner': {'max_attempts': 6, 'hints': (3, 3), 'score_band': (0.0, 0.4)},
+    'intermediate': {'max_attempts': 5, 'hints': (2, 2), 'score_band': (0.3, 0.75)},
+    'professional': {'max_attempts': 4, 'hints': (0, 1), 'score_band': (0.7, 1.0)}
+}
+
+CORRECT: str = 'correct'
+INCORRECT: str = 'incorrect'
+ALREADY_GUESSED: str = 'already_guessed'
+
+
+def letter_bit(letter: str) -> int:
+    """Bit for a lowercase ASCII letter in a 26-bit letter mask"""
+    return 1 << (ord(letter) - ord('a'))
+
+
+def letters_from_mask(mask: int) -> list[str]:
+    """Letters set in a mask, in alphabetical order"""
+    letters: list[str] = []
+    index: int = 0
+    while mask:
+        if mask & 1:
+            letters.append(chr(ord('a') + index))
+        mask >>= 1
+        index += 1
+    return letters
+
+
+def random_length(difficulty: str, rng: random.Random = random) -> int:
+    """Pick a word length for the difficulty level"""
+    return rng.choice(WORD_LISTS[difficulty])
+
+
+class GuessResult:
+    """Outcome of one HangmanEngine.guess call"""
+    __slots__ = ('letter', 'status', 'revealed', 'attempts_left', 'won', 'lost')
+
+    def __init__(self, letter: str, status: str, revealed: tuple[int, ...],
+                 attempts_left: int, won: bool, lost: bool) -> None:
+        self.letter: str = letter
+        self.status: str = status
+        # Positions uncovered by this guess
+        self.revealed: tuple[int, ...] = revealed
+        self.attempts_left: int = attempts_left
+        self.won: bool = won
+        self.lost: bool = lost
+
+    @property
+    def finished(self) -> bool:
+        return self.won or self.lost
+
+    def __repr__(self) -> str:
+        return (f"GuessResult({self.letter!r}, {self.status!r}, revealed={self.revealed}, "
+                f"attempts_left={self.attempts_left}, won={self.won}, lost={self.lost})")
+
+
+class HangmanEngine:
+    """State and rules of a single hangman game
+
+    Guessed, correct and incorrect letters are 26-bit masks, and the positions
+    of each letter in the word are indexed once, so a guess only touches the
+    positions it reveals.
+    """
+    __slots__ = (
+        'word', 'difficulty', 'word_length', 'display', 'blanks_left',
+        'letter_positions', 'wrong_guesses', 'max_wrong_guesses',
+        'guessed_mask', 'correct_mask', 'incorrect_mask', 'guess_count',
+    )
+
+    def __init__(self, word: str, difficulty: str, hints: bool = True,
+                 rng: random.Random = random) -> None:
+        if difficulty not in DIFFICULTY_SETTINGS:
+            raise ValueError(f"Unknown difficulty: {difficulty}")
+        if not word or not word.isascii() or not word.isalpha():
+            raise ValueError(f"Word must be ASCII letters only: {word!r}")
+
+        word = word.lower()
+        self.word: str = word
+        self.difficulty: str = difficulty
+        self.word_length: int = len(word)
+        self.max_wrong_guesses: int = DIFFICULTY_SETTINGS[difficulty]['max_attempts']
+        self.wrong_guesses: int = 0
+        self.guessed_mask: int = 0
+        self.correct_mask: int = 0
+        self.incorrect_mask: int = 0
+        self.guess_count: int = 0
+
+        # Create display word with blanks
+        self.display: list[str] = ["_" for letter in word]
+        self.blanks_left: int = self.word_length
+
+        positions: list[list[int]] = [[] for _ in range(26)]
+        for i, letter in enumerate(word):
+            positions[ord(letter) - ord('a')].append(i)
+        self.letter_positions: list[tuple[int, ...]] = [tuple(p) for p in positions]
+
+        if hints:
+            self.add_hints(rng=rng)
+
+    @classmethod
+    def restore(cls, word: str, difficulty: str, revealed_mask: int, guessed_mask: int,
+                correct_mask: int, incorrect_mask: int, wrong_guesses: int,
+                guess_count: int) -> "HangmanEngine":
+        """Rebuild a game in progress from its masks and counters (e.g. a saved snapshot)"""
+        engine = cls(word, difficulty, hints=False)
+        for pos in range(engine.word_length):
+            if revealed_mask >> pos & 1:
+                engine.display[pos] = engine.word[pos]
+                engine.blanks_left -= 1
+        engine.guessed_mask = guessed_mask
+        engine.correct_mask = correct_mask
+        engine.incorrect_mask = incorrect_mask
+        engine.wrong_guesses = wrong_guesses
+        engine.guess_count = guess_count
+        return engine
+
+    def add_hints(self, count: Optional[int] = None, rng: random.Random = random) -> list[int]:
+        """Reveal `count` random positions (default: the difficulty's hint range)"""
+        if count is None:
+            min_hints, max_hints = DIFFICULTY_SETTINGS[self.difficulty]['hints']
+            count = rng.randint(min_hints, max_hints)
+
+        # Get random positions for hints
+        blanks: list[int] = [i for i, letter in enumerate(self.display) if letter == "_"]
+        positions: list[int] = rng.sample(blanks, min(count, len(blanks)))
+        self.reveal_positions(positions)
+        return positions
+
+    def reveal_positions(self, positions: list[int]) -> None:
+        """Show the letters at the given positions as hints"""
+        for pos in positions:
+            if self.display[pos] != "_":
+                continue
+            letter: str = self.word[pos]
+            self.display[pos] = letter
+            self.blanks_left -= 1
+            self.correct_mask |= letter_bit(letter)
+
+    def guess(self, letter: str) -> GuessResult:
+        """Apply a single-letter guess and report what happened"""
+        letter = letter.lower()
+        if len(letter) != 1 or not letter.isascii() or not letter.isalpha():
+            raise ValueError(f"Guess must be a single letter: {letter!r}")
+        if self.finished:
+            raise ValueError("The game is already over")
+
+        bit: int = letter_bit(letter)
+
+        # Check if already guessed
+        if self.guessed_mask & bit:
+            return self._result(letter, ALREADY_GUESSED, ())
+
+        self.guessed_mask |= bit
+        self.guess_count += 1
+
+        # Reveal any positions of the letter that are still blank
+        revealed: list[int] = []
+        for i in self.letter_positions[ord(letter) - ord('a')]:
+            if self.display[i] == "_":
+                self.display[i] = letter
+                revealed.append(i)
+
+        if revealed:
+            # Correct guess - revealed new letter(s)
+            self.blanks_left -= len(revealed)
+            self.correct_mask |= bit
+            return self._result(letter, CORRECT, tuple(revealed))
+
+        # Wrong guess - either not in word or already revealed in hints
+        self.incorrect_mask |= bit
+        self.wrong_guesses += 1
+        return self._result(letter, INCORRECT, ())
+
+    def _result(self, letter: str, status: str, revealed: tuple[int, ...]) -> GuessResult:
+        return GuessResult(letter, status, revealed, self.attempts_left, self.won, self.lost)
+
+    @property
+    def attempts_left(self) -> int:
+        return self.max_wrong_guesses - self.wrong_guesses
+
+    @property
+    def won(self) -> bool:
+        return self.blanks_left == 0
+
+    @property
+    def lost(self) -> bool:
+        return self.blanks_left > 0 and self.wrong_guesses >= self.max_wrong_guesses
+
+    @property
+    def finished(self) -> bool:
+        return self.won or self.lost
+
+    @property
+    def guessed_letters(self) -> list[str]:
+        """Every letter guessed so far"""
+        return letters_from_mask(self.guessed_mask)
+
+    @property
+    def correct_guesses(self) -> list[str]:
+        """Letters revealed by a correct guess or a hint"""
+        return letters_from_mask(self.correct_mask)
+
+    @property
+    def incorrect_guesses(self) -> list[str]:
+        """Guesses that revealed nothing"""
+        return letters_from_mask(self.incorrect_mask)
+
+    @property
+    def revealed_mask(self) -> int:
+        """Bitmask of the word positions already shown"""
+        mask: int = 0
+        for pos, letter in enumerate(self.display):
+            if letter != "_":
+                mask |= 1 << pos
+        return mask
+
+    @property
+    def masked_word(self) -> str:
+        """The word as the player sees it, e.g. 'b_n_n_'"""
+        return "".join(self.display)
@@ -0,0 +1,60 @@
+# file_lock.py
+# Advisory inter-process lock on a side file (fcntl, Unix only)
+
+import os
+import threading
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: locking is skipped
+    fcntl = None
+
+
+class FileLock:
+    """Exclusive lock held on `<path>.lock` for the duration of a with-block
+
+    The lock lives on a separate file because the data files it protects are
+    replaced by rename, which would silently drop a lock held on them.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.lock_path: str = f"{path}.lock"
+        self._fd: Optional[int] = None
+        self._depth: int = 0
+        # Serialises threads of this process; flock only arbitrates between processes
+        self._thread_lock = threading.RLock()
+
+    def acquire(self) -> None:
+        self._thread_lock.acquire()
+        # Re-entrant within one thread so helpers can nest
+        self._depth += 1
+        if self._depth > 1 or fcntl is None:
+            return
+        try:
+            self._fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        except OSError:
+            self._depth -= 1
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+            self._thread_lock.release()
+            raise
+
+    def release(self) -> None:
+        try:
+            self._depth -= 1
+            if self._depth == 0 and self._fd is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+                os.close(self._fd)
+                self._fd = None
+        finally:
+            self._thread_lock.release()
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
@@ -1,52 +1,83 @@
 import random
-import os
+import time
+from typing import Optional
 from hangman_art import (hangman_stages, welcome_banner, difficulty_banner, 
                         win_messages, lose_message, status_emojis, level_emojis)
-from retrieve_word_fn import retrieve_word
+from word_prefetch import prefetcher
+from renderer import renderer
+from render_cache import render_cache
+from difficulty_index import get_difficulty_index, pick_word
+from game_history import get_game_history
+from leaderboard import get_leaderboard
+from replay_log import GameRecorder, replay_log
+from game_snapshot import GameSnapshot, get_snapshot_store
+from user_store import UserStoreError
+from engine import HangmanEngine, WORD_LISTS, DIFFICULTY_SETTINGS
 import login_signup
+import metrics
 
 
 def clear_screen () -> None:
     """Clear the console screen"""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    renderer.clear()
 
 
 class HangmanGame:
+    """Terminal front end: all rules live in engine.HangmanEngine"""
+    __slots__ = (
+        'difficulty', 'engine', 'max_wrong_guesses',
+        'game_over', 'last_guess', 'last_guess_status', 'quit_game', 'started_at',
+        'recorder',
+    )
+
+    # Word lists for different difficulty levels
+    word_lists: dict[str, list[int]] = WORD_LISTS
+    
+    # Difficulty stage settings
+    difficulty_settings: dict[str, dict] = DIFFICULTY_SETTINGS
+
     def __init__(self) -> None:
-        # Word lists for different difficulty levels
-        self.word_lists: dict[str, list[int]] = {
-            'beginner': [
-                5, 6,7
-            ],
-            'intermediate': [
-                10, 11, 12
-            ],
-            'professional': [
-                13, 14
-            ]
-        }
-        
-        # Difficulty stage settings
-        self.difficulty_settings = {
-            'beginner': {'max_attempts': 6, 'hints': (3, 3)},
-            'intermediate': {'max_attempts': 5, 'hints': (2, 2)},
-            'professional': {'max_attempts': 4, 'hints': (0, 1)}
-        }
+        # Start fetching words in the background so choose_word never waits;
+        # with a difficulty index, words come from it and the network isn't needed
+        if get_difficulty_index() is None:
+            prefetcher.start(length for lengths in self.word_lists.values() for length in lengths)
         
         # Game state variables
         self.difficulty: str = ""
-        self.chosen_word: str = ""
-        self.word_length: int = 0
-        self.display: list[str] = []
-        self.wrong_guesses: int = 0
         self.max_wrong_guesses = 6
-        self.guessed_letters: list[str] = []
-        self.correct_guesses: list[str] = []
-        self.incorrect_guesses: list[str] = []
-        self.game_over: bool = False
-        self.last_guess: str = ""
-        self.last_guess_status: str = ""
-        self.quit_game:bool  = False  # New variable to track if user wants to quit
+        self.reset_game()
+
+    # Read-only views of the current engine's state
+    @property
+    def chosen_word(self) -> str:
+        return self.engine.word if self.engine else ""
+
+    @property
+    def word_length(self) -> int:
+        return self.engine.word_length if self.engine else 0
+
+    @property
+    def display(self) -> list[str]:
+        return self.engine.display if self.engine else []
+
+    @property
+    def wrong_guesses(self) -> int:
+        return self.engine.wrong_guesses if self.engine else 0
+
+    @property
+    def guessed_letters(self) -> list[str]:
+        """Every letter guessed so far"""
+        return self.engine.guessed_letters if self.engine else []
+
+    @property
+    def correct_guesses(self) -> list[str]:
+        """Letters revealed by a correct guess or a hint"""
+        return self.engine.correct_guesses if self.engine else []
+
+    @property
+    def incorrect_guesses(self) -> list[str]:
+        """Guesses that revealed nothing"""
+        return self.engine.incorrect_guesses if self.engine else []
 
     def display_user_stats(self) -> None:
         """Display current user's statistics"""
@@ -61,6 +92,36 @@ class HangmanGame:
             print(f"👤 Player: {login_signup.current_user['username']}")
             print(f"🎮 Games Played: {plays} | 🏆 Wins: {wins} | 💀 Losses: {losses}")
             print(f"📊 Win Rate: {win_rate:.1f}%")
+            
+            # Leaderboard positions (binary searches, not a scan of every user)
+            username: str = login_signup.current_user['username']
+            ranks: list[str] = []
+            try:
+                board = get_leaderboard()
+                for name, label in (('wins', 'wins'), ('win_rate', 'win rate'), ('plays', 'games played')):
+                    rank: Optional[int] = board.rank(name, username)
+                    if rank is not None:
+                        ranks.append(f"#{rank} of {board.size(name)} by {label}")
+            except (OSError, UserStoreError) as e:
+                print(f"⚠️  Leaderboard unavailable: {e}")
+            if ranks:
+                print(f"🏅 Rank: {' | '.join(ranks)}")
+            
+            # Per-difficulty and streak stats from the game history rollups
+            try:
+                history: Optional[dict] = get_game_history().user_stats(username)
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Game history unavailable: {e}")
+                history = None
+            if history:
+                streak: int = history['current_streak']
+                streak_text: str = f"{streak} win(s)" if streak > 0 else f"{-streak} loss(es)"
+                print(f"🔥 Current streak: {streak_text} | Best win streak: {history['best_streak']}")
+                for level, level_stats in history['difficulties'].items():
+                    print(f"   {level_emojis[level]} {level.title():<13} {level_stats['games']:>5} games "
+                          f"{level_stats['win_rate']:>5.1f}% won | "
+                          f"{level_stats['avg_guesses']:.1f} guesses, "
+                          f"{level_stats['avg_duration']:.0f}s on average")
             print("═" * 60)
     
     def select_difficulty(self) -> None:
@@ -92,30 +153,34 @@ class HangmanGame:
         self.max_wrong_guesses:int = self.difficulty_settings[self.difficulty]['max_attempts']
     
     def choose_word(self) -> None:
-        """Randomly choose a word from the selected difficulty list"""
-        word_num: list[int] = self.word_lists[self.difficulty]
-        self.chosen_word = retrieve_word(random.choice(word_num))
-        self.word_length = len(self.chosen_word)
-        
-        # Create display words with blanks
-        self.display = ["_" for letter in self.chosen_word]
+        """Choose a word from the level's difficulty band, or by word length without an index"""
+        start: float = time.perf_counter()
+        word: Optional[str] = pick_word(self.difficulty)
+        source: str = 'index'
+        if word is None:
+            word_num: list[int] = self.word_lists[self.difficulty]
+            word, source = prefetcher.take_word(random.choice(word_num))
+        metrics.inc("hangman_choose_word_total", source=source)
+        metrics.observe("hangman_choose_word_seconds", time.perf_counter() - start,
+                        metrics.FAST_BUCKETS, source=source)
+        self.set_word(word)
         
         # Add hints based on difficulty level
-        self.add_hints()
+        hints: list[int] = self.add_hints()
+        
+        # Log the word and hints so the game can be replayed
+        self.recorder = replay_log.start_game(self.difficulty, self.chosen_word, hints)
+        self.save_snapshot()
     
-    def add_hints(self) -> None:
+    def set_word(self, word: str) -> None:
+        """Start a new engine for `word` (without hints)"""
+        self.engine = HangmanEngine(word, self.difficulty, hints=False)
+        self.max_wrong_guesses = self.engine.max_wrong_guesses
+        self.started_at: float = time.monotonic()
+    
+    def add_hints(self) -> list[int]:
         """Add initial visible letters based on difficulty"""
-        min_hints, max_hints = self.difficulty_settings[self.difficulty]['hints']
-        num_hints: int = random.randint(min_hints, max_hints)
-        
-        # Get random positions for hints
-        positions: list[int] = random.sample(range(self.word_length), num_hints)
-        
-        for pos in positions:
-            letter: str = self.chosen_word[pos]
-            self.display[pos] = letter
-            if letter not in self.correct_guesses:
-                self.correct_guesses.append(letter)
+        return self.engine.add_hints()
     
     def display_hearts(self) -> str:
         """Display remaining attempts as hearts"""
@@ -123,48 +188,45 @@ class HangmanGame:
         hearts = status_emojis['heart'] * attempts_left
         return f"Attempts Left: {attempts_left} {hearts}"
     
-    def display_game_state(self) -> None:
-        """Display current game state with emojis"""
-        clear_screen()
-        print(welcome_banner)
+    def game_state_frame(self) -> list[bytes]:
+        """Build the game screen as encoded lines, mostly from the render cache"""
+        frame: list[bytes] = list(render_cache.banner())
         
         # Show user info if logged in
         if login_signup.current_user:
-            print(f"👤 Playing as: {login_signup.current_user['username']}")
+            frame.append(f"👤 Playing as: {login_signup.current_user['username']}".encode())
         
-        print(f"{level_emojis[self.difficulty]} DIFFICULTY: {self.difficulty.upper()}")
-        print("═" * 60)
+        frame.extend(render_cache.difficulty_header(self.difficulty))
         
         # Display attempts
-        print(self.display_hearts())
-        print()
+        frame.extend(render_cache.hearts(self.max_wrong_guesses - self.wrong_guesses))
         
         # Display previous guess status
         if self.last_guess:
-            if self.last_guess_status == 'correct':
-                print(f"{status_emojis['correct']} Previous guess '{self.last_guess.upper()}' is correct!")
-            elif self.last_guess_status == 'incorrect':
-                print(f"{status_emojis['incorrect']} Previous guess '{self.last_guess.upper()}' is incorrect")
-            elif self.last_guess_status == 'already_guessed':
-                print(f"{status_emojis['already_guessed']} Previous guess '{self.last_guess.upper()}' has been entered")
+            frame.extend(render_cache.guess_status(self.last_guess_status, self.last_guess))
         
-        # Display correct guesses
-        if self.correct_guesses:
-            correct_display: str = " ".join([letter.upper() for letter in sorted(self.correct_guesses)])
-            print(f"{status_emojis['correct']} Previous guesses correct: [ {correct_display} ]")
+        # Display correct guesses (already in alphabetical order)
+        if self.engine.correct_mask:
+            correct_display: str = " ".join([letter.upper() for letter in self.correct_guesses])
+            frame.append(f"{status_emojis['correct']} Previous guesses correct: [ {correct_display} ]".encode())
         
         # Display incorrect guesses
-        if self.incorrect_guesses:
-            incorrect_display: str = " ".join([letter.upper() for letter in sorted(self.incorrect_guesses)])
-            print(f"{status_emojis['incorrect']} Previous guesses incorrect: [ {incorrect_display} ]")
+        if self.engine.incorrect_mask:
+            incorrect_display: str = " ".join([letter.upper() for letter in self.incorrect_guesses])
+            frame.append(f"{status_emojis['incorrect']} Previous guesses incorrect: [ {incorrect_display} ]".encode())
         
-        print("\nGallows:")
-        print(hangman_stages[self.wrong_guesses])
+        frame.extend(render_cache.gallows(self.wrong_guesses))
         
         # Display word
         word_display: str = " ".join([letter.upper() for letter in self.display])
-        print(f"{status_emojis['target']} Word to guess: {word_display}")
-        print("═" * 60)
+        frame.append(f"{status_emojis['target']} Word to guess: {word_display}".encode())
+        frame.extend(render_cache.separator())
+        return frame
+    
+    @metrics.timed("hangman_display_game_state_seconds", metrics.FAST_BUCKETS)
+    def display_game_state(self) -> None:
+        """Display current game state with emojis, redrawing only what changed"""
+        renderer.render_frame(self.game_state_frame())
     
     def get_user_guess(self) -> str:
         """Get and validate user's letter guess"""
@@ -181,7 +243,7 @@ class HangmanGame:
                 continue
                 
             # Check if input is a letter
-            if not guess.isalpha():
+            if not guess.isascii() or not guess.isalpha():
                 print("⚠️  Please enter a valid letter!")
                 continue
                 
@@ -194,32 +256,57 @@ class HangmanGame:
             self.quit_game = True
             return
             
+        result = self.engine.guess(guess)
         self.last_guess = guess
-        
-        # Check if already guessed
-        if guess in self.guessed_letters:
-            self.last_guess_status = 'already_guessed'
-            return
-        
-        self.guessed_letters.append(guess)
-        
-        # Check if the guess reveals any new letters
-        new_letters_revealed = False
-        if guess in self.chosen_word:
-            for i in range(self.word_length):
-                if self.chosen_word[i] == guess and self.display[i] == "_":
-                    self.display[i] = guess
-                    new_letters_revealed = True
-        
-        if new_letters_revealed:
-            # Correct guess - revealed new letter(s)
-            self.last_guess_status = 'correct'
-            self.correct_guesses.append(guess)
-        else:
-            # Wrong guess - either not in word or already revealed in hints
-            self.last_guess_status = 'incorrect'
-            self.incorrect_guesses.append(guess)
-            self.wrong_guesses += 1
+        self.last_guess_status = result.status
+        if self.recorder is not None:
+            self.recorder.guess(result.letter, result.status)
+        self.save_snapshot()
+    
+    def snapshot(self) -> GameSnapshot:
+        """The game in progress, as saved between sessions"""
+        engine: HangmanEngine = self.engine
+        return GameSnapshot(
+            self.difficulty, engine.word, engine.revealed_mask, engine.guessed_mask,
+            engine.correct_mask, engine.incorrect_mask, engine.wrong_guesses, engine.guess_count,
+            self.last_guess, self.last_guess_status,
+            self.recorder.game_id if self.recorder is not None else 0,
+            time.monotonic() - self.started_at, time.time())
+    
+    def save_snapshot(self) -> bool:
+        """Save the logged-in player's game so it can be resumed after quitting"""
+        if not login_signup.current_user or self.engine is None or self.engine.finished:
+            return False
+        try:
+            get_snapshot_store().save(login_signup.current_user['username'], self.snapshot())
+            return True
+        except OSError as e:
+            print(f"⚠️  Failed to save game: {e}")
+            return False
+    
+    def discard_snapshot(self) -> None:
+        """Forget the logged-in player's saved game"""
+        if login_signup.current_user:
+            try:
+                get_snapshot_store().delete(login_signup.current_user['username'])
+            except OSError as e:
+                print(f"⚠️  Failed to remove saved game: {e}")
+    
+    def restore(self, snapshot: GameSnapshot) -> None:
+        """Pick up a saved game where it was left"""
+        self.reset_game()
+        self.difficulty = snapshot.difficulty
+        self.engine = HangmanEngine.restore(
+            snapshot.word, snapshot.difficulty, snapshot.revealed_mask, snapshot.guessed_mask,
+            snapshot.correct_mask, snapshot.incorrect_mask, snapshot.wrong_guesses,
+            snapshot.guess_count)
+        self.max_wrong_guesses = self.engine.max_wrong_guesses
+        self.started_at = time.monotonic() - snapshot.elapsed
+        self.last_guess = snapshot.last_guess
+        self.last_guess_status = snapshot.last_guess_status
+        # Keep logging guesses under the original game's replay id
+        if snapshot.game_id:
+            self.recorder = GameRecorder(replay_log, snapshot.game_id)
     
     def update_stats(self, won) -> None:
         """Update user statistics after game ends"""
@@ -229,18 +316,29 @@ class HangmanGame:
                 print(f"📊 Stats updated successfully!")
             else:
                 print(f"⚠️  Failed to update stats.")
+            self.record_history(won)
         else:
             print("🔒 Login to save your stats!")
     
+    def record_history(self, won: bool) -> None:
+        """Add the finished game to the logged-in player's game history"""
+        try:
+            get_game_history().record(
+                login_signup.current_user['username'], self.difficulty, self.word_length,
+                self.engine.guess_count, self.wrong_guesses, won,
+                time.monotonic() - self.started_at)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Failed to save game history: {e}")
+    
     def check_game_over(self) -> None:
         """Check if the game has ended"""
         # Check if player won (no more blanks)
-        if "_" not in self.display:
+        if self.engine.won:
             clear_screen()
             print(win_messages[self.difficulty])
             print(f"🎯 The word was: {self.chosen_word.upper()}")
             print(f"📝 Word: {' '.join([letter.upper() for letter in self.display])}")
-            print(f"🎪 You completed it in {len(self.guessed_letters)} guesses!")
+            print(f"🎪 You completed it in {self.engine.guess_count} guesses!")
             
             # Update stats for win
             self.update_stats(won=True)
@@ -248,7 +346,7 @@ class HangmanGame:
             self.game_over = True
             
         # Check if player lost (too many wrong guesses)
-        elif self.wrong_guesses >= self.max_wrong_guesses:
+        elif self.engine.lost:
             clear_screen()
             print(lose_message)
             print("Final Gallows:")
@@ -259,6 +357,10 @@ class HangmanGame:
             self.update_stats(won=False)
             
             self.game_over = True
+        
+        if self.game_over:
+            self.discard_snapshot()
+            replay_log.flush()
     
     def show_final_stats(self) -> None:
         """Show updated user statistics after game"""
@@ -283,17 +385,12 @@ class HangmanGame:
     
     def reset_game(self):
         """Reset game variables for a new game"""
-        self.chosen_word = ""
-        self.word_length = 0
-        self.display = []
-        self.wrong_guesses = 0
-        self.guessed_letters = []
-        self.correct_guesses = []
-        self.incorrect_guesses = []
-        self.game_over = False
-        self.last_guess = ""
-        self.last_guess_status = ""
-        self.quit_game = False  # Reset quit flag
+        self.engine: Optional[HangmanEngine] = None
+        self.game_over: bool = False
+        self.last_guess: str = ""
+        self.last_guess_status: str = ""
+        self.quit_game: bool = False  # Reset quit flag
+        self.recorder: Optional[GameRecorder] = None
     
     def handle_quit(self) -> None:
         """Handle the quit command gracefully"""
@@ -303,14 +400,29 @@ class HangmanGame:
         if login_signup.current_user:
             print(f"👋 Goodbye, {login_signup.current_user['username']}!")
             print("📊 Your stats have been saved!")
+            if self.save_snapshot():
+                print("💾 Your game has been saved - pick 'Resume game' from the menu to finish it!")
         else:
             print("👋 Thanks for playing the Ultimate Hangman Challenge!")
             print("🔒 Create an account next time to track your progress!")
         
         print("🎪 See you next time, champion!")
     
-    def run(self) -> None:
-        """Main game loop"""
+    def play_round(self) -> None:
+        """Play the current word until it is won, lost or the player quits"""
+        while not self.game_over and not self.quit_game:
+            self.display_game_state()
+            guess: str = self.get_user_guess()
+            self.process_guess(guess)
+            
+            # Check if user wants to quit
+            if self.quit_game:
+                break
+                
+            self.check_game_over()
+    
+    def run(self, snapshot: Optional[GameSnapshot] = None) -> None:
+        """Main game loop, optionally starting with a saved game"""
         clear_screen()
         print(welcome_banner)
         
@@ -325,29 +437,28 @@ class HangmanGame:
         input("Press Enter to start your adventure...")
         
         while True:
-            # Select difficulty
-            self.select_difficulty()
-            
-            # Start new game
-            self.choose_word()
-            
-            print(f"\n🎯 Starting {self.difficulty.upper()} level!")
-            print(f"💡 Word length: {self.word_length} letters")
-            print(f"💖 You have {self.max_wrong_guesses} attempts")
-            print("💡 Tip: Type 'quit' or 'exit' anytime to quit the game")
-            input("Press Enter to begin...")
+            if snapshot is not None:
+                # Resume the saved game
+                self.restore(snapshot)
+                snapshot = None
+                print(f"\n💾 Resuming your {self.difficulty.upper()} game!")
+                print(f"💖 You have {self.engine.attempts_left} attempts left")
+                input("Press Enter to continue...")
+            else:
+                # Select difficulty
+                self.select_difficulty()
+                
+                # Start new game
+                self.choose_word()
+                
+                print(f"\n🎯 Starting {self.difficulty.upper()} level!")
+                print(f"💡 Word length: {self.word_length} letters")
+                print(f"💖 You have {self.max_wrong_guesses} attempts")
+                print("💡 Tip: Type 'quit' or 'exit' anytime to quit the game")
+                input("Press Enter to begin...")
             
             # Game loop
-            while not self.game_over and not self.quit_game:
-                self.display_game_state()
-                guess: str = self.get_user_guess()
-                self.process_guess(guess)
-                
-                # Check if user wants to quit
-                if self.quit_game:
-                    break
-                    
-                self.check_game_over()
+            self.play_round()
             
             # Handle quit during game
             if self.quit_game:
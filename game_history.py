@@ -0,0 +1,303 @@
+# game_history.py
+# Every finished game, stored column by column, plus per-user rollups so a
+# player's per-difficulty and streak stats are a dictionary lookup
+#
+# Layout of HISTORY_DIR:
+#   <column>.col    one fixed-width value per game (see COLUMNS), appended
+#   users.jsonl     usernames, one JSON string per line; line n is user id n
+#   rollups/checkpoint.json   {"rows": n}: every shard covers the first n games
+#   rollups/<k>.json          {"rows": n, "rollups": {...}} for the users whose
+#                             id % ROLLUP_SHARDS == k
+#
+# A shard is read the first time one of its users is asked about, and only
+# the games appended after its checkpoint are folded in, so neither startup
+# nor a lookup rescans the whole history or parses every user's rollup. A
+# checkpoint rewrites just the shards of users who played since the last one.
+
+import array
+import json
+import os
+import time
+from typing import Container, Iterable, Optional
+from engine import DIFFICULTY_SETTINGS
+from file_lock import FileLock
+from user_store import write_atomic
+
+HISTORY_DIR: str = os.environ.get("HANGMAN_HISTORY_DIR", "history.d")
+
+# Column name -> array typecode
+COLUMNS: dict[str, str] = {
+    'user': 'I',
+    'difficulty': 'B',
+    'word_length': 'B',
+    'guesses': 'B',
+    'wrong': 'B',
+    'won': 'B',
+    'duration_ms': 'I',
+    'finished_at': 'd',
+}
+
+# Stored difficulty codes are indexes into this list, so only append to it
+DIFFICULTIES: list[str] = list(DIFFICULTY_SETTINGS)
+
+# Checkpoint the rollups after this many new games
+CHECKPOINT_EVERY: int = 256
+
+# Rollup files, each holding the users whose id falls in it; enough that a
+# checkpoint rewrites only a few users per changed shard
+ROLLUP_SHARDS: int = 4096
+
+
+def new_rollup() -> dict:
+    return {'games': 0, 'wins': 0, 'current_streak': 0, 'best_streak': 0, 'difficulties': {}}
+
+
+def fold_game(rollup: dict, difficulty: str, guesses: int, wrong: int, won: bool,
+              duration_ms: int) -> None:
+    """Add one finished game to a user's rollup"""
+    rollup['games'] += 1
+    rollup['wins'] += won
+    # Positive: wins in a row; negative: losses in a row
+    streak: int = rollup['current_streak']
+    if won:
+        streak = streak + 1 if streak > 0 else 1
+        rollup['best_streak'] = max(rollup['best_streak'], streak)
+    else:
+        streak = streak - 1 if streak < 0 else -1
+    rollup['current_streak'] = streak
+
+    level: dict = rollup['difficulties'].setdefault(
+        difficulty, {'games': 0, 'wins': 0, 'guesses': 0, 'wrong': 0, 'duration_ms': 0})
+    level['games'] += 1
+    level['wins'] += won
+    level['guesses'] += guesses
+    level['wrong'] += wrong
+    level['duration_ms'] += duration_ms
+
+
+class GameHistory:
+    """Append-only columnar game log with per-user rollups"""
+
+    def __init__(self, directory: str = HISTORY_DIR) -> None:
+        self.directory: str = directory
+        os.makedirs(directory, exist_ok=True)
+        self.lock = FileLock(os.path.join(directory, "history"))
+        self._user_ids: dict[str, int] = {}
+        self._usernames: list[str] = []
+        self._names_offset: int = 0
+        # Rollups of the shards read so far: shard -> username -> rollup
+        self._shards: dict[int, dict[str, dict]] = {}
+        # Games seen (and folded into every loaded shard), and how many the checkpoint covers
+        self._rows: int = 0
+        self._checkpoint_rows: int = 0
+        self._loaded: bool = False
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _rows_on_disk(self) -> int:
+        """Complete games on disk: a crash mid-append can leave some columns one row longer"""
+        rows: Optional[int] = None
+        for column, typecode in COLUMNS.items():
+            try:
+                size: int = os.path.getsize(self._path(f"{column}.col"))
+            except FileNotFoundError:
+                size = 0
+            count: int = size // array.array(typecode).itemsize
+            rows = count if rows is None else min(rows, count)
+        return rows or 0
+
+    def _load_checkpoint(self, rows_on_disk: int) -> None:
+        try:
+            with open(self._path("rollups/checkpoint.json"), 'r') as file:
+                rows: int = int(json.load(file)['rows'])
+        except (FileNotFoundError, ValueError, KeyError, TypeError):
+            return
+        if self._checkpoint_rows < rows <= rows_on_disk:
+            self._checkpoint_rows = rows
+
+    def _load_shards(self, shards: Iterable[int]) -> None:
+        """Read shards' rollups and fold in the games after them (caller holds the lock)"""
+        # Shards by the number of games their file covers, folded forward together
+        covered: dict[int, set[int]] = {}
+        for shard in shards:
+            # A shard missing from the last checkpoint had no games before it
+            rows: int = self._checkpoint_rows
+            rollups: dict[str, dict] = {}
+            try:
+                with open(self._path(f"rollups/{shard}.json"), 'r') as file:
+                    checkpoint = json.load(file)
+                # Shards are written before checkpoint.json, so a shard can be ahead of it
+                rows = max(rows, int(checkpoint['rows']))
+                rollups = checkpoint['rollups']
+            except FileNotFoundError:
+                pass
+            except (ValueError, KeyError, TypeError):
+                rows = 0
+            if rows > self._rows:
+                rows, rollups = 0, {}
+            self._shards[shard] = rollups
+            covered.setdefault(rows, set()).add(shard)
+        for rows, group in covered.items():
+            self._fold_rows(rows, self._rows, group)
+
+    def _fold_rows(self, start: int, stop: int, shards: Container[int]) -> None:
+        """Fold games start..stop into the given loaded shards"""
+        if start >= stop:
+            return
+        columns = self._read_columns(start, stop)
+        for row, user_id in enumerate(columns['user']):
+            shard: int = user_id % ROLLUP_SHARDS
+            if shard not in shards:
+                continue
+            fold_game(self._shards[shard].setdefault(self._usernames[user_id], new_rollup()),
+                      DIFFICULTIES[columns['difficulty'][row]], columns['guesses'][row],
+                      columns['wrong'][row], bool(columns['won'][row]),
+                      columns['duration_ms'][row])
+
+    def _sync(self) -> None:
+        """Fold in games appended since the last call (caller holds the lock)"""
+        rows_on_disk: int = self._rows_on_disk()
+        if not self._loaded:
+            self._loaded = True
+            self._load_checkpoint(rows_on_disk)
+            # No shard is loaded yet, so there is nothing to fold
+            self._rows = rows_on_disk
+
+        try:
+            with open(self._path("users.jsonl"), 'rb') as file:
+                file.seek(self._names_offset)
+                data: bytes = file.read()
+        except FileNotFoundError:
+            data = b""
+        end: int = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            username: str = json.loads(line)
+            self._user_ids[username] = len(self._usernames)
+            self._usernames.append(username)
+        self._names_offset += end
+
+        if rows_on_disk > self._rows:
+            if self._shards:
+                self._fold_rows(self._rows, rows_on_disk, self._shards)
+            self._rows = rows_on_disk
+
+    def _read_columns(self, start: int, stop: int,
+                      names: Iterable[str] = COLUMNS) -> dict[str, array.array]:
+        """Rows start..stop of the named columns (default every column)"""
+        columns: dict[str, array.array] = {}
+        for column in names:
+            values = array.array(COLUMNS[column])
+            with open(self._path(f"{column}.col"), 'rb') as file:
+                file.seek(start * values.itemsize)
+                values.fromfile(file, stop - start)
+            columns[column] = values
+        return columns
+
+    def record(self, username: str, difficulty: str, word_length: int, guesses: int,
+               wrong: int, won: bool, duration: float) -> None:
+        """Append one finished game (duration in seconds)"""
+        duration_ms: int = min(int(duration * 1000), 2**32 - 1)
+        with self.lock:
+            self._sync()
+            if username not in self._user_ids:
+                line: bytes = (json.dumps(username) + "\n").encode()
+                with open(self._path("users.jsonl"), 'ab') as file:
+                    file.write(line)
+                self._user_ids[username] = len(self._usernames)
+                self._usernames.append(username)
+                self._names_offset += len(line)
+
+            values: dict[str, float] = {
+                'user': self._user_ids[username],
+                'difficulty': DIFFICULTIES.index(difficulty),
+                'word_length': min(word_length, 255),
+                'guesses': min(guesses, 255),
+                'wrong': min(wrong, 255),
+                'won': int(won),
+                'duration_ms': duration_ms,
+                'finished_at': time.time(),
+            }
+            for column, typecode in COLUMNS.items():
+                path: str = self._path(f"{column}.col")
+                with open(path, 'ab') as file:
+                    # Drop a row left over from an interrupted append
+                    itemsize: int = array.array(typecode).itemsize
+                    if file.tell() != self._rows * itemsize:
+                        file.truncate(self._rows * itemsize)
+                    file.write(array.array(typecode, [values[column]]).tobytes())
+
+            rollups: Optional[dict[str, dict]] = self._shards.get(
+                self._user_ids[username] % ROLLUP_SHARDS)
+            if rollups is not None:
+                fold_game(rollups.setdefault(username, new_rollup()), difficulty,
+                          guesses, wrong, won, duration_ms)
+            self._rows += 1
+            if self._rows - self._checkpoint_rows >= CHECKPOINT_EVERY:
+                self.checkpoint()
+
+    def checkpoint(self) -> None:
+        """Save the rollups of users who played since the last checkpoint"""
+        with self.lock:
+            self._sync()
+            # Another process may have checkpointed since
+            self._load_checkpoint(self._rows)
+            if self._rows == self._checkpoint_rows:
+                return
+            changed: set[int] = {user_id % ROLLUP_SHARDS for user_id in
+                                 self._read_columns(self._checkpoint_rows, self._rows, ['user'])['user']}
+            self._load_shards(changed.difference(self._shards))
+            os.makedirs(self._path("rollups"), exist_ok=True)
+            for shard in sorted(changed):
+                write_atomic(self._path(f"rollups/{shard}.json"),
+                             json.dumps({'rows': self._rows, 'rollups': self._shards[shard]}).encode())
+            write_atomic(self._path("rollups/checkpoint.json"),
+                         json.dumps({'rows': self._rows}).encode())
+            self._checkpoint_rows = self._rows
+
+    def __len__(self) -> int:
+        with self.lock:
+            self._sync()
+            return self._rows
+
+    def user_stats(self, username: str) -> Optional[dict]:
+        """Per-difficulty averages and streaks for a user (None if they have no games)"""
+        with self.lock:
+            self._sync()
+            user_id: Optional[int] = self._user_ids.get(username)
+            if user_id is None:
+                return None
+            shard: int = user_id % ROLLUP_SHARDS
+            if shard not in self._shards:
+                self._load_shards([shard])
+            rollup: Optional[dict] = self._shards[shard].get(username)
+            if rollup is None:
+                return None
+            difficulties: dict[str, dict] = {}
+            for difficulty, level in rollup['difficulties'].items():
+                games: int = level['games']
+                difficulties[difficulty] = {
+                    'games': games,
+                    'wins': level['wins'],
+                    'win_rate': level['wins'] / games * 100,
+                    'avg_guesses': level['guesses'] / games,
+                    'avg_wrong': level['wrong'] / games,
+                    'avg_duration': level['duration_ms'] / games / 1000,
+                }
+            return {
+                'games': rollup['games'],
+                'wins': rollup['wins'],
+                'current_streak': rollup['current_streak'],
+                'best_streak': rollup['best_streak'],
+                'difficulties': difficulties,
+            }
+
+
+_game_history: Optional[GameHistory] = None
+
+
+def get_game_history() -> GameHistory:
+    global _game_history
+    if _game_history is None:
+        _game_history = GameHistory()
+    return _game_history
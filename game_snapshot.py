@@ -0,0 +1,159 @@
+# game_snapshot.py
+# Save/resume for in-progress games: a fixed-size binary snapshot per
+# logged-in player, rewritten after every guess and expired after a while
+#
+# Snapshot layout (little-endian, 74 bytes):
+#   4s magic b"HMS1", B difficulty, B word length, 14s word,
+#   H revealed positions, I guessed / correct / incorrect letter masks,
+#   B wrong guesses, B guess count, B last guess (0-26, 26 = none),
+#   B last guess status, Q replay log game id (0 = none),
+#   d seconds played, d unix time saved
+
+import hashlib
+import os
+import struct
+import time
+from typing import Optional
+from dictionary import MAX_LENGTH
+from engine import ALREADY_GUESSED, CORRECT, DIFFICULTY_SETTINGS, INCORRECT
+
+SNAPSHOT_DIR: str = os.environ.get("HANGMAN_SNAPSHOT_DIR", "snapshots.d")
+
+# Snapshots older than this (seconds) are discarded
+SNAPSHOT_TTL: float = float(os.environ.get("HANGMAN_SNAPSHOT_TTL", str(7 * 24 * 3600)))
+
+MAGIC: bytes = b"HMS1"
+_SNAPSHOT = struct.Struct(f"<4sBB{MAX_LENGTH}sHIIIBBBBQdd")
+
+# Stored codes are indexes into these lists, so only append to them
+DIFFICULTIES: list[str] = list(DIFFICULTY_SETTINGS)
+STATUSES: list[str] = ["", INCORRECT, CORRECT, ALREADY_GUESSED]
+NO_LETTER: int = 26
+
+
+class GameSnapshot:
+    """Everything needed to put a HangmanGame back where it was"""
+    __slots__ = (
+        'difficulty', 'word', 'revealed_mask', 'guessed_mask', 'correct_mask',
+        'incorrect_mask', 'wrong_guesses', 'guess_count', 'last_guess',
+        'last_guess_status', 'game_id', 'elapsed', 'saved_at',
+    )
+
+    def __init__(self, difficulty: str, word: str, revealed_mask: int, guessed_mask: int,
+                 correct_mask: int, incorrect_mask: int, wrong_guesses: int, guess_count: int,
+                 last_guess: str, last_guess_status: str, game_id: int, elapsed: float,
+                 saved_at: float) -> None:
+        self.difficulty: str = difficulty
+        self.word: str = word
+        self.revealed_mask: int = revealed_mask
+        self.guessed_mask: int = guessed_mask
+        self.correct_mask: int = correct_mask
+        self.incorrect_mask: int = incorrect_mask
+        self.wrong_guesses: int = wrong_guesses
+        self.guess_count: int = guess_count
+        self.last_guess: str = last_guess
+        self.last_guess_status: str = last_guess_status
+        self.game_id: int = game_id
+        self.elapsed: float = elapsed
+        self.saved_at: float = saved_at
+
+    def encode(self) -> bytes:
+        last: int = ord(self.last_guess) - ord('a') if self.last_guess else NO_LETTER
+        return _SNAPSHOT.pack(
+            MAGIC, DIFFICULTIES.index(self.difficulty), len(self.word), self.word.encode("ascii"),
+            self.revealed_mask, self.guessed_mask, self.correct_mask, self.incorrect_mask,
+            self.wrong_guesses, self.guess_count, last, STATUSES.index(self.last_guess_status),
+            self.game_id, self.elapsed, self.saved_at)
+
+    @classmethod
+    def decode(cls, data: bytes) -> "GameSnapshot":
+        try:
+            (magic, difficulty, length, word, revealed, guessed, correct, incorrect, wrong,
+             guess_count, last, status, game_id, elapsed, saved_at) = _SNAPSHOT.unpack(data)
+            if magic != MAGIC:
+                raise ValueError("not a game snapshot")
+            return cls(DIFFICULTIES[difficulty], word[:length].decode("ascii"), revealed, guessed,
+                       correct, incorrect, wrong, guess_count,
+                       chr(ord('a') + last) if last < NO_LETTER else "", STATUSES[status],
+                       game_id, elapsed, saved_at)
+        except (struct.error, IndexError, UnicodeDecodeError) as e:
+            raise ValueError(f"Corrupt game snapshot: {e}") from e
+
+
+class SnapshotStore:
+    """One snapshot file per player, named by a hash of the username"""
+
+    def __init__(self, directory: str = SNAPSHOT_DIR, ttl: float = SNAPSHOT_TTL) -> None:
+        self.directory: str = directory
+        self.ttl: float = ttl
+
+    def path(self, username: str) -> str:
+        name: str = hashlib.sha1(username.encode()).hexdigest()
+        return os.path.join(self.directory, f"{name}.snap")
+
+    def save(self, username: str, snapshot: GameSnapshot) -> None:
+        """Replace the player's snapshot
+
+        Not fsynced: it only has to survive the game process (e.g. a dropped
+        SSH session), and skipping the flush keeps this cheap enough to run
+        after every guess. The rename still means readers never see half a file.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path: str = self.path(username)
+        temp_path: str = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as file:
+            file.write(snapshot.encode())
+        os.replace(temp_path, path)
+
+    def load(self, username: str) -> Optional[GameSnapshot]:
+        """The player's snapshot, or None if there is none or it has expired"""
+        path: str = self.path(username)
+        try:
+            with open(path, 'rb') as file:
+                snapshot = GameSnapshot.decode(file.read())
+        except FileNotFoundError:
+            return None
+        except ValueError as e:
+            print(f"Discarding saved game: {e}")
+            self.delete(username)
+            return None
+        if time.time() - snapshot.saved_at > self.ttl:
+            self.delete(username)
+            return None
+        return snapshot
+
+    def delete(self, username: str) -> None:
+        try:
+            os.remove(self.path(username))
+        except FileNotFoundError:
+            pass
+
+    def purge_expired(self) -> int:
+        """Delete every expired snapshot; returns how many were removed"""
+        removed: int = 0
+        cutoff: float = time.time() - self.ttl
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return 0
+        for entry in entries:
+            # saved_at is written along with the file, so the mtime is a safe stand-in
+            if entry.name.endswith(".snap") and entry.stat().st_mtime < cutoff:
+                try:
+                    os.remove(entry.path)
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+        return removed
+
+
+_snapshot_store: Optional[SnapshotStore] = None
+
+
+def get_snapshot_store() -> SnapshotStore:
+    """The shared store; expired snapshots are cleared out on first use"""
+    global _snapshot_store
+    if _snapshot_store is None:
+        _snapshot_store = SnapshotStore()
+        _snapshot_store.purge_expired()
+    return _snapshot_store
@@ -0,0 +1,344 @@
+# leaderboard.py
+# Leaderboards (most wins, best win rate, most games) kept sorted as results
+# come in, so top-K and "my rank" never scan or sort every user
+#
+# The file is a sorted snapshot followed by an append-only log:
+#   {"users": n, "win_rate": [...], "plays": [...]}   header
+#   n lines ["username", wins, plays], best first on the wins board
+#   ["username", wins, plays] lines appended since; the last line for a user wins
+# The header lists the snapshot lines in rank order for the other two
+# boards, so a cold load builds every board in one pass without sorting.
+# Every process replays lines appended by others before answering, and the
+# file is rewritten as a fresh snapshot once the log grows well past the
+# number of users. A file without a header (never compacted) is loaded
+# into a dict and each board sorted once.
+#
+# Boards are RankedLists: adding, removing and ranking a player are
+# O(log n), top-K is a slice of the first buckets.
+
+import bisect
+import itertools
+import json
+import os
+from typing import Iterator, Optional, Sequence
+from file_lock import FileLock
+from user_store import write_atomic
+
+LEADERBOARD_FILE: str = os.environ.get("HANGMAN_LEADERBOARD", "leaderboard.jsonl")
+
+# Players need this many games to appear on the win-rate board
+MIN_PLAYS: int = int(os.environ.get("HANGMAN_LEADERBOARD_MIN_PLAYS", "10"))
+
+BOARDS: tuple[str, ...] = ('wins', 'win_rate', 'plays')
+
+# Compact once the log has more than COMPACT_RATIO lines per user (plus slack)
+COMPACT_RATIO: int = 4
+COMPACT_SLACK: int = 1000
+
+# Most keys kept in one RankedList bucket before it is split
+BUCKET_SIZE: int = 1000
+
+
+class RankedList:
+    """Sorted keys in buckets, with a Fenwick tree over the bucket sizes
+
+    Finding a key's bucket is a binary search over the bucket maxima and its
+    position is a prefix sum over the tree, so add, remove and rank are
+    O(log n) plus a bounded insert into one bucket.
+    """
+
+    def __init__(self, keys: Sequence[tuple] = ()) -> None:
+        """Start from keys that are already in order"""
+        # Buckets start half full so the first inserts don't split them
+        step: int = BUCKET_SIZE // 2
+        self._buckets: list[list[tuple]] = [list(keys[i:i + step]) for i in range(0, len(keys), step)]
+        self._maxes: list[tuple] = [bucket[-1] for bucket in self._buckets]
+        self._len: int = len(keys)
+        self._rebuild()
+
+    @classmethod
+    def from_keys(cls, keys: list[tuple]) -> "RankedList":
+        """Build from keys in any order; already sorted keys (a snapshot) are not re-sorted"""
+        if any(a >= b for a, b in zip(keys, itertools.islice(keys, 1, None))):
+            keys = sorted(keys)
+        return cls(keys)
+
+    def _rebuild(self) -> None:
+        """Recompute the tree after buckets were split or dropped"""
+        tree: list[int] = [0] * (len(self._buckets) + 1)
+        for i, bucket in enumerate(self._buckets, start=1):
+            tree[i] += len(bucket)
+            parent: int = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree: list[int] = tree
+
+    def _resize(self, index: int, delta: int) -> None:
+        i: int = index + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def _count_before(self, index: int) -> int:
+        """Keys in the buckets before buckets[index]"""
+        total: int = 0
+        while index > 0:
+            total += self._tree[index]
+            index -= index & -index
+        return total
+
+    def add(self, key: tuple) -> None:
+        self._len += 1
+        if not self._buckets:
+            self._buckets.append([key])
+            self._maxes.append(key)
+            self._rebuild()
+            return
+        index: int = min(bisect.bisect_left(self._maxes, key), len(self._buckets) - 1)
+        bucket: list[tuple] = self._buckets[index]
+        bisect.insort(bucket, key)
+        self._maxes[index] = bucket[-1]
+        if len(bucket) > BUCKET_SIZE:
+            half: int = len(bucket) // 2
+            self._buckets[index:index + 1] = [bucket[:half], bucket[half:]]
+            self._maxes[index:index + 1] = [bucket[half - 1], bucket[-1]]
+            self._rebuild()
+        else:
+            self._resize(index, 1)
+
+    def remove(self, key: tuple) -> None:
+        """Remove a key that is in the list"""
+        index: int = bisect.bisect_left(self._maxes, key)
+        bucket: list[tuple] = self._buckets[index]
+        del bucket[bisect.bisect_left(bucket, key)]
+        self._len -= 1
+        if bucket:
+            self._maxes[index] = bucket[-1]
+            self._resize(index, -1)
+        else:
+            del self._buckets[index]
+            del self._maxes[index]
+            self._rebuild()
+
+    def rank(self, key: tuple) -> int:
+        """Number of keys that sort before `key`"""
+        index: int = bisect.bisect_left(self._maxes, key)
+        if index == len(self._buckets):
+            return self._len
+        return self._count_before(index) + bisect.bisect_left(self._buckets[index], key)
+
+    def first(self, count: int) -> list[tuple]:
+        """The `count` smallest keys"""
+        return list(itertools.islice(self, count))
+
+    def __iter__(self) -> Iterator[tuple]:
+        return itertools.chain.from_iterable(self._buckets)
+
+    def __len__(self) -> int:
+        return self._len
+
+
+class Leaderboard:
+    """Sorted per-board indexes over every player's (wins, plays)
+
+    Each board is a RankedList of sort keys, so a rank lookup or update is
+    O(log n) and top-K reads only the first keys.
+    """
+
+    def __init__(self, path: str = LEADERBOARD_FILE, min_plays: int = MIN_PLAYS) -> None:
+        self.path: str = path
+        self.min_plays: int = min_plays
+        self.lock = FileLock(path)
+        self._stats: dict[str, tuple[int, int]] = {}
+        self._boards: dict[str, RankedList] = {board: RankedList() for board in BOARDS}
+        # Position in the log up to which it has been applied
+        self._offset: int = 0
+        self._ino: Optional[int] = None
+        self._lines: int = 0
+
+    def _key(self, board: str, username: str, wins: int, plays: int) -> Optional[tuple]:
+        """Sort key on a board (best first), or None if the player isn't on it"""
+        if board == 'wins':
+            return (-wins, -plays, username)
+        if board == 'plays':
+            return (-plays, -wins, username)
+        if plays < self.min_plays:
+            return None
+        return (-wins / plays, -plays, username)
+
+    def _set(self, username: str, wins: int, plays: int) -> None:
+        old: Optional[tuple[int, int]] = self._stats.get(username)
+        if old == (wins, plays):
+            return
+        for board, entries in self._boards.items():
+            if old is not None:
+                key = self._key(board, username, *old)
+                if key is not None:
+                    entries.remove(key)
+            key = self._key(board, username, wins, plays)
+            if key is not None:
+                entries.add(key)
+        self._stats[username] = (wins, plays)
+
+    def _sync(self) -> None:
+        """Apply lines appended since the last call (caller holds the file lock)"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            stat = None
+
+        if stat is None or stat.st_ino != self._ino or stat.st_size < self._offset:
+            # First load, or another process compacted the log: start over
+            self._stats.clear()
+            self._boards = {board: RankedList() for board in BOARDS}
+            self._offset = 0
+            self._lines = 0
+            self._ino = stat.st_ino if stat is not None else None
+            if stat is None:
+                return
+
+        if stat.st_size > self._offset:
+            with open(self.path, 'rb') as file:
+                file.seek(self._offset)
+                data: bytes = file.read()
+            # Leave a torn last line for the next call
+            end: int = data.rfind(b"\n") + 1
+            lines: list[bytes] = data[:end].splitlines()
+            # A log without a snapshot is read into _stats and sorted once below
+            bulk: bool = False
+            if self._offset == 0:
+                snapshot_lines: int = self._load_snapshot(lines)
+                self._lines += snapshot_lines
+                lines = lines[snapshot_lines:]
+                bulk = snapshot_lines == 0
+            for line in lines:
+                try:
+                    username, wins, plays = json.loads(line)
+                    if bulk:
+                        self._stats[str(username)] = (int(wins), int(plays))
+                    else:
+                        self._set(str(username), int(wins), int(plays))
+                except (ValueError, TypeError):
+                    continue
+                self._lines += 1
+            self._offset += end
+            if bulk:
+                for board in BOARDS:
+                    keys = (self._key(board, username, wins, plays)
+                            for username, (wins, plays) in self._stats.items())
+                    self._boards[board] = RankedList(sorted(key for key in keys if key is not None))
+
+    def _load_snapshot(self, lines: list[bytes]) -> int:
+        """Build the boards from the snapshot at the start of the file; returns its line count
+
+        0 means there is no usable snapshot and nothing was loaded.
+        """
+        try:
+            header = json.loads(lines[0]) if lines else None
+            if not isinstance(header, dict):
+                return 0
+            count: int = int(header['users'])
+            users: list[tuple[str, int, int]] = [
+                (str(username), int(wins), int(plays))
+                for username, wins, plays in map(json.loads, lines[1:count + 1])]
+            orders: dict[str, Sequence[int]] = {
+                'wins': range(count), 'win_rate': header['win_rate'], 'plays': header['plays']}
+            if len(users) != count or any(len(orders[board]) != count for board in BOARDS):
+                return 0
+            boards: dict[str, RankedList] = {}
+            for board in BOARDS:
+                keys = (self._key(board, *users[index]) for index in orders[board])
+                boards[board] = RankedList.from_keys([key for key in keys if key is not None])
+        except (ValueError, TypeError, KeyError, IndexError):
+            return 0
+        self._stats = {username: (wins, plays) for username, wins, plays in users}
+        self._boards = boards
+        return count + 1
+
+    def record(self, username: str, user_data: dict) -> None:
+        """Update a player's position from their user record"""
+        wins: int = int(user_data.get('wins', 0))
+        plays: int = int(user_data.get('plays', 0))
+        with self.lock:
+            self._sync()
+            if self._stats.get(username) == (wins, plays):
+                return
+            with open(self.path, 'ab') as file:
+                file.write((json.dumps([username, wins, plays]) + "\n").encode())
+            self._sync()
+            if self._lines > COMPACT_RATIO * len(self._stats) + COMPACT_SLACK:
+                self._compact()
+
+    def rebuild(self, users: dict[str, dict]) -> None:
+        """Replace the leaderboard with one built from every user record"""
+        with self.lock:
+            self._write({username: (int(data.get('wins', 0)), int(data.get('plays', 0)))
+                         for username, data in users.items()})
+
+    def _compact(self) -> None:
+        self._write(dict(self._stats))
+
+    def _write(self, stats: dict[str, tuple[int, int]]) -> None:
+        """Atomically rewrite the file as a snapshot of every board and load it"""
+        def rate_key(username: str) -> tuple:
+            # The win-rate key for every user; min_plays is applied when loading
+            wins, plays = stats[username]
+            return (-wins / plays if plays else 0.0, -plays, username)
+
+        users: list[str] = sorted(
+            stats, key=lambda username: self._key('wins', username, *stats[username]))
+        position: dict[str, int] = {username: index for index, username in enumerate(users)}
+        header: dict = {
+            'users': len(users),
+            'win_rate': [position[username] for username in sorted(users, key=rate_key)],
+            'plays': [position[username] for username in sorted(
+                users, key=lambda username: self._key('plays', username, *stats[username]))],
+        }
+        data: bytes = (json.dumps(header) + "\n" + "".join(
+            json.dumps([username, *stats[username]]) + "\n" for username in users)).encode()
+        write_atomic(self.path, data)
+        self._ino = None
+        self._sync()
+
+    def top(self, board: str = 'wins', count: int = 10) -> list[dict]:
+        """The best `count` players on a board"""
+        with self.lock:
+            self._sync()
+            return [self._entry(rank, key[-1])
+                    for rank, key in enumerate(self._boards[board].first(count), start=1)]
+
+    def rank(self, board: str, username: str) -> Optional[int]:
+        """1-based position of a player on a board (None if not on it)"""
+        with self.lock:
+            self._sync()
+            stats: Optional[tuple[int, int]] = self._stats.get(username)
+            if stats is None:
+                return None
+            key = self._key(board, username, *stats)
+            if key is None:
+                return None
+            return self._boards[board].rank(key) + 1
+
+    def size(self, board: str) -> int:
+        with self.lock:
+            self._sync()
+            return len(self._boards[board])
+
+    def _entry(self, rank: int, username: str) -> dict:
+        wins, plays = self._stats[username]
+        return {'rank': rank, 'username': username, 'wins': wins, 'plays': plays,
+                'win_rate': wins / plays * 100 if plays else 0.0}
+
+
+_leaderboard: Optional[Leaderboard] = None
+
+
+def get_leaderboard() -> Leaderboard:
+    """The shared leaderboard, built from the user store the first time it is used"""
+    global _leaderboard
+    if _leaderboard is None:
+        _leaderboard = Leaderboard()
+        if not os.path.exists(_leaderboard.path):
+            from user_store import get_user_store
+            _leaderboard.rebuild(get_user_store().all_users())
+    return _leaderboard
@@ -0,0 +1,146 @@
+# local_words.py
+# Built-in words: the local dictionary when words.idx hasn't been built.
+# get_local_word draws from that dictionary and the word cache together
+# whenever a network word isn't ready. Imported on first use, not at startup.
+
+LOCAL_WORDS: dict[int, list[str]] = {
+    4: ["book", "tree", "fish", "door"],
+    5: [
+        "apple",
+        "beach",
+        "crisp",
+        "dwarf",
+        "eagle",
+        "flame",
+        "grape",
+        "honey",
+        "igloo",
+        "jolly",
+        "koala",
+        "lemon",
+        "mango",
+        "noble",
+        "olive",
+        "peach",
+        "queen",
+        "river",
+        "sunny",
+        "tiger",
+    ],
+    6: [
+        "banana",
+        "camera",
+        "dancer",
+        "earthy",
+        "floral",
+        "guitar",
+        "hiking",
+        "island",
+        "jacket",
+        "kitten",
+        "lizard",
+        "marble",
+        "nectar",
+        "orange",
+        "pepper",
+        "quasar",
+        "rocket",
+        "sunset",
+        "turtle",
+        "velvet",
+        "laptop",
+    ],
+    7: [
+        "bicycle",
+        "kitchen",
+        "giraffe",
+        "diamond",
+        "airport",
+        "balloon",
+        "captain",
+        "dolphin",
+        "freedom",
+        "gallery",
+        "harmony",
+        "jackpot",
+        "mystery",
+    ],
+    8: ["elephant", "handsome"],
+    9: ["butterfly", "chocolate", "discovery", "notorious"],
+    10: [
+        "earthquake",
+        "friendship",
+        "generation",
+        "helicopter",
+        "impressive",
+        "jazzercise",
+        "lighthouse",
+        "motivation",
+        "passionate",
+    ],
+    11: [
+        "outstanding",
+        "adventurous",
+        "celebration",
+        "demonstrate",
+        "fascinating",
+        "grandfather",
+        "inspiration",
+        "magnificent",
+        "opportunity",
+        "performance",
+        "laboriously",
+    ],
+    12: [
+        "kindergarten",
+        "breakthrough",
+        "nevertheless",
+        "acknowledged",
+        "breathtaking",
+        "fountainhead",
+        "governmental",
+        "hypothetical",
+        "intelligence",
+        "jurisdiction",
+        "kaleidoscope",
+        "mathematical",
+        "neighborhood",
+        "overwhelming",
+    ],
+    13: [
+        "extraordinary",
+        "justification",
+        "knowledgeable",
+        "communication",
+        "determination",
+        "entertainment",
+        "environmental",
+        "individuality",
+        "lexicographer",
+        "metamorphosis",
+        "astonishingly",
+        "disappointing",
+        "fascinatingly",
+        "grandstanding",
+        "hallucination",
+        "inconvenience",
+        "jurisprudence",
+        "kindheartedly",
+        "lackadaisical",
+        "mischievously",
+        "paradoxically",
+        "questioningly",
+        "revolutionary",
+        "sophisticated",
+    ],
+    14: [
+        "accountability",
+        "characteristic",
+        "discrimination",
+        "fundamentalist",
+        "organizational",
+        "breathtakingly",
+        "comfortability",
+        "overwhelmingly",
+    ],
+}
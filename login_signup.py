@@ -1,44 +1,15 @@
-import json
-import os
 import random
 import string
+import metrics
+from user_store import JsonUserStore, UserStoreError, USERS_FILE, get_user_store
+from leaderboard import get_leaderboard
 
 # Global variable to store current user data
 current_user = None
 
 def load_users():
-    """Load user data from JSON file"""
-    if os.path.exists('users.json'):
-        try:
-            with open('users.json', 'r') as file:
-                data = json.load(file)
-                # Validate data structure
-                if not isinstance(data, dict):
-                    print("Warning: Invalid user data format. Creating new file.")
-                    return {}
-                
-                # Validate each user entry
-                for username, user_data in data.items():
-                    if not isinstance(user_data, dict):
-                        print(f"Warning: Invalid data for user {username}. Skipping.")
-                        continue
-                    
-                    # Ensure required fields exist and are correct types
-                    required_fields = {'password': str, 'wins': int, 'losses': int, 'plays': int}
-                    for field, expected_type in required_fields.items():
-                        if field not in user_data:
-                            user_data[field] = 0 if expected_type == int else ""
-                        elif not isinstance(user_data[field], expected_type):
-                            try:
-                                user_data[field] = expected_type(user_data[field])
-                            except (ValueError, TypeError):
-                                user_data[field] = 0 if expected_type == int else ""
-                
-                return data
-        except (json.JSONDecodeError, FileNotFoundError, TypeError, KeyError) as e:
-            print(f"Error loading user data: {e}. Creating new file.")
-            return {}
-    return {}
+    """Load user data from JSON file (a read-only view; copy a record before changing it)"""
+    return JsonUserStore(USERS_FILE).load()
 
 
 
@@ -50,9 +21,8 @@ def load_users():
 def save_users(users_data) -> bool:
     """Save user data to JSON file"""
     try:
-        with open('users.json', 'w') as file:
-            json.dump(users_data, file, indent=2)
-    except (IOError, TypeError) as e:
+        JsonUserStore(USERS_FILE).save(users_data)
+    except UserStoreError as e:
         print(f"Error saving user data: {e}")
         return False
     return True
@@ -84,6 +54,19 @@ def generate_password(length=8) -> str:
     return ''.join(password)
 
 
+def password_problem(password: str):
+    """Return why a password is not acceptable, or None if it is"""
+    if not password:
+        return "Password cannot be empty."
+    elif len(password) < 8:
+        return "⚠️ Password must be at least 8 characters long!"
+    elif not any(c.isupper() for c in password):
+        return "⚠️ Password must contain at least 1 uppercase letter!"
+    elif not any(c.isdigit() for c in password):
+        return "⚠️ Password must contain at least 1 number!"
+    return None
+
+
 def register() -> bool:
     """Register a new user"""
     global current_user
@@ -100,10 +83,9 @@ def register() -> bool:
                 print("Username cannot be empty. Please try again.")
                 continue
                 
-            # Load existing users
-            users = load_users()
+            store = get_user_store()
             
-            if username in users:
+            if store.get_user(username) is not None:
                 print("Username already exists. Please choose a different username.")
                 continue
                 
@@ -124,17 +106,9 @@ def register() -> bool:
                     elif choice == '2':
                         while True:
                             password = input("Enter your password (min 8 chars, 1 uppercase, 1 number): ").strip()
-                            if not password:
-                                print("Password cannot be empty. Please try again.")
-                                continue
-                            elif len(password) < 8:
-                                print("⚠️ Password must be at least 8 characters long! Please try again.")
-                                continue
-                            elif not any(c.isupper() for c in password):
-                                print("⚠️ Password must contain at least 1 uppercase letter! Please try again.")
-                                continue
-                            elif not any(c.isdigit() for c in password):
-                                print("⚠️ Password must contain at least 1 number! Please try again.")
+                            problem = password_problem(password)
+                            if problem:
+                                print(f"{problem} Please try again.")
                                 continue
                             else:
                                 print("✅ Password accepted!")
@@ -146,23 +120,20 @@ def register() -> bool:
                     print("\nOperation cancelled.")
                     return False
             
-            # Create new user record
-            users[username] = {
-                'password': password,
-                'wins': 0,
-                'losses': 0,
-                'plays': 0
-            }
-            
-            # Save to file
-            if not save_users(users):
-                print("Error saving user data. Please try again.")
+            # Create and save new user record
+            try:
+                if not store.add_user(username, password):
+                    print("Username already exists. Please choose a different username.")
+                    continue
+                user_data = store.get_user(username)
+            except UserStoreError as e:
+                print(f"Error saving user data: {e}. Please try again.")
                 continue
                 
-            current_user = {'username': username, 'data': users[username]}
+            current_user = {'username': username, 'data': user_data}
             
             print(f"\nRegistration successful! Welcome, {username}!")
-            display_user_stats(username, users[username])
+            display_user_stats(username, user_data)
             return True
             
         except (KeyboardInterrupt, EOFError):
@@ -188,10 +159,9 @@ def login() -> bool:
                 print("Username cannot be empty. Please try again.")
                 continue
                 
-            # Load existing users
-            users = load_users()
+            user_data = get_user_store().get_user(username)
             
-            if username not in users:
+            if user_data is None:
                 print("Username not found. Please check your username or register first.")
                 continue
             
@@ -200,17 +170,17 @@ def login() -> bool:
             
             # Check password
             try:
-                if users[username]['password'] != password:
+                if user_data['password'] != password:
                     print("Invalid password. Please try again.")
                     continue
             except (KeyError, TypeError):
                 print("Error accessing user data. Please try again or re-register.")
                 continue
             
-            current_user = {'username': username, 'data': users[username]}
+            current_user = {'username': username, 'data': user_data}
             
             print(f"\nLogin successful! Welcome back, {username}!")
-            display_user_stats(username, users[username])
+            display_user_stats(username, user_data)
             return True
             
         except (KeyboardInterrupt, EOFError):
@@ -228,6 +198,7 @@ def display_user_stats(username, user_data) -> None:
     print(f"    SESSION LOSSES   : {user_data['losses']}")
     print(f"    SESSION PLAYS    : {user_data['plays']}")
     
+@metrics.timed("hangman_update_user_stats_seconds")
 def update_user_stats(won=False) -> bool:
     """Update user statistics after a game"""
     global current_user
@@ -236,33 +207,31 @@ def update_user_stats(won=False) -> bool:
         return False
     
     try:
-        users = load_users()
         username = current_user['username']
         
-        if username not in users:
-            print("Error: User not found in database.")
-            return False
-        
-        # Update stats with type checking
+        # Update stats in the store (a single-row update for SQLite)
         try:
-            users[username]['plays'] = int(users[username].get('plays', 0)) + 1
-            
-            if won:
-                users[username]['wins'] = int(users[username].get('wins', 0)) + 1
-            else:
-                users[username]['losses'] = int(users[username].get('losses', 0)) + 1
-        except (ValueError, TypeError) as e:
+            user_data = get_user_store().record_result(username, won)
+        except (UserStoreError, ValueError, TypeError) as e:
             print(f"Error updating stats: {e}")
+            metrics.inc("hangman_update_user_stats_total", result="error")
             return False
         
-        # Save updated stats
-        if not save_users(users):
-            print("Error saving updated stats.")
+        if user_data is None:
+            print("Error: User not found in database.")
+            metrics.inc("hangman_update_user_stats_total", result="missing_user")
             return False
             
-        current_user['data'] = users[username]
+        current_user['data'] = user_data
+        metrics.inc("hangman_update_user_stats_total", result="won" if won else "lost")
+        
+        try:
+            get_leaderboard().record(username, user_data)
+        except (OSError, UserStoreError) as e:
+            print(f"Error updating leaderboard: {e}")
         return True
         
     except Exception as e:
         print(f"Unexpected error updating stats: {e}")
-        return False
\ No newline at end of file
+        metrics.inc("hangman_update_user_stats_total", result="error")
+        return False
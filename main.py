@@ -1,10 +1,18 @@
-from game import HangmanGame
+import argparse
+from typing import Optional
+import retrieve_word_fn
 from start import welcome_interface, main_game
 
-def main() -> None:
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Play the Ultimate Hangman Challenge")
+    parser.add_argument('--offline', action='store_true',
+                        help="use local words only (same as HANGMAN_OFFLINE=1)")
+    args = parser.parse_args(argv)
+    if args.offline:
+        retrieve_word_fn.set_offline()
+
     welcome_interface()
     main_game()
 
 if __name__ == "__main__":
     main()
-    
\ No newline at end of file
@@ -0,0 +1,229 @@
+# metrics.py
+# Opt-in counters and histograms for the game's hot paths
+#
+# Collection is off unless HANGMAN_METRICS names an output file:
+#   HANGMAN_METRICS=metrics.prom python main.py   # Prometheus text format
+#   HANGMAN_METRICS=metrics.json python main.py   # JSON snapshot
+# The file is written when the process exits. While disabled, inc() and
+# observe() return straight away and timed() adds a single flag check.
+
+import atexit
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from typing import Callable, Optional, TypeVar
+
+METRICS_FILE: str = os.environ.get("HANGMAN_METRICS", "")
+
+# Upper bounds (seconds) of the latency histogram buckets
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.15, 0.25, 0.5, 1.0, 2.5, 5.0, 7.5,
+)
+
+# Finer buckets for in-process work such as rendering a frame
+FAST_BUCKETS: tuple[float, ...] = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1,
+)
+
+# Upper bounds (bytes) for payload sizes
+SIZE_BUCKETS: tuple[float, ...] = (
+    1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000,
+)
+
+enabled: bool = bool(METRICS_FILE)
+
+F = TypeVar("F", bound=Callable)
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram (thread safe); seconds unless given other buckets"""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets: tuple[float, ...] = tuple(sorted(buckets))
+        # One extra bucket for values above the last bound
+        self.counts: list[int] = [0] * (len(self.buckets) + 1)
+        self.count: int = 0
+        self.total: float = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        index: int = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += seconds
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Upper bound of the bucket holding the p-th percentile (None if empty)"""
+        with self._lock:
+            if self.count == 0:
+                return None
+            target: float = self.count * p / 100
+            running: int = 0
+            for index, bucket_count in enumerate(self.counts):
+                running += bucket_count
+                if running >= target:
+                    return self.buckets[index] if index < len(self.buckets) else float("inf")
+        return float("inf")
+
+    def snapshot(self) -> dict[str, object]:
+        with self._lock:
+            labels = [str(bound) for bound in self.buckets] + ["+Inf"]
+            return {
+                'count': self.count,
+                'sum': self.total,
+                'buckets': dict(zip(labels, self.counts)),
+            }
+
+
+class Counter:
+    """Monotonic counter (thread safe)"""
+
+    def __init__(self) -> None:
+        self.value: float = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class MetricsRegistry:
+    """Named counters and histograms, each optionally split by labels"""
+
+    def __init__(self) -> None:
+        self.counters: dict[tuple[str, Labels], Counter] = {}
+        self.histograms: dict[tuple[str, Labels], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, **labels: str) -> Counter:
+        key = (name, tuple(sorted(labels.items())))
+        counter = self.counters.get(key)
+        if counter is None:
+            with self._lock:
+                counter = self.counters.setdefault(key, Counter())
+        return counter
+
+    def histogram(self, name: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+                  **labels: str) -> LatencyHistogram:
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(key, LatencyHistogram(buckets))
+        return histogram
+
+    def add_histogram(self, name: str, histogram: LatencyHistogram, **labels: str) -> None:
+        """Export a histogram that is collected elsewhere (e.g. always-on network latency)"""
+        with self._lock:
+            self.histograms[(name, tuple(sorted(labels.items())))] = histogram
+
+    def snapshot(self) -> dict[str, list[dict]]:
+        """Every metric as plain data, grouped by name"""
+        data: dict[str, list[dict]] = {}
+        for (name, labels), counter in sorted(self.counters.items(), key=lambda item: item[0]):
+            data.setdefault(name, []).append({'labels': dict(labels), 'value': counter.value})
+        for (name, labels), histogram in sorted(self.histograms.items(), key=lambda item: item[0]):
+            data.setdefault(name, []).append({'labels': dict(labels), **histogram.snapshot()})
+        return data
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format"""
+        lines: list[str] = []
+        typed: set[str] = set()
+        for (name, labels), counter in sorted(self.counters.items(), key=lambda item: item[0]):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name}{_format_labels(labels)} {counter.value}")
+        for (name, labels), histogram in sorted(self.histograms.items(), key=lambda item: item[0]):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} histogram")
+            snapshot = histogram.snapshot()
+            cumulative: int = 0
+            for bound, count in snapshot['buckets'].items():
+                cumulative += count
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', bound),))} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {snapshot['sum']}")
+            lines.append(f"{name}_count{_format_labels(labels)} {snapshot['count']}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{value}"' for key, value in labels)
+    return "{" + pairs + "}"
+
+
+registry = MetricsRegistry()
+
+
+def inc(name: str, amount: float = 1, **labels: str) -> None:
+    """Add to a counter (no-op while metrics are disabled)"""
+    if enabled:
+        registry.counter(name, **labels).inc(amount)
+
+
+def observe(name: str, value: float, buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+            **labels: str) -> None:
+    """Record a histogram value (no-op while metrics are disabled)"""
+    if enabled:
+        registry.histogram(name, buckets, **labels).observe(value)
+
+
+def timed(name: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Callable[[F], F]:
+    """Decorator recording how long each call takes into histogram `name`"""
+    def decorate(function: F) -> F:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return function(*args, **kwargs)
+            start: float = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                registry.histogram(name, buckets).observe(time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+def export(path: str = "") -> None:
+    """Write every metric to `path` (default METRICS_FILE): .prom/.txt as Prometheus text, else JSON"""
+    path = path or METRICS_FILE
+    if not path:
+        return
+    if path.endswith((".prom", ".txt")):
+        text: str = registry.to_prometheus()
+    else:
+        text = json.dumps({'timestamp': time.time(), 'metrics': registry.snapshot()}, indent=2)
+    try:
+        with open(path, 'w') as file:
+            file.write(text)
+    except OSError as e:
+        print(f"Error writing metrics to {path}: {e}")
+
+
+_export_at_exit: bool = False
+
+
+def enable(path: str = "") -> None:
+    """Start collecting; the metrics are written to `path` (or METRICS_FILE) at exit"""
+    global enabled, METRICS_FILE, _export_at_exit
+    enabled = True
+    if path:
+        METRICS_FILE = path
+    if METRICS_FILE and not _export_at_exit:
+        _export_at_exit = True
+        atexit.register(export)
+
+
+if enabled:
+    enable()
@@ -0,0 +1,85 @@
+# render_cache.py
+# Pre-encoded screen fragments built from hangman_art, so composing a frame
+# is mostly joining cached byte lines
+
+from typing import Callable, Iterable, Union
+from hangman_art import hangman_stages, welcome_banner, status_emojis, level_emojis
+
+SEPARATOR: str = "═" * 60
+
+
+def encode_lines(text: Union[str, Iterable[str]]) -> tuple[bytes, ...]:
+    """UTF-8 encode text (or several pieces of it) as individual lines"""
+    if isinstance(text, str):
+        text = [text]
+    lines: list[bytes] = []
+    for piece in text:
+        lines.extend(piece.encode().split(b"\n"))
+    return tuple(lines)
+
+
+class RenderCache:
+    """Encoded line tuples keyed by what they depend on, with hit statistics"""
+
+    def __init__(self) -> None:
+        self._entries: dict[tuple, tuple[bytes, ...]] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def lines(self, key: tuple, build: Callable[[], Union[str, Iterable[str]]]) -> tuple[bytes, ...]:
+        """Cached lines for `key`, built and encoded by `build` the first time"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            entry = self._entries[key] = encode_lines(build())
+        else:
+            self.hits += 1
+        return entry
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'entries': len(self._entries),
+            'bytes': sum(len(line) for lines in self._entries.values() for line in lines),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+    def banner(self) -> tuple[bytes, ...]:
+        return self.lines(('banner',), lambda: welcome_banner)
+
+    def difficulty_header(self, difficulty: str) -> tuple[bytes, ...]:
+        return self.lines(
+            ('difficulty', difficulty),
+            lambda: [f"{level_emojis[difficulty]} DIFFICULTY: {difficulty.upper()}", SEPARATOR],
+        )
+
+    def hearts(self, attempts_left: int) -> tuple[bytes, ...]:
+        return self.lines(
+            ('hearts', attempts_left),
+            lambda: [f"Attempts Left: {attempts_left} {status_emojis['heart'] * attempts_left}", ""],
+        )
+
+    def guess_status(self, status: str, letter: str) -> tuple[bytes, ...]:
+        def build() -> list[str]:
+            if status == 'correct':
+                return [f"{status_emojis['correct']} Previous guess '{letter.upper()}' is correct!"]
+            if status == 'incorrect':
+                return [f"{status_emojis['incorrect']} Previous guess '{letter.upper()}' is incorrect"]
+            if status == 'already_guessed':
+                return [f"{status_emojis['already_guessed']} Previous guess '{letter.upper()}' has been entered"]
+            return []
+        return self.lines(('status', status, letter), build)
+
+    def gallows(self, wrong_guesses: int) -> tuple[bytes, ...]:
+        return self.lines(('gallows', wrong_guesses),
+                          lambda: ["\nGallows:", hangman_stages[wrong_guesses]])
+
+    def separator(self) -> tuple[bytes, ...]:
+        return self.lines(('separator',), lambda: SEPARATOR)
+
+
+# Shared cache used by the terminal game
+render_cache = RenderCache()
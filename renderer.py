@@ -0,0 +1,108 @@
+# renderer.py
+# Terminal renderer that repaints only the lines that changed since the last
+# frame, using ANSI escape sequences instead of spawning `clear`
+
+import os
+import shutil
+import sys
+from typing import Iterable, Optional, TextIO, Union
+
+ESC_HOME_CLEAR: bytes = b"\x1b[H\x1b[2J"
+ESC_CLEAR_LINE_END: bytes = b"\x1b[K"
+ESC_CLEAR_BELOW: bytes = b"\x1b[J"
+
+# Rows kept free under a frame for the input prompt and warnings
+PROMPT_ROWS: int = 4
+
+
+def move_to(row: int) -> bytes:
+    """Cursor to the start of a 1-based row"""
+    return b"\x1b[%d;1H" % row
+
+
+class Renderer:
+    """Draws whole frames (lists of lines) with a single buffered write each
+
+    On a TTY only lines that differ from the previous frame are rewritten,
+    and anything printed below the last frame (prompts, warnings) is erased.
+    When the output isn't a TTY, frames are simply appended.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None) -> None:
+        # None means whatever sys.stdout is at the time of writing
+        self._stream: Optional[TextIO] = stream
+        self.previous: list[bytes] = []
+        self.frames: int = 0
+        self.bytes_written: int = 0
+
+    @property
+    def stream(self) -> TextIO:
+        return self._stream if self._stream is not None else sys.stdout
+
+    @property
+    def is_tty(self) -> bool:
+        try:
+            return self.stream.isatty()
+        except (AttributeError, ValueError):
+            return False
+
+    @staticmethod
+    def split_frame(lines: Iterable[Union[str, bytes]]) -> list[bytes]:
+        """Encode a frame and split multi-line entries into single lines"""
+        frame: list[bytes] = []
+        for line in lines:
+            if isinstance(line, str):
+                line = line.encode()
+            frame.extend(line.split(b"\n"))
+        return frame
+
+    def render(self, lines: Iterable[Union[str, bytes]]) -> None:
+        """Draw a frame, writing only what changed"""
+        self.render_frame(self.split_frame(lines))
+
+    def render_frame(self, frame: list[bytes]) -> None:
+        """Draw a frame that is already encoded and split into single lines"""
+        if not self.is_tty:
+            out: bytes = b"\n".join(frame) + b"\n"
+        elif not self.previous or len(frame) + PROMPT_ROWS >= shutil.get_terminal_size().lines:
+            # First frame, or the screen may scroll so rows can't be addressed: full repaint
+            out = ESC_HOME_CLEAR + b"\n".join(frame) + b"\n"
+        else:
+            parts: list[bytes] = []
+            for row, line in enumerate(frame):
+                if row >= len(self.previous) or self.previous[row] != line:
+                    parts.append(move_to(row + 1) + line + ESC_CLEAR_LINE_END)
+            # Wipe the old prompt and anything else printed under the frame
+            parts.append(move_to(len(frame) + 1) + ESC_CLEAR_BELOW)
+            out = b"".join(parts)
+
+        self.previous = frame if self.is_tty else []
+        self.frames += 1
+        self._write(out)
+
+    def clear(self) -> None:
+        """Clear the screen; the next frame is painted in full"""
+        self.previous = []
+        if not self.is_tty:
+            return
+        if os.name == 'nt':
+            self.stream.flush()
+            os.system('cls')
+        else:
+            self._write(ESC_HOME_CLEAR)
+
+    def _write(self, data: bytes) -> None:
+        # Flush pending print() output first so nothing is reordered
+        self.stream.flush()
+        buffer = getattr(self.stream, 'buffer', None)
+        if buffer is not None:
+            buffer.write(data)
+            buffer.flush()
+        else:
+            self.stream.write(data.decode())
+            self.stream.flush()
+        self.bytes_written += len(data)
+
+
+# Shared renderer for the terminal game
+renderer = Renderer()
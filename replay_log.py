@@ -0,0 +1,272 @@
+# replay_log.py
+# Compact binary log of every game and guess, and a command to replay them
+#
+#   python replay_log.py list [--log replay.log]
+#   python replay_log.py replay GAME_ID [--log replay.log] [--speed 2]
+#
+# Log layout: the magic b"HMRPLY1\n", then records that each start with a
+# type byte (little-endian):
+#   start  B type=0, Q game id, d unix time, B difficulty, B word length,
+#          14s word (NUL-padded), H bitmask of hint positions      (35 bytes)
+#   guess  B type=1, Q game id, B letter (0-25), B status,
+#          I milliseconds since the game's previous event            (15 bytes)
+# Records are buffered in memory and appended in large writes; games from
+# several processes can share one log because ids are random. A new log is
+# linked into place with its magic already written, so racing writers
+# never append a second header.
+
+import argparse
+import atexit
+import os
+import random
+import struct
+import sys
+import threading
+import time
+from typing import Iterator, Optional, Union
+from dictionary import MAX_LENGTH
+from engine import ALREADY_GUESSED, CORRECT, DIFFICULTY_SETTINGS, INCORRECT
+
+REPLAY_LOG_FILE: str = os.environ.get("HANGMAN_REPLAY_LOG", "replay.log")
+
+MAGIC: bytes = b"HMRPLY1\n"
+START: int = 0
+GUESS: int = 1
+_START = struct.Struct(f"<BQdBB{MAX_LENGTH}sH")
+_GUESS = struct.Struct("<BQBBI")
+
+# Stored codes are indexes into these lists, so only append to them
+DIFFICULTIES: list[str] = list(DIFFICULTY_SETTINGS)
+STATUSES: list[str] = [INCORRECT, CORRECT, ALREADY_GUESSED]
+
+# Bytes buffered before they are written out
+BUFFER_SIZE: int = 64 * 1024
+
+
+class GameStart:
+    __slots__ = ('game_id', 'started_at', 'difficulty', 'word', 'hints')
+
+    def __init__(self, game_id: int, started_at: float, difficulty: str, word: str,
+                 hints: list[int]) -> None:
+        self.game_id: int = game_id
+        self.started_at: float = started_at
+        self.difficulty: str = difficulty
+        self.word: str = word
+        self.hints: list[int] = hints
+
+
+class Guess:
+    __slots__ = ('game_id', 'letter', 'status', 'delay_ms')
+
+    def __init__(self, game_id: int, letter: str, status: str, delay_ms: int) -> None:
+        self.game_id: int = game_id
+        self.letter: str = letter
+        self.status: str = status
+        self.delay_ms: int = delay_ms
+
+
+class ReplayWriter:
+    """Appends records to the log through a bounded in-memory buffer (thread safe)"""
+
+    def __init__(self, path: str = REPLAY_LOG_FILE, buffer_size: int = BUFFER_SIZE) -> None:
+        self.path: str = path
+        self.buffer_size: int = buffer_size
+        self._buffer = bytearray()
+        self._lock = threading.Lock()
+        self._exit_hook: bool = False
+
+    def start_game(self, difficulty: str, word: str, hints: list[int]) -> "GameRecorder":
+        """Log a new game (its word and hint positions) and return its recorder"""
+        recorder = GameRecorder(self, random.getrandbits(63))
+        mask: int = 0
+        for position in hints:
+            mask |= 1 << position
+        self.append(_START.pack(START, recorder.game_id, time.time(), DIFFICULTIES.index(difficulty),
+                                len(word), word.encode("ascii"), mask))
+        return recorder
+
+    def append(self, record: bytes) -> None:
+        with self._lock:
+            self._buffer += record
+            if not self._exit_hook:
+                self._exit_hook = True
+                atexit.register(self.flush)
+            if len(self._buffer) >= self.buffer_size:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        """Write out everything buffered so far"""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._buffer:
+            return
+        try:
+            try:
+                fd: int = os.open(self.path, os.O_WRONLY | os.O_APPEND)
+            except FileNotFoundError:
+                self._create()
+                fd = os.open(self.path, os.O_WRONLY | os.O_APPEND)
+            try:
+                # One append per flush, so records from other processes don't interleave
+                os.write(fd, bytes(self._buffer))
+            finally:
+                os.close(fd)
+        except OSError as e:
+            print(f"Error writing replay log {self.path}: {e}")
+        # Drop the buffer either way so memory stays bounded
+        self._buffer.clear()
+
+    def _create(self) -> None:
+        """Put a log holding just the magic in place, unless another process got there first"""
+        temp_path: str = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as file:
+            file.write(MAGIC)
+        try:
+            os.link(temp_path, self.path)
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(temp_path)
+
+
+class GameRecorder:
+    """Logs the guesses of one game, timing each from the previous event"""
+    __slots__ = ('writer', 'game_id', '_last_event')
+
+    def __init__(self, writer: ReplayWriter, game_id: int) -> None:
+        self.writer: ReplayWriter = writer
+        self.game_id: int = game_id
+        self._last_event: float = time.monotonic()
+
+    def guess(self, letter: str, status: str) -> None:
+        now: float = time.monotonic()
+        delay_ms: int = min(int((now - self._last_event) * 1000), 2**32 - 1)
+        self._last_event = now
+        self.writer.append(_GUESS.pack(GUESS, self.game_id, ord(letter) - ord('a'),
+                                       STATUSES.index(status), delay_ms))
+
+
+def read_records(path: str = REPLAY_LOG_FILE, chunk_size: int = BUFFER_SIZE
+                 ) -> Iterator[Union[GameStart, Guess]]:
+    """Iterate over the log one record at a time, reading it in chunks"""
+    with open(path, 'rb') as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a replay log")
+        data = b""
+        offset: int = 0
+        while True:
+            if len(data) - offset < _START.size:
+                chunk: bytes = file.read(chunk_size)
+                data = data[offset:] + chunk
+                offset = 0
+                if not chunk and not data:
+                    return
+            kind: int = data[offset]
+            if data.startswith(MAGIC, offset):
+                # A second header from a writer that raced to create the log
+                offset += len(MAGIC)
+                continue
+            layout = _START if kind == START else _GUESS if kind == GUESS else None
+            if layout is None:
+                raise ValueError(f"Corrupt replay log {path}: unknown record type {kind}")
+            if len(data) - offset < layout.size:
+                # A torn final record (e.g. the writer crashed mid-append)
+                return
+            fields = layout.unpack_from(data, offset)
+            offset += layout.size
+            if kind == START:
+                _, game_id, started_at, difficulty, length, word, mask = fields
+                yield GameStart(game_id, started_at, DIFFICULTIES[difficulty],
+                                word[:length].decode("ascii"),
+                                [i for i in range(length) if mask >> i & 1])
+            else:
+                _, game_id, letter, status, delay_ms = fields
+                yield Guess(game_id, chr(ord('a') + letter), STATUSES[status], delay_ms)
+
+
+def find_game(game_id: int, path: str = REPLAY_LOG_FILE
+              ) -> tuple[Optional[GameStart], list[Guess]]:
+    """The start record and guesses of one game"""
+    start: Optional[GameStart] = None
+    guesses: list[Guess] = []
+    for record in read_records(path):
+        if record.game_id != game_id:
+            continue
+        if isinstance(record, GameStart):
+            start = record
+        else:
+            guesses.append(record)
+    return start, guesses
+
+
+def list_games(path: str = REPLAY_LOG_FILE) -> None:
+    games: dict[int, list] = {}
+    for record in read_records(path):
+        if isinstance(record, GameStart):
+            games[record.game_id] = [record, 0, 0]
+        elif record.game_id in games:
+            games[record.game_id][1] += 1
+            games[record.game_id][2] += record.status == INCORRECT
+    print(f"{'game id':>20} {'started':>19} {'difficulty':>13} {'length':>6} {'guesses':>7} {'wrong':>5}")
+    for game_id, (start, guesses, wrong) in games.items():
+        started: str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(start.started_at))
+        print(f"{game_id:>20} {started:>19} {start.difficulty:>13} {len(start.word):>6} "
+              f"{guesses:>7} {wrong:>5}")
+
+
+def replay_game(game_id: int, path: str = REPLAY_LOG_FILE, speed: float = 0.0) -> bool:
+    """Re-render a logged game guess by guess; speed 0 replays without pauses"""
+    start, guesses = find_game(game_id, path)
+    if start is None:
+        print(f"Game {game_id} not found in {path}")
+        return False
+
+    from game import HangmanGame
+    game = HangmanGame.__new__(HangmanGame)
+    game.reset_game()
+    game.difficulty = start.difficulty
+    game.set_word(start.word)
+    game.engine.reveal_positions(start.hints)
+
+    game.display_game_state()
+    for guess in guesses:
+        if speed > 0:
+            time.sleep(guess.delay_ms / 1000 / speed)
+        game.process_guess(guess.letter)
+        game.display_game_state()
+        if game.engine.finished:
+            break
+    outcome: str = "won" if game.engine.won else "lost" if game.engine.lost else "unfinished"
+    print(f"Game {game_id}: {outcome}, the word was {start.word.upper()}")
+    return True
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="List or replay logged hangman games")
+    parser.add_argument('command', choices=['list', 'replay'])
+    parser.add_argument('game_id', type=int, nargs='?')
+    parser.add_argument('--log', default=REPLAY_LOG_FILE)
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help="playback speed relative to the original game (0: no pauses)")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == 'list':
+            list_games(args.log)
+            return 0
+        if args.game_id is None:
+            parser.error("replay needs a GAME_ID")
+        return 0 if replay_game(args.game_id, args.log, args.speed) else 1
+    except (OSError, ValueError) as e:
+        print(f"Error reading replay log: {e}")
+        return 1
+
+
+# Shared writer used by the game and the server
+replay_log = ReplayWriter()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
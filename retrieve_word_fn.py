@@ -1,183 +1,223 @@
-# import requests
-import requests
+# retrieve_word_fn.py
+# Words from WORD_API with a local fallback. `requests` (and its urllib3 /
+# charset / idna chain) is only imported on the first network call, and
+# never in offline mode (HANGMAN_OFFLINE=1 or main.py --offline).
+import os
 import random
-from requests.exceptions import RequestException
-from typing import Optional
-
-WORD_API: str = "https://random-word-api.herokuapp.com/word?"
-
-
-LOCAL_WORDS: dict[int, list[str]] = {
-    4: ["book", "tree", "fish", "door"],
-    5: [
-        "apple",
-        "beach",
-        "crisp",
-        "dwarf",
-        "eagle",
-        "flame",
-        "grape",
-        "honey",
-        "igloo",
-        "jolly",
-        "koala",
-        "lemon",
-        "mango",
-        "noble",
-        "olive",
-        "peach",
-        "queen",
-        "river",
-        "sunny",
-        "tiger",
-    ],
-    6: [
-        "banana",
-        "camera",
-        "dancer",
-        "earthy",
-        "floral",
-        "guitar",
-        "hiking",
-        "island",
-        "jacket",
-        "kitten",
-        "lizard",
-        "marble",
-        "nectar",
-        "orange",
-        "pepper",
-        "quasar",
-        "rocket",
-        "sunset",
-        "turtle",
-        "velvet",
-    ],
-    7: [
-        "bicycle",
-        "kitchen",
-        "giraffe",
-        "diamond",
-        "airport",
-        "balloon",
-        "captain",
-        "dolphin",
-        "elephant",
-        "freedom",
-        "gallery",
-        "harmony",
-        "jackpot",
-        "laptop",
-        "mystery",
-    ],
-    10: [
-        "butterfly",
-        "chocolate",
-        "discovery",
-        "earthquake",
-        "friendship",
-        "generation",
-        "helicopter",
-        "impressive",
-        "jazzercise",
-        "kindergarten",
-        "lighthouse",
-        "motivation",
-        "notorious",
-        "outstanding",
-        "passionate",
-    ],
-    11: [
-        "adventurous",
-        "breakthrough",
-        "celebration",
-        "demonstrate",
-        "extraordinary",
-        "fascinating",
-        "grandfather",
-        "handsome",
-        "inspiration",
-        "justification",
-        "knowledgeable",
-        "magnificent",
-        "nevertheless",
-        "opportunity",
-        "performance",
-    ],
-    12: [
-        "acknowledged",
-        "breathtaking",
-        "communication",
-        "determination",
-        "entertainment",
-        "fountainhead",
-        "governmental",
-        "hypothetical",
-        "intelligence",
-        "jurisdiction",
-        "kaleidoscope",
-        "laboriously",
-        "mathematical",
-        "neighborhood",
-        "overwhelming",
-    ],
-    14: [
-        "accountability",
-        "bibliographical",
-        "characteristic",
-        "discrimination",
-        "environmental",
-        "fundamentalist",
-        "hospitalization",
-        "individuality",
-        "jurisprudential",
-        "knowledgeability",
-        "lexicographer",
-        "metamorphosis",
-        "neurobiological",
-        "organizational",
-        "personification",
-    ],
-    13: [
-        "astonishingly",
-        "breathtakingly",
-        "comfortability",
-        "disappointing",
-        "extraordinary",
-        "fascinatingly",
-        "grandstanding",
-        "hallucination",
-        "inconvenience",
-        "jurisprudence",
-        "kindheartedly",
-        "lackadaisical",
-        "mischievously",
-        "nevertheless",
-        "overwhelmingly",
-        "paradoxically",
-        "questioningly",
-        "revolutionary",
-        "sophisticated",
-        "troubleshooting",
-    ],
-}
-
-
-def retrieve_word(length: int = 10) -> Optional[str]:
+import threading
+import time
+from typing import TYPE_CHECKING, Optional
+from word_cache import word_cache
+from dictionary import WordDictionary, get_dictionary
+from circuit_breaker import CircuitBreaker
+from metrics import LatencyHistogram, registry
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ThreadPoolExecutor
+    import requests
+
+WORD_API: str = os.environ.get(
+    "HANGMAN_WORD_API", "https://random-word-api.herokuapp.com/word?"
+)
+
+# Serve local words only and never touch the network
+OFFLINE: bool = os.environ.get("HANGMAN_OFFLINE", "") not in ("", "0")
+
+# Number of words requested from WORD_API per round-trip
+BATCH_SIZE: int = 50
+
+# Shared keep-alive session, created on first use
+_session: Optional["requests.Session"] = None
+_session_lock = threading.Lock()
+
+# Words fetched in a batch but not handed out yet, per length
+_word_buffer: dict[int, list[str]] = {}
+_buffer_lock = threading.Lock()
+
+# Longest retrieve_word waits for the network before serving a local word
+LATENCY_BUDGET: float = 0.15
+
+# Stops calling WORD_API for a while after repeated failures
+breaker = CircuitBreaker(failure_threshold=3, cooldown=30.0)
+fetch_latency = LatencyHistogram()
+retrieve_latency = LatencyHistogram()
+registry.add_histogram("hangman_word_fetch_seconds", fetch_latency)
+registry.add_histogram("hangman_retrieve_word_seconds", retrieve_latency)
+
+# Runs network fetches so retrieve_word can give up on them after LATENCY_BUDGET
+# (created on first use, like the session)
+_executor: Optional["ThreadPoolExecutor"] = None
+
+
+def set_offline(offline: bool = True) -> None:
+    """Switch offline mode on or off (call before the game starts)"""
+    global OFFLINE
+    OFFLINE = offline
+
+
+def get_session() -> "requests.Session":
+    """Return the shared HTTP session used for WORD_API requests"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            _session = requests.Session()
+            _session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+            _session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        return _session
+
+
+def fetch_words(length: int, number: Optional[int] = None) -> list[str]:
+    """Fetch up to `number` (default BATCH_SIZE) words of the given length in one request, [] on failure."""
+    if number is None:
+        number = BATCH_SIZE
+    if OFFLINE or not breaker.allow_request():
+        return []
+
+    start: float = time.perf_counter()
+    succeeded: bool = False
+    try:
+        session = get_session()
+        from requests.exceptions import RequestException
+        try:
+            response: "requests.Response" = session.get(
+                f"{WORD_API}length={length}&number={number}", timeout=7
+            )
+            response.raise_for_status()
+            words = response.json()
+            if not isinstance(words, list):
+                raise ValueError("unexpected response from word API")
+        except (RequestException, ValueError):
+            return []
+        succeeded = True
+    finally:
+        # Always settle the breaker, even on an unexpected error, so a
+        # half-open probe can't leave it refusing every request
+        fetch_latency.observe(time.perf_counter() - start)
+        if succeeded:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+
+    valid: list[str] = [
+        word.lower()
+        for word in words
+        if isinstance(word, str) and len(word) == length and word.isascii() and word.isalpha()
+    ]
+    # Keep every fetched word so later games can run offline
+    word_cache.add_words(valid)
+    return valid
+
+
+def fetch_remote_word(length: int) -> Optional[str]:
+    """Get one word of the given length from the batch buffer, or None on failure."""
+    with _buffer_lock:
+        buffered: list[str] = _word_buffer.get(length, [])
+        if buffered:
+            return buffered.pop()
+
+    words: list[str] = fetch_words(length)
+    if not words:
+        return None
+
+    word: str = words.pop()
+    with _buffer_lock:
+        _word_buffer.setdefault(length, []).extend(words)
+    return word
+
+
+def get_executor() -> "ThreadPoolExecutor":
+    """Return the thread pool that runs fetches for retrieve_word"""
+    global _executor
+    with _session_lock:
+        if _executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="word-fetch")
+        return _executor
+
+
+def _return_to_buffer(length: int, future: "Future") -> None:
+    """Keep a word whose fetch finished after retrieve_word stopped waiting"""
+    if future.cancelled() or future.exception() is not None:
+        return
+    word: Optional[str] = future.result()
+    if word is not None:
+        with _buffer_lock:
+            _word_buffer.setdefault(length, []).append(word)
+
+
+def _take_buffered(length: int) -> Optional[str]:
+    with _buffer_lock:
+        buffered: list[str] = _word_buffer.get(length, [])
+        return buffered.pop() if buffered else None
+
+
+def retrieve_word(length: int = 10, budget: Optional[float] = None) -> Optional[str]:
+    """Get a word from WORD_API, or a local word if the API is down or slower than `budget` seconds."""
+    return retrieve_word_with_source(length, budget)[0]
+
+
+def retrieve_word_with_source(length: int = 10, budget: Optional[float] = None) -> tuple[str, str]:
+    """Like retrieve_word, but also say where the word came from ('network' or 'local')"""
     if length > 14 or length <= 3:
         raise ValueError("length parameter must be below 14 and greater than 3")
+    if budget is None:
+        budget = LATENCY_BUDGET
+
+    start: float = time.perf_counter()
     try:
-        response: requests.Response = requests.get(
-            f"{WORD_API}length={length}", timeout=7
-        )
-        response.raise_for_status()
-        return response.json()[0]
-    except (RequestException, ValueError, IndexError):
-        return get_local_word(length)
+        word: Optional[str] = _take_buffered(length)
+        if word is not None:
+            return word, 'network'
+
+        # Don't even wait for the budget while offline or the breaker is open
+        if OFFLINE or breaker.is_open():
+            return get_local_word(length), 'local'
+
+        from concurrent.futures import TimeoutError
+        future: "Future" = get_executor().submit(fetch_remote_word, length)
+        try:
+            word = future.result(timeout=budget)
+        except TimeoutError:
+            # The late result still warms the buffer and the word cache
+            future.add_done_callback(lambda done: _return_to_buffer(length, done))
+            return get_local_word(length), 'local'
+
+        if word is None:
+            return get_local_word(length), 'local'
+        return word, 'network'
+    finally:
+        retrieve_latency.observe(time.perf_counter() - start)
+
+
+def network_stats() -> dict[str, object]:
+    """Breaker state and latency histograms for monitoring"""
+    return {
+        'breaker': breaker.stats(),
+        'fetch_latency': fetch_latency.snapshot(),
+        'retrieve_latency': retrieve_latency.snapshot(),
+    }
+
+
+def local_dictionary() -> WordDictionary:
+    """The mmap'd dictionary (words.idx), or one built from LOCAL_WORDS without it"""
+    from local_words import LOCAL_WORDS
+    return get_dictionary(word for words in LOCAL_WORDS.values() for word in words)
 
 
 def get_local_word(length: int) -> str:
-    """Get a random word from local cache with length validation."""
-    if length in LOCAL_WORDS:
-        return random.choice(LOCAL_WORDS[length])
-    raise ValueError(f"No words available for length {length}")
+    """A random word of the given length from the dictionary and the word cache together
+
+    Each word is equally likely whichever of the two holds it, so a large
+    dictionary isn't hidden behind a few cached API words (or vice versa).
+    """
+    dictionary: WordDictionary = local_dictionary()
+    in_dictionary: int = dictionary.count(length)
+    in_cache: int = word_cache.count(length)
+    pick: int = random.randrange(in_dictionary + in_cache) if in_dictionary + in_cache else 0
+    if pick >= in_dictionary:
+        cached: Optional[str] = word_cache.word_at(length, pick - in_dictionary)
+        if cached is not None:
+            return cached
+    return dictionary.random_word(length)
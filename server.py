@@ -0,0 +1,297 @@
+# server.py
+# Asyncio TCP (telnet-style) server: one independent game session per connection
+#
+#   python server.py --host 0.0.0.0 --port 8765
+#   telnet localhost 8765
+#
+# Protocol: the server sends plain text lines; a line starting with "? " is
+# a prompt and the client answers it with one line.
+
+import argparse
+import asyncio
+import time
+from typing import Optional
+from difficulty_index import get_difficulty_index, pick_word
+from engine import HangmanEngine, WORD_LISTS, random_length, CORRECT, INCORRECT
+from game_history import get_game_history
+from hangman_art import hangman_stages
+from leaderboard import get_leaderboard
+from login_signup import password_problem
+from replay_log import replay_log
+from user_store import UserStoreError, get_user_store
+from word_prefetch import prefetcher
+
+DEFAULT_HOST: str = "127.0.0.1"
+DEFAULT_PORT: int = 8765
+
+# Drop clients that don't answer a prompt for this long (seconds)
+IDLE_TIMEOUT: float = 600.0
+
+
+class GameSession:
+    """One connected player; holds its own user instead of login_signup.current_user"""
+
+    def __init__(self, server: "GameServer", reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter) -> None:
+        self.server: GameServer = server
+        self.reader: asyncio.StreamReader = reader
+        self.writer: asyncio.StreamWriter = writer
+        # Same shape as login_signup.current_user: {'username': ..., 'data': {...}}
+        self.user: Optional[dict] = None
+
+    def send(self, *lines: str) -> None:
+        for line in lines:
+            self.writer.write(line.encode() + b"\r\n")
+
+    async def ask(self, prompt: str) -> Optional[str]:
+        """Send a prompt and wait for the answer (None if the client went away)"""
+        self.writer.write(f"? {prompt}\r\n".encode())
+        await self.writer.drain()
+        try:
+            line: bytes = await asyncio.wait_for(self.reader.readline(), IDLE_TIMEOUT)
+        except asyncio.TimeoutError:
+            return None
+        if not line:
+            return None
+        answer: str = line.decode(errors="ignore").strip()
+        if answer.lower() in ['quit', 'exit']:
+            return None
+        return answer
+
+    async def run(self) -> None:
+        self.send("==================================",
+                  "  Welcome to the Hangman game",
+                  "==================================",
+                  "Type 'quit' or 'exit' at any prompt to leave")
+        while True:
+            choice: Optional[str] = await self.ask(
+                "1. Quick Game  2. Login  3. Register  4. Quit  -- enter your choice (1-4):")
+            if choice is None or choice == '4':
+                break
+            if choice == '1':
+                if not await self.play():
+                    break
+            elif choice == '2':
+                if await self.login() and not await self.play():
+                    break
+            elif choice == '3':
+                if await self.register() and not await self.play():
+                    break
+            else:
+                self.send("Invalid choice. Please select a valid option (1-4).")
+        self.send("Goodbye!")
+
+    async def login(self) -> bool:
+        username: Optional[str] = await self.ask("Enter username:")
+        if not username:
+            return False
+        password: Optional[str] = await self.ask("Enter password:")
+        if password is None:
+            return False
+        try:
+            user_data = await asyncio.to_thread(get_user_store().get_user, username)
+        except UserStoreError as e:
+            self.send(f"Error loading user data: {e}")
+            return False
+        if user_data is None or user_data.get('password') != password:
+            self.send("Invalid username or password.")
+            return False
+        self.user = {'username': username, 'data': user_data}
+        self.send(f"Login successful! Welcome back, {username}!")
+        self.send_stats()
+        return True
+
+    async def register(self) -> bool:
+        username: Optional[str] = await self.ask("Enter a new username:")
+        if not username:
+            return False
+        while True:
+            password: Optional[str] = await self.ask(
+                "Enter your password (min 8 chars, 1 uppercase, 1 number):")
+            if password is None:
+                return False
+            problem = password_problem(password)
+            if problem is None:
+                break
+            self.send(f"{problem} Please try again.")
+        try:
+            store = get_user_store()
+            if not await asyncio.to_thread(store.add_user, username, password):
+                self.send("Username already exists.")
+                return False
+            user_data = await asyncio.to_thread(store.get_user, username)
+        except UserStoreError as e:
+            self.send(f"Error saving user data: {e}")
+            return False
+        self.user = {'username': username, 'data': user_data}
+        self.send(f"Registration successful! Welcome, {username}!")
+        return True
+
+    def send_stats(self) -> None:
+        if self.user and self.user.get('data'):
+            data: dict = self.user['data']
+            plays: int = data.get('plays', 0)
+            win_rate: float = (data.get('wins', 0) / plays * 100) if plays > 0 else 0
+            self.send(f"Games Played: {plays} | Wins: {data.get('wins', 0)} | "
+                      f"Losses: {data.get('losses', 0)} | Win Rate: {win_rate:.1f}%")
+
+    def send_state(self, engine: HangmanEngine) -> None:
+        self.send(f"Attempts Left: {engine.attempts_left}")
+        if engine.correct_mask:
+            self.send(f"Correct: [ {' '.join(engine.correct_guesses).upper()} ]")
+        if engine.incorrect_mask:
+            self.send(f"Incorrect: [ {' '.join(engine.incorrect_guesses).upper()} ]")
+        self.send(*hangman_stages[engine.wrong_guesses].splitlines())
+        self.send(f"Word: {' '.join(engine.display).upper()}")
+
+    async def play(self) -> bool:
+        """Play rounds until the player stops; False if they disconnected"""
+        difficulties: list[str] = list(WORD_LISTS)
+        while True:
+            choice: Optional[str] = await self.ask(
+                "Select difficulty: 1. Beginner  2. Intermediate  3. Professional (1-3):")
+            if choice is None:
+                return False
+            if choice not in ['1', '2', '3']:
+                self.send("Please enter 1, 2, or 3!")
+                continue
+            difficulty: str = difficulties[int(choice) - 1]
+
+            # Scored or prefetched words are handed out without touching the network;
+            # a miss may first load the word cache from disk, so it runs off the event loop
+            word: Optional[str] = pick_word(difficulty)
+            if word is None:
+                word = await asyncio.to_thread(prefetcher.get_word, random_length(difficulty))
+            engine = HangmanEngine(word, difficulty, hints=False)
+            recorder = replay_log.start_game(difficulty, engine.word, engine.add_hints())
+            started_at: float = time.monotonic()
+            self.send(f"Starting {difficulty.upper()} level! "
+                      f"Word length: {engine.word_length} letters, "
+                      f"{engine.max_wrong_guesses} attempts")
+
+            while not engine.finished:
+                self.send_state(engine)
+                guess: Optional[str] = await self.ask("Guess a letter:")
+                if guess is None:
+                    return False
+                guess = guess.lower()
+                if len(guess) != 1 or not guess.isascii() or not guess.isalpha():
+                    self.send("Please enter a single letter!")
+                    continue
+                result = engine.guess(guess)
+                recorder.guess(result.letter, result.status)
+                if result.status == CORRECT:
+                    self.send(f"'{guess.upper()}' is correct!")
+                elif result.status == INCORRECT:
+                    self.send(f"'{guess.upper()}' is incorrect")
+                else:
+                    self.send(f"'{guess.upper()}' has been entered")
+
+            if engine.won:
+                self.send(f"You won! The word was: {engine.word.upper()}",
+                          f"You completed it in {engine.guess_count} guesses!")
+            else:
+                self.send(*hangman_stages[engine.wrong_guesses].splitlines())
+                self.send(f"You lost! The word was: {engine.word.upper()}")
+            self.server.games_finished += 1
+            await self.record_result(engine.won)
+            await self.record_history(engine, time.monotonic() - started_at)
+
+            again: Optional[str] = await self.ask("Do you want to play again? (y/n):")
+            if again is None:
+                return False
+            if again.lower() not in ['y', 'yes']:
+                return True
+
+    async def record_result(self, won: bool) -> None:
+        if self.user is None:
+            self.send("Login to save your stats!")
+            return
+        try:
+            user_data = await asyncio.to_thread(
+                get_user_store().record_result, self.user['username'], won)
+        except UserStoreError as e:
+            self.send(f"Failed to update stats: {e}")
+            return
+        if user_data is not None:
+            self.user['data'] = user_data
+            self.send("Stats updated successfully!")
+            self.send_stats()
+            try:
+                await asyncio.to_thread(get_leaderboard().record, self.user['username'], user_data)
+            except (OSError, UserStoreError) as e:
+                self.send(f"Failed to update leaderboard: {e}")
+
+
+    async def record_history(self, engine: HangmanEngine, duration: float) -> None:
+        if self.user is None:
+            return
+        try:
+            await asyncio.to_thread(
+                get_game_history().record, self.user['username'], engine.difficulty,
+                engine.word_length, engine.guess_count, engine.wrong_guesses, engine.won, duration)
+        except (OSError, ValueError) as e:
+            self.send(f"Failed to save game history: {e}")
+
+
+class GameServer:
+    """Accepts connections and runs a GameSession for each"""
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        self.host: str = host
+        self.port: int = port
+        self.active_sessions: int = 0
+        self.total_sessions: int = 0
+        self.games_finished: int = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.active_sessions += 1
+        self.total_sessions += 1
+        try:
+            await GameSession(self, reader, writer).run()
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.active_sessions -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def start(self) -> None:
+        # With a difficulty index, pick_word supplies the words and the network isn't needed
+        if get_difficulty_index() is None:
+            prefetcher.start(length for lengths in WORD_LISTS.values() for length in lengths)
+        self._server = await asyncio.start_server(self.handle, self.host, self.port,
+                                                  backlog=4096)
+        # Pick up the real port when started on port 0
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        print(f"Hangman server listening on {self.host}:{self.port}")
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the multi-player hangman server")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+    try:
+        asyncio.run(GameServer(args.host, args.port).serve_forever())
+    except KeyboardInterrupt:
+        print("Server stopped.")
+
+
+if __name__ == "__main__":
+    main()
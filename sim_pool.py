@@ -0,0 +1,145 @@
+# sim_pool.py
+# Runs simulated games on HangmanEngine across CPU cores and reports how
+# games/sec scales with the number of worker processes
+#
+#   python sim_pool.py --games 200000 --workers 1 2 4 8
+#   python sim_pool.py --games 1000000 --difficulty beginner --strategy random
+#
+# Workers memory-map the dictionary index instead of receiving a copy of the
+# corpus; when no index file exists one is written to a temporary directory.
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from dictionary import DICTIONARY_FILE, WordDictionary, encode_index, group_words
+from engine import HangmanEngine, WORD_LISTS
+
+STRATEGIES: tuple[str, ...] = ('frequency', 'random')
+
+# Games per task; big enough to hide the pickling of results
+CHUNK_SIZE: int = 5000
+
+# Per-process state set up by _init_worker
+_dictionary: Optional[WordDictionary] = None
+_letter_orders: dict[int, str] = {}
+
+
+def letter_order(dictionary: WordDictionary, length: int) -> str:
+    """Letters by how many words of the length contain them, most common first"""
+    counts: dict[str, int] = {letter: 0 for letter in "abcdefghijklmnopqrstuvwxyz"}
+    for word in dictionary.words(length):
+        for letter in set(word):
+            counts[letter] += 1
+    return "".join(sorted(counts, key=lambda letter: (-counts[letter], letter)))
+
+
+def _init_worker(index_path: str) -> None:
+    global _dictionary
+    _dictionary = WordDictionary.open(index_path)
+    _letter_orders.clear()
+    for length in _dictionary.lengths():
+        _letter_orders[length] = letter_order(_dictionary, length)
+
+
+def play_games(difficulty: str, strategy: str, games: int, seed: int) -> dict:
+    """Play `games` bot games in this worker and return summed outcomes"""
+    rng = random.Random(seed)
+    lengths: list[int] = [length for length in WORD_LISTS[difficulty] if length in _dictionary]
+    if not lengths:
+        raise ValueError(f"No words in the corpus for {difficulty} lengths {WORD_LISTS[difficulty]}")
+    alphabet: list[str] = list("abcdefghijklmnopqrstuvwxyz")
+    wins: int = 0
+    guesses: list[int] = [0] * 27
+    wrong: list[int] = [0] * 27
+
+    for _ in range(games):
+        length: int = rng.choice(lengths)
+        word: str = _dictionary.word_at(length, rng.randrange(_dictionary.count(length)))
+        engine = HangmanEngine(word, difficulty, rng=rng)
+        if strategy == 'random':
+            rng.shuffle(alphabet)
+            order = alphabet
+        else:
+            order = _letter_orders[length]
+        for letter in order:
+            if engine.finished:
+                break
+            engine.guess(letter)
+        wins += engine.won
+        guesses[engine.guess_count] += 1
+        wrong[engine.wrong_guesses] += 1
+
+    return {'games': games, 'wins': wins, 'guesses': guesses, 'wrong': wrong}
+
+
+def merge_results(results: list[dict]) -> dict:
+    """Add up per-task outcomes"""
+    merged: dict = {'games': 0, 'wins': 0, 'guesses': [0] * 27, 'wrong': [0] * 27}
+    for result in results:
+        merged['games'] += result['games']
+        merged['wins'] += result['wins']
+        for key in ('guesses', 'wrong'):
+            merged[key] = [a + b for a, b in zip(merged[key], result[key])]
+    return merged
+
+
+def run_pool(index_path: str, workers: int, difficulty: str, strategy: str,
+             games: int, seed: int = 0) -> tuple[dict, float]:
+    """Shard `games` across a pool of `workers`; returns merged results and seconds"""
+    chunks: list[int] = [CHUNK_SIZE] * (games // CHUNK_SIZE)
+    if games % CHUNK_SIZE:
+        chunks.append(games % CHUNK_SIZE)
+
+    start: float = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(index_path,)) as pool:
+        futures = [pool.submit(play_games, difficulty, strategy, count, seed * 1_000_003 + i)
+                   for i, count in enumerate(chunks)]
+        results: list[dict] = [future.result() for future in futures]
+    return merge_results(results), time.perf_counter() - start
+
+
+def shared_index_path(directory: str) -> str:
+    """DICTIONARY_FILE if it exists, else the fallback words written under `directory`"""
+    if os.path.exists(DICTIONARY_FILE):
+        return DICTIONARY_FILE
+    from local_words import LOCAL_WORDS
+    path: str = os.path.join(directory, "words.idx")
+    with open(path, "wb") as file:
+        file.write(encode_index(group_words(word for words in LOCAL_WORDS.values() for word in words)))
+    return path
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    cores: int = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Simulate games across processes and measure scaling")
+    parser.add_argument('--games', type=int, default=100_000, help="games per run")
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, *range(2, cores + 1, 2), cores}))
+    parser.add_argument('--difficulty', choices=list(WORD_LISTS), default='beginner')
+    parser.add_argument('--strategy', choices=STRATEGIES, default='frequency')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        index_path: str = shared_index_path(directory)
+        print(f"{args.games} {args.difficulty} games, {args.strategy} bot, {cores} cores")
+        print(f"{'workers':>7} {'seconds':>8} {'games/s':>10} {'speedup':>8} {'win %':>6}")
+        baseline: Optional[float] = None
+        for workers in args.workers:
+            result, elapsed = run_pool(index_path, workers, args.difficulty, args.strategy,
+                                       args.games, args.seed)
+            rate: float = result['games'] / elapsed
+            baseline = baseline or rate
+            print(f"{workers:>7} {elapsed:>8.2f} {rate:>10.0f} {rate / baseline:>7.2f}x "
+                  f"{result['wins'] / result['games'] * 100:>6.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
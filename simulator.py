@@ -0,0 +1,202 @@
+# simulator.py
+# Bots that play batches of hangman games at once with NumPy, to see what
+# win rate DIFFICULTY_SETTINGS actually produces for each difficulty
+#
+#   python simulator.py --games 1000000 --strategy frequency positional random
+#   python simulator.py --difficulty professional --max-attempts 5 --hints 1 2
+#
+# NumPy is only needed here, not by the game itself (pip install numpy).
+# Rules match engine.HangmanEngine: hints reveal single positions, and a
+# guess that uncovers nothing counts as wrong.
+
+import argparse
+import json
+import sys
+from typing import Optional
+from dictionary import WordDictionary, get_dictionary
+from engine import WORD_LISTS, DIFFICULTY_SETTINGS
+
+try:
+    import numpy as np
+except ImportError:  # the simulator reports this and exits
+    np = None
+
+STRATEGIES: tuple[str, ...] = ('frequency', 'positional', 'random')
+
+# Games evaluated together; bounds memory at roughly 40 bytes per letter of each game
+BATCH_SIZE: int = 100_000
+
+
+def load_corpus(path: Optional[str] = None) -> WordDictionary:
+    """The dictionary the game draws from, or a specific index file"""
+    if path is not None:
+        return WordDictionary.open(path)
+    from local_words import LOCAL_WORDS
+    return get_dictionary(word for words in LOCAL_WORDS.values() for word in words)
+
+
+def corpus_array(dictionary: WordDictionary, length: int) -> "np.ndarray":
+    """Words of one length as a (count, length) array of letter numbers 0-25"""
+    block = np.frombuffer(dictionary.word_block(length), dtype=np.uint8)
+    return block.reshape(-1, length) - ord('a')
+
+
+def letter_profile(corpus: "np.ndarray") -> dict[str, "np.ndarray"]:
+    """Letter statistics the bots guess from, computed once per word length"""
+    onehot = corpus[:, :, None] == np.arange(26)
+    return {
+        # Share of words containing each letter at all
+        'frequency': onehot.any(axis=1).mean(axis=0),
+        # Share of words with each letter at each position, shape (length, 26)
+        'positional': onehot.mean(axis=0),
+    }
+
+
+def letter_scores(strategy: str, profile: dict[str, "np.ndarray"], revealed: "np.ndarray",
+                  rng: "np.random.Generator") -> "np.ndarray":
+    """(games, 26) preference of each game's bot for each letter; higher goes first"""
+    games: int = revealed.shape[0]
+    if strategy == 'random':
+        return rng.random((games, 26))
+    if strategy == 'frequency':
+        return np.broadcast_to(profile['frequency'], (games, 26)).copy()
+    if strategy == 'positional':
+        # Only the positions still blank in each game count
+        return (~revealed).astype(np.float64) @ profile['positional']
+    raise ValueError(f"Unknown strategy: {strategy}")
+
+
+def play_batch(words: "np.ndarray", profile: dict[str, "np.ndarray"], strategy: str, max_attempts: int,
+               hints: tuple[int, int], rng: "np.random.Generator") -> dict[str, "np.ndarray"]:
+    """Play one game per row of `words` and return per-game outcomes"""
+    games, length = words.shape
+    rows = np.arange(games)
+
+    # Hints: reveal a random min..max number of distinct positions per game
+    hint_counts = rng.integers(hints[0], hints[1] + 1, size=games)
+    ranks = rng.random((games, length)).argsort(axis=1).argsort(axis=1)
+    revealed = ranks < hint_counts[:, None]
+
+    guessed = np.zeros((games, 26), dtype=bool)
+    guesses = np.zeros(games, dtype=np.int16)
+    wrong = np.zeros(games, dtype=np.int16)
+    active = ~revealed.all(axis=1)
+
+    for _ in range(26):
+        if not active.any():
+            break
+        scores = letter_scores(strategy, profile, revealed, rng)
+        scores[guessed] = -np.inf
+        letters = scores.argmax(axis=1)
+
+        hits = (words == letters[:, None]) & ~revealed & active[:, None]
+        revealed |= hits
+        guessed[rows[active], letters[active]] = True
+        guesses += active
+        wrong += active & ~hits.any(axis=1)
+
+        active &= ~revealed.all(axis=1) & (wrong < max_attempts)
+
+    return {'won': revealed.all(axis=1), 'guesses': guesses, 'wrong': wrong}
+
+
+def simulate(dictionary: WordDictionary, difficulty: str, games: int, strategy: str,
+             seed: int = 0, max_attempts: Optional[int] = None,
+             hints: Optional[tuple[int, int]] = None) -> dict:
+    """Play `games` games at one difficulty and summarise the outcomes"""
+    settings: dict = DIFFICULTY_SETTINGS[difficulty]
+    max_attempts = settings['max_attempts'] if max_attempts is None else max_attempts
+    hints = settings['hints'] if hints is None else hints
+    lengths: list[int] = [length for length in WORD_LISTS[difficulty] if length in dictionary]
+    if not lengths:
+        raise ValueError(f"No words in the corpus for {difficulty} lengths {WORD_LISTS[difficulty]}")
+
+    rng = np.random.default_rng(seed)
+    # Like random_length: every length of the level is equally likely
+    per_length = np.bincount(rng.integers(len(lengths), size=games), minlength=len(lengths))
+
+    won_total: int = 0
+    guesses_hist = np.zeros(27, dtype=np.int64)
+    wrong_hist = np.zeros(max_attempts + 1, dtype=np.int64)
+    by_length: dict[int, dict] = {}
+    for length, count in zip(lengths, per_length.tolist()):
+        corpus = corpus_array(dictionary, length)
+        profile = letter_profile(corpus)
+        length_won: int = 0
+        for start in range(0, count, BATCH_SIZE):
+            batch: int = min(BATCH_SIZE, count - start)
+            words = corpus[rng.integers(len(corpus), size=batch)]
+            outcome = play_batch(words, profile, strategy, max_attempts, hints, rng)
+            length_won += int(outcome['won'].sum())
+            guesses_hist += np.bincount(outcome['guesses'], minlength=27)
+            wrong_hist += np.bincount(outcome['wrong'], minlength=max_attempts + 1)
+        won_total += length_won
+        by_length[length] = {'games': count, 'win_rate': length_won / count if count else 0.0,
+                             'corpus_words': len(corpus)}
+
+    played = np.arange(27)
+    return {
+        'difficulty': difficulty,
+        'strategy': strategy,
+        'games': games,
+        'max_attempts': max_attempts,
+        'hints': list(hints),
+        'win_rate': won_total / games if games else 0.0,
+        'mean_guesses': float((guesses_hist * played).sum() / games) if games else 0.0,
+        'guesses_p50': _percentile(guesses_hist, 0.5),
+        'guesses_p90': _percentile(guesses_hist, 0.9),
+        'guesses_histogram': guesses_hist.tolist(),
+        'wrong_histogram': wrong_hist.tolist(),
+        'by_length': by_length,
+    }
+
+
+def _percentile(histogram: "np.ndarray", fraction: float) -> int:
+    """Smallest value with at least `fraction` of the counts at or below it"""
+    cumulative = np.cumsum(histogram)
+    if cumulative[-1] == 0:
+        return 0
+    return int(np.searchsorted(cumulative, fraction * cumulative[-1]))
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Simulate bot players to calibrate difficulty settings")
+    parser.add_argument('--games', type=int, default=100_000, help="games per difficulty and strategy")
+    parser.add_argument('--difficulty', nargs='+', choices=list(WORD_LISTS), default=list(WORD_LISTS))
+    parser.add_argument('--strategy', nargs='+', choices=STRATEGIES, default=list(STRATEGIES))
+    parser.add_argument('--max-attempts', type=int, help="override max_attempts for every difficulty")
+    parser.add_argument('--hints', type=int, nargs=2, metavar=('MIN', 'MAX'),
+                        help="override the hint range for every difficulty")
+    parser.add_argument('--dictionary', help="word index to draw from (default: the game's)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help="print the full results as JSON")
+    args = parser.parse_args(argv)
+
+    if np is None:
+        print("The simulator needs NumPy: pip install numpy")
+        return 1
+
+    dictionary = load_corpus(args.dictionary)
+    results: list[dict] = []
+    for difficulty in args.difficulty:
+        for strategy in args.strategy:
+            results.append(simulate(dictionary, difficulty, args.games, strategy, args.seed,
+                                    args.max_attempts, tuple(args.hints) if args.hints else None))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'difficulty':<13} {'strategy':<11} {'attempts':>8} {'hints':>6} {'win %':>7} "
+          f"{'guesses':>8} {'p50':>4} {'p90':>4}  win % by length")
+    for row in results:
+        lengths: str = " ".join(f"{length}:{stats['win_rate'] * 100:.1f}"
+                                for length, stats in row['by_length'].items())
+        print(f"{row['difficulty']:<13} {row['strategy']:<11} {row['max_attempts']:>8} "
+              f"{row['hints'][0]}-{row['hints'][1]:<4} {row['win_rate'] * 100:>7.1f} "
+              f"{row['mean_guesses']:>8.2f} {row['guesses_p50']:>4} {row['guesses_p90']:>4}  {lengths}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
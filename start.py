@@ -1,5 +1,9 @@
 from game import HangmanGame
+from game_snapshot import get_snapshot_store
+from leaderboard import BOARDS, MIN_PLAYS, get_leaderboard
+import login_signup
 from login_signup import login, register
+from user_store import UserStoreError
 
 name = None
 
@@ -23,6 +27,42 @@ def welcome_interface() -> None:
         # Exit the terminal
         exit()
 
+def display_leaderboard(count: int = 10) -> None:
+    """
+    Show the top players on every leaderboard
+    """
+    titles: dict[str, str] = {
+        'wins': "🏆 Most wins",
+        'win_rate': f"📊 Best win rate (at least {MIN_PLAYS} games)",
+        'plays': "🎮 Most games played",
+    }
+    try:
+        board = get_leaderboard()
+        for board_name in BOARDS:
+            print(f"\n{titles[board_name]}")
+            entries = board.top(board_name, count)
+            if not entries:
+                print("   No players yet")
+            for entry in entries:
+                print(f"  {entry['rank']:>3}. {entry['username']:<20} "
+                      f"{entry['wins']:>5} wins {entry['plays']:>6} games {entry['win_rate']:>6.1f}%")
+        print()
+    except (OSError, UserStoreError) as e:
+        print(f"Error loading leaderboard: {e}")
+
+def resume_game() -> None:
+    """
+    Continue the logged-in player's saved game (logging in first if needed)
+    """
+    if not login_signup.current_user and not login():
+        return
+    snapshot = get_snapshot_store().load(login_signup.current_user['username'])
+    if snapshot is None:
+        print("No saved game to resume.")
+        return
+    game = HangmanGame()
+    game.run(snapshot)
+
 def main_game() -> None:
     """
     Main game function to handle game logic
@@ -33,8 +73,10 @@ def main_game() -> None:
             print("1. Quick Game")
             print("2. Login")
             print("3. Register")
-            print("4. Quit")
-            choice: str = input("Enter your choice (1-4):\n")
+            print("4. Leaderboard")
+            print("5. Resume game")
+            print("6. Quit")
+            choice: str = input("Enter your choice (1-6):\n")
             if choice == '1':
                 game = HangmanGame()
                 game.run()
@@ -52,11 +94,15 @@ def main_game() -> None:
                     return
                 # Logic for registration
             elif choice == '4':
+                display_leaderboard()
+            elif choice == '5':
+                resume_game()
+            elif choice == '6':
                 print(f"Good bye! {name}")
                 exit()
             else:
-                print("Invalid choice. Please select a valid option (1-4).")
+                print("Invalid choice. Please select a valid option (1-6).")
         except ValueError:
-            print("Invalid input. Please enter a number between 1 and 4.")
+            print("Invalid input. Please enter a number between 1 and 6.")
             continue
 
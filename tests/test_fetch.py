@@ -0,0 +1,47 @@
+# test_fetch.py
+# Batched WORD_API fetching against the local stub server
+
+import os
+import pytest
+import retrieve_word_fn
+from benchmarks.stub_api import StubWordServer
+from circuit_breaker import CircuitBreaker
+from word_cache import WordCache
+
+
+@pytest.fixture
+def stub(tmp_path, monkeypatch):
+    with StubWordServer(latency=0.0) as server:
+        monkeypatch.setattr(retrieve_word_fn, 'WORD_API', server.url)
+        monkeypatch.setattr(retrieve_word_fn, 'OFFLINE', False)
+        monkeypatch.setattr(retrieve_word_fn, 'breaker', CircuitBreaker())
+        monkeypatch.setattr(retrieve_word_fn, 'word_cache',
+                            WordCache(os.path.join(str(tmp_path), "word_cache.db")))
+        retrieve_word_fn._word_buffer.clear()
+        yield server
+        retrieve_word_fn._word_buffer.clear()
+        retrieve_word_fn.word_cache.close()
+
+
+def test_one_request_per_batch(stub, monkeypatch):
+    monkeypatch.setattr(retrieve_word_fn, 'BATCH_SIZE', 10)
+    words = [retrieve_word_fn.fetch_remote_word(6) for _ in range(25)]
+    assert all(word is not None and len(word) == 6 for word in words)
+    assert stub.requests_served == 3
+
+
+def test_fetched_words_are_cached(stub):
+    words = retrieve_word_fn.fetch_words(7, number=5)
+    assert len(words) == 5
+    assert retrieve_word_fn.word_cache.count(7) == len(set(words))
+
+
+def test_failing_api_opens_the_breaker(stub):
+    stub.failing = True
+    for _ in range(retrieve_word_fn.breaker.failure_threshold):
+        assert retrieve_word_fn.fetch_words(6) == []
+    served = stub.requests_served
+    assert retrieve_word_fn.fetch_words(6) == []
+    assert stub.requests_served == served
+    # retrieve_word still answers, from local words
+    assert len(retrieve_word_fn.retrieve_word(6)) == 6
@@ -0,0 +1,46 @@
+# test_file_lock.py
+# FileLock must serialise read-modify-write cycles across processes and threads
+
+import multiprocessing
+import os
+import threading
+from file_lock import FileLock
+
+
+def increment(path: str, times: int) -> None:
+    lock = FileLock(path)
+
+    def work() -> None:
+        for _ in range(times):
+            with lock:
+                with open(path) as file:
+                    count = int(file.read())
+                with open(path, 'w') as file:
+                    file.write(str(count + 1))
+
+    threads = [threading.Thread(target=work) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_counter_under_lock(tmp_path):
+    path = str(tmp_path / "counter")
+    with open(path, 'w') as file:
+        file.write("0")
+    procs = [multiprocessing.Process(target=increment, args=(path, 100)) for _ in range(4)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+    with open(path) as file:
+        assert int(file.read()) == 4 * 2 * 100
+
+
+def test_lock_is_reentrant(tmp_path):
+    lock = FileLock(str(tmp_path / "data"))
+    with lock:
+        with lock:
+            pass
+    assert os.path.exists(str(tmp_path / "data.lock"))
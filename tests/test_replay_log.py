@@ -0,0 +1,79 @@
+# test_replay_log.py
+# Replay log round trip, and concurrent writers creating a new log
+
+import multiprocessing
+import os
+import time
+import replay_log
+from engine import CORRECT, INCORRECT
+
+WRITERS: int = 4
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "replay.log")
+    writer = replay_log.ReplayWriter(path, buffer_size=64)
+    first = writer.start_game('beginner', "apple", [0, 4])
+    first.guess('p', CORRECT)
+    second = writer.start_game('professional', "lighthouse", [])
+    first.guess('z', INCORRECT)
+    second.guess('h', CORRECT)
+    writer.flush()
+
+    start, guesses = replay_log.find_game(first.game_id, path)
+    assert (start.difficulty, start.word, start.hints) == ('beginner', "apple", [0, 4])
+    assert [(guess.letter, guess.status) for guess in guesses] == [('p', CORRECT), ('z', INCORRECT)]
+    assert len(list(replay_log.read_records(path))) == 5
+
+
+def test_torn_final_record_is_ignored(tmp_path):
+    path = str(tmp_path / "replay.log")
+    writer = replay_log.ReplayWriter(path)
+    writer.start_game('beginner', "apple", []).guess('a', CORRECT)
+    writer.flush()
+    with open(path, 'ab') as file:
+        file.write(b"\x01\x02\x03")
+    assert len(list(replay_log.read_records(path))) == 2
+
+
+def write_games(path: str, barrier: multiprocessing.Barrier) -> None:
+    writer = replay_log.ReplayWriter(path)
+    writer.start_game('intermediate', "banana", [1]).guess('n', CORRECT)
+    # Widen the gap between opening the log and writing to it (this process only),
+    # so every writer opens the new log before any of them has written
+    write = os.write
+
+    def slow_write(fd: int, data: bytes) -> int:
+        time.sleep(0.05)
+        return write(fd, data)
+
+    os.write = slow_write
+    barrier.wait()
+    writer.flush()
+
+
+def test_concurrent_creation_writes_one_header(tmp_path):
+    path = str(tmp_path / "replay.log")
+    barrier = multiprocessing.Barrier(WRITERS)
+    procs = [multiprocessing.Process(target=write_games, args=(path, barrier))
+             for _ in range(WRITERS)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+    with open(path, 'rb') as file:
+        assert file.read().count(replay_log.MAGIC) == 1
+    assert len(list(replay_log.read_records(path))) == WRITERS * 2
+
+
+def test_reader_skips_a_second_header(tmp_path):
+    path = str(tmp_path / "replay.log")
+    writer = replay_log.ReplayWriter(path)
+    writer.start_game('beginner', "apple", []).guess('a', CORRECT)
+    writer.flush()
+    with open(path, 'rb') as file:
+        data = file.read()
+    # A log written by a version that could race on the header
+    with open(path, 'ab') as file:
+        file.write(data)
+    assert len(list(replay_log.read_records(path))) == 4
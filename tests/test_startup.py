@@ -0,0 +1,15 @@
+# test_startup.py
+# Offline startup must stay within its import-time budget and never load the HTTP stack
+
+from benchmarks import run
+
+
+def test_offline_startup_within_budget():
+    results = run.bench_startup(repeat=5)
+    assert run.startup_problems(results, run.STARTUP_BUDGET) == []
+
+
+def test_online_startup_defers_the_http_stack():
+    # requests is imported on the first network call, not by `import main`
+    results = run.bench_startup(repeat=1)
+    assert results['startup.import_main[online]']['http_modules'] == []
@@ -0,0 +1,960 @@
+# user_store.py
+# Pluggable storage backends for user accounts and stats
+#
+# Pick a backend with the HANGMAN_USER_STORE environment variable
+# ("sqlite", "json", "journal" or "sharded").
+#
+# Maintenance commands:
+#   python user_store.py migrate [users.json] [users.db]   copy users.json into SQLite
+#   python user_store.py compact [users.json]              fold the journal into users.json
+#   python user_store.py reshard SOURCE DEST_DIR N         split users.json (or a shard
+#                                                          directory) into N shard files
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from types import MappingProxyType
+from typing import Mapping, Optional
+from file_lock import FileLock
+import metrics
+
+USERS_FILE: str = os.environ.get("HANGMAN_USERS_FILE", "users.json")
+USERS_DB: str = os.environ.get("HANGMAN_USERS_DB", "users.db")
+USERS_DIR: str = os.environ.get("HANGMAN_USERS_DIR", "users.d")
+USER_SHARDS: int = int(os.environ.get("HANGMAN_USER_SHARDS", "16"))
+USER_STORE_BACKEND: str = os.environ.get("HANGMAN_USER_STORE", "sqlite")
+
+# Window in milliseconds for merging concurrent stats updates (JSON backend)
+GROUP_COMMIT_MS: float = float(os.environ.get("HANGMAN_GROUP_COMMIT_MS", "0"))
+
+# Fields every user record has, with their types
+REQUIRED_FIELDS: dict[str, type] = {'password': str, 'wins': int, 'losses': int, 'plays': int}
+
+
+class UserStoreError(Exception):
+    """Raised when a backend can't read or write its storage"""
+
+
+def new_user_record(password: str) -> dict:
+    return {'password': password, 'wins': 0, 'losses': 0, 'plays': 0}
+
+
+def normalize_user_record(user_data: dict) -> dict:
+    """Ensure required fields exist and have the right types (in place)"""
+    for field, expected_type in REQUIRED_FIELDS.items():
+        if field not in user_data:
+            user_data[field] = 0 if expected_type == int else ""
+        elif not isinstance(user_data[field], expected_type):
+            try:
+                user_data[field] = expected_type(user_data[field])
+            except (ValueError, TypeError):
+                user_data[field] = 0 if expected_type == int else ""
+    return user_data
+
+
+def apply_result(user_data: dict, won: bool) -> dict:
+    """Count one finished game on a user record (in place)"""
+    user_data['plays'] = int(user_data.get('plays', 0)) + 1
+    if won:
+        user_data['wins'] = int(user_data.get('wins', 0)) + 1
+    else:
+        user_data['losses'] = int(user_data.get('losses', 0)) + 1
+    return user_data
+
+
+def parse_users(text: str) -> dict[str, dict]:
+    """Parse and validate the contents of a users file"""
+    try:
+        data = json.loads(text) if text.strip() else {}
+    except json.JSONDecodeError as e:
+        print(f"Error loading user data: {e}. Creating new file.")
+        return {}
+
+    # Validate data structure
+    if not isinstance(data, dict):
+        print("Warning: Invalid user data format. Creating new file.")
+        return {}
+
+    # Validate each user entry
+    for username, user_data in data.items():
+        if not isinstance(user_data, dict):
+            print(f"Warning: Invalid data for user {username}. Skipping.")
+            continue
+        normalize_user_record(user_data)
+    return data
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """Write a file via a temporary file and rename, so readers never see it half-written"""
+    temp_path: str = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+
+# Validated users per JSON path, keyed on (mtime_ns, size, inode) of the file
+_users_cache: dict[str, tuple[tuple, dict[str, dict]]] = {}
+users_cache_stats: dict[str, int] = {'hits': 0, 'reloads': 0}
+
+
+def _file_key(path: str) -> tuple:
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def _copy_users(users: Mapping[str, dict]) -> dict[str, dict]:
+    """Copy deep enough that callers can modify records without touching the cache"""
+    return {name: dict(data) if isinstance(data, dict) else data for name, data in users.items()}
+
+
+class UserStore:
+    """Interface every user storage backend implements"""
+
+    def get_user(self, username: str) -> Optional[dict]:
+        """Return a copy of the user's record, or None if they don't exist"""
+        raise NotImplementedError
+
+    def add_user(self, username: str, password: str) -> bool:
+        """Create a user; False if the username is already taken"""
+        raise NotImplementedError
+
+    def record_result(self, username: str, won: bool) -> Optional[dict]:
+        """Count one game for the user and return the updated record (None if unknown)"""
+        raise NotImplementedError
+
+    def all_users(self) -> dict[str, dict]:
+        """Return every user record keyed by username"""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class JsonUserStore(UserStore):
+    """All users in a single JSON file, read and rewritten whole
+
+    Changes are made under an fcntl lock so several processes can share the
+    file without losing updates. With a group_commit_window (seconds), a
+    result is appended to `<path>.queue` under a short lock of its own. The
+    process (or thread) whose result opened the queue waits out the window
+    and then applies everything queued by anyone in one rewrite; the others
+    wait for that rewrite instead of making their own.
+
+    Before applying, the queue is renamed to `<path>.applying` next to a
+    stamp of the users file's identity; if a crash leaves it behind and the
+    users file is unchanged, the next writer applies it instead of losing it.
+    """
+
+    def __init__(self, path: str = USERS_FILE, group_commit_window: float = 0.0) -> None:
+        self.path: str = path
+        self.group_commit_window: float = group_commit_window
+        self.lock = FileLock(path)
+        self.queue_path: str = f"{path}.queue"
+        self.applying_path: str = f"{path}.applying"
+        self.stamp_path: str = f"{path}.applying.stamp"
+        self.queue_lock = FileLock(self.queue_path)
+        # Records of queued results applied by this process's last write, by ticket
+        self._applied: dict[str, Optional[dict]] = {}
+        # Rewrites this process made and the results they carried
+        self.commit_stats: dict[str, int] = {'writes': 0, 'results': 0}
+
+    def load(self) -> Mapping[str, dict]:
+        """Load and validate the user file ({} if missing or unreadable)
+
+        The validated result is cached per process and reused until the file's
+        mtime, size or inode changes, e.g. when another process saves it. It is
+        returned as a read-only view of the cache, so a hit costs the same at
+        any size: copy a record (or dict(users)) before changing it.
+        """
+        try:
+            key: tuple = _file_key(self.path)
+        except FileNotFoundError:
+            _users_cache.pop(self.path, None)
+            return MappingProxyType({})
+
+        start: float = time.perf_counter()
+        cached = _users_cache.get(self.path)
+        if cached is not None and cached[0] == key:
+            users_cache_stats['hits'] += 1
+            metrics.observe("hangman_users_load_seconds", time.perf_counter() - start, source="cache")
+            return MappingProxyType(cached[1])
+
+        try:
+            with open(self.path, 'r') as file:
+                text: str = file.read()
+            data = parse_users(text)
+        except (FileNotFoundError, TypeError, KeyError) as e:
+            print(f"Error loading user data: {e}. Creating new file.")
+            return MappingProxyType({})
+        users_cache_stats['reloads'] += 1
+        _users_cache[self.path] = (key, data)
+        metrics.inc("hangman_users_load_bytes_total", len(text))
+        metrics.observe("hangman_users_load_seconds", time.perf_counter() - start, source="file")
+        return MappingProxyType(data)
+
+    def save(self, users_data: Mapping[str, dict]) -> None:
+        """Rewrite the whole user file (atomically, so a crash can't truncate it)"""
+        start: float = time.perf_counter()
+        try:
+            users: dict[str, dict] = _copy_users(users_data)
+            data: bytes = json.dumps(users, indent=2).encode()
+            write_atomic(self.path, data)
+            _users_cache[self.path] = (_file_key(self.path), users)
+        except (IOError, TypeError, ValueError) as e:
+            raise UserStoreError(str(e)) from e
+        metrics.inc("hangman_users_save_bytes_total", len(data))
+        metrics.observe("hangman_users_save_seconds", time.perf_counter() - start)
+
+    def get_user(self, username: str) -> Optional[dict]:
+        user_data = self.load().get(username)
+        return dict(user_data) if isinstance(user_data, dict) else None
+
+    def add_user(self, username: str, password: str) -> bool:
+        with self.lock:
+            # Write queued results first, so a crashed batch is never overwritten
+            self._commit([])
+            users = dict(self.load())
+            if username in users:
+                return False
+            users[username] = new_user_record(password)
+            self.save(users)
+            return True
+
+    def record_result(self, username: str, won: bool) -> Optional[dict]:
+        if self.group_commit_window <= 0:
+            return self._commit([(username, won)])[0]
+
+        ticket, batch = self._queue_result(username, won)
+        taken: bool = False
+        if batch == ticket:
+            # Give other processes' results a moment to queue up, then write them all at once
+            time.sleep(self.group_commit_window)
+        else:
+            # Wait for the leader to take the queue (or to have died: then write it ourselves)
+            deadline: float = time.monotonic() + 2 * self.group_commit_window
+            while time.monotonic() < deadline and not taken:
+                time.sleep(self.group_commit_window / 10)
+                taken = self._queue_batch() != batch
+        with self.lock:
+            # Once our batch was taken, leave results queued since for their own leader
+            self._commit([], take_queue=not taken)
+            if ticket in self._applied:
+                return self._applied[ticket]
+            # Another process already wrote it as part of its batch
+            return self.get_user(username)
+
+    def _queue_result(self, username: str, won: bool) -> tuple[str, str]:
+        """Append a result to the shared queue
+
+        Returns its ticket and the batch it joined, named by the first ticket
+        in the queue (its own when this caller leads the batch).
+        """
+        ticket: str = os.urandom(8).hex()
+        line: bytes = (json.dumps([ticket, username, int(won)]) + "\n").encode()
+        try:
+            with self.queue_lock, open(self.queue_path, 'a+b') as file:
+                batch: str = ticket
+                if file.tell() > 0:
+                    file.seek(0)
+                    batch = self._ticket(file.readline()) or ticket
+                file.write(line)
+                return ticket, batch
+        except OSError as e:
+            raise UserStoreError(str(e)) from e
+
+    def _queue_batch(self) -> Optional[str]:
+        """The batch now being queued (None if the queue is empty)"""
+        try:
+            with open(self.queue_path, 'rb') as file:
+                return self._ticket(file.readline())
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _ticket(line: bytes) -> Optional[str]:
+        try:
+            return str(json.loads(line)[0])
+        except (ValueError, TypeError, IndexError):
+            return None
+
+    def _stamp(self) -> Optional[list]:
+        """Identity of the users file as it is now (None if missing)"""
+        try:
+            return list(_file_key(self.path))
+        except FileNotFoundError:
+            return None
+
+    def _take_queued(self, take_queue: bool = True) -> tuple[list[tuple[str, str, bool]], bool]:
+        """Queued (ticket, username, won) results to apply, and whether they are a
+        batch left by a writer that crashed before saving (caller holds self.lock)"""
+        recovered: bool = os.path.exists(self.applying_path)
+        if recovered:
+            try:
+                with open(self.stamp_path, 'r') as file:
+                    stamp = json.load(file)
+            except (FileNotFoundError, ValueError):
+                stamp = False
+            if stamp != self._stamp():
+                # The users file changed since: that writer saved before crashing
+                os.remove(self.applying_path)
+                recovered = False
+
+        if not recovered:
+            if not take_queue:
+                return [], False
+            with self.queue_lock:
+                try:
+                    if os.path.getsize(self.queue_path) == 0:
+                        return [], False
+                except FileNotFoundError:
+                    return [], False
+                # Stamp first, then take the whole queue with one rename
+                write_atomic(self.stamp_path, json.dumps(self._stamp()).encode())
+                os.replace(self.queue_path, self.applying_path)
+
+        with open(self.applying_path, 'rb') as file:
+            data: bytes = file.read()
+        queued: list[tuple[str, str, bool]] = []
+        for line in data.splitlines():
+            try:
+                ticket, username, won = json.loads(line)
+                queued.append((str(ticket), str(username), bool(won)))
+            except (ValueError, TypeError):
+                # A torn line from a process that died mid-append
+                continue
+        return queued, recovered
+
+    def _commit(self, updates: list[tuple[str, bool]],
+                take_queue: bool = True) -> list[Optional[dict]]:
+        """Apply stats updates, plus any queued by group commit, with one locked read-modify-write
+
+        Records for queued results end up in self._applied, keyed by ticket.
+        """
+        with self.lock:
+            try:
+                queued, recovered = self._take_queued(take_queue)
+            except OSError as e:
+                raise UserStoreError(str(e)) from e
+            if recovered:
+                # Finish the crashed batch on its own, then carry on as usual
+                self._apply(queued, [])
+                applied: dict[str, Optional[dict]] = self._applied
+                results = self._commit(updates, take_queue)
+                self._applied.update(applied)
+                return results
+            return self._apply(queued, updates)
+
+    def _apply(self, queued: list[tuple[str, str, bool]],
+               updates: list[tuple[str, bool]]) -> list[Optional[dict]]:
+        pending: list[tuple[str, str, bool]] = queued + [("", name, won) for name, won in updates]
+        self._applied = {}
+        if not pending:
+            return []
+
+        # Only the records being changed are copied out of the cache
+        users = dict(self.load())
+        results: list[Optional[dict]] = []
+        for _, username, won in pending:
+            if isinstance(users.get(username), dict):
+                users[username] = apply_result(dict(users[username]), won)
+                results.append(dict(users[username]))
+            else:
+                results.append(None)
+        if any(result is not None for result in results):
+            self.save(users)
+            self.commit_stats['writes'] += 1
+            self.commit_stats['results'] += len(pending)
+        if queued:
+            try:
+                os.remove(self.applying_path)
+            except OSError as e:
+                raise UserStoreError(str(e)) from e
+        self._applied = {ticket: result for (ticket, _, _), result in zip(queued, results)}
+        return results[len(queued):]
+
+    def all_users(self) -> dict[str, dict]:
+        return {name: data for name, data in self.load().items() if isinstance(data, dict)}
+
+
+class JournalUserStore(UserStore):
+    """users.json snapshot plus an append-only journal of changes since it was written
+
+    Registrations and game results are appended to `<path>.journal` as one
+    small JSON line each, and fsync'd in batches. The in-memory user map is
+    the snapshot with the journal replayed on top. compact() folds the
+    journal into a new snapshot written with write_atomic.
+
+    The journal's first line names the SHA-1 of the snapshot it applies to,
+    so if a crash leaves a new snapshot next to an old journal, the old
+    journal is ignored instead of being counted twice; the replacement
+    journal is written to `<path>.journal.next` before the snapshot is
+    renamed, so records carried over by compact() are never lost either.
+
+    Appends happen under an fcntl lock, and before each operation the store
+    replays whatever other processes appended since it last looked.
+    """
+
+    def __init__(self, path: str = USERS_FILE, fsync_every: int = 16,
+                 fsync_interval: float = 1.0, compact_after: int = 1000) -> None:
+        self.path: str = path
+        self.journal_path: str = f"{path}.journal"
+        self.next_journal_path: str = f"{path}.journal.next"
+        self.fsync_every: int = fsync_every
+        self.fsync_interval: float = fsync_interval
+        self.compact_after: int = compact_after
+        self.lock = FileLock(path)
+        self._lock = threading.RLock()
+        self._users: Optional[dict[str, dict]] = None
+        self._journal = None
+        # Inode of the journal we're reading and how far into it we've replayed
+        self._journal_ino: int = 0
+        self._offset: int = 0
+        # Bumped whenever we switch journals; inode numbers alone can be reused
+        self._generation: int = 0
+        self._journal_records: int = 0
+        self._unsynced: int = 0
+        self._last_sync: float = time.monotonic()
+        self._compacting: bool = False
+        self._compact_thread: Optional[threading.Thread] = None
+        # Records appended while compact() is writing a snapshot
+        self._tail: Optional[list] = None
+
+    def _read_snapshot(self) -> tuple[dict[str, dict], str]:
+        """Return the snapshot users and the SHA-1 of its bytes"""
+        try:
+            with open(self.path, 'rb') as file:
+                raw: bytes = file.read()
+        except FileNotFoundError:
+            raw = b""
+        return parse_users(raw.decode()), hashlib.sha1(raw).hexdigest()
+
+    def _ensure_loaded(self) -> dict[str, dict]:
+        """Load snapshot + journal, or replay records other processes appended since"""
+        with self.lock:
+            if self._users is not None:
+                self._catch_up()
+            if self._users is not None:
+                return self._users
+
+            users, snapshot_hash = self._read_snapshot()
+            for candidate in (self.journal_path, self.next_journal_path):
+                if self._open_journal(candidate, users, snapshot_hash):
+                    break
+
+            if self._users is None:
+                # Missing journal, or one already folded into the snapshot
+                self._users = users
+                self._start_journal(snapshot_hash)
+            elif self._journal is None:
+                self._journal = open(self.journal_path, 'ab')
+            return self._users
+
+    def _open_journal(self, path: str, users: dict[str, dict], snapshot_hash: str) -> bool:
+        """Replay a journal if it belongs to the snapshot; False if it doesn't"""
+        try:
+            with open(path, 'rb') as file:
+                header = self._parse_line(file.readline())
+                if not isinstance(header, dict) or header.get('snapshot') != snapshot_hash:
+                    return False
+                if path != self.journal_path:
+                    # compact() stopped between its renames; finish the job
+                    os.replace(path, self.journal_path)
+                self._users = users
+                self._generation += 1
+                self._journal_records = 0
+                self._offset = file.tell()
+                self._journal_ino = os.fstat(file.fileno()).st_ino
+                self._replay(file)
+                return True
+        except FileNotFoundError:
+            return False
+
+    def _replay(self, file) -> list:
+        """Apply complete journal lines from the file's position; returns the records"""
+        records: list = []
+        for line in file:
+            if not line.endswith(b"\n"):
+                # Another process is mid-write; pick it up next time
+                break
+            self._offset += len(line)
+            record = self._parse_line(line)
+            if record is not None:
+                self._apply(self._users, record)
+                self._journal_records += 1
+                records.append(record)
+        return records
+
+    def _catch_up(self) -> None:
+        """Replay journal records written by other processes (caller holds the file lock)"""
+        try:
+            stat = os.stat(self.journal_path)
+        except FileNotFoundError:
+            stat = None
+        if stat is None or stat.st_ino != self._journal_ino:
+            # Another process compacted: start again from the new snapshot
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            self._users = None
+            return
+        if stat.st_size > self._offset:
+            with open(self.journal_path, 'rb') as file:
+                file.seek(self._offset)
+                records = self._replay(file)
+            if self._tail is not None:
+                self._tail.extend(records)
+
+    @staticmethod
+    def _parse_line(line: bytes):
+        """Decode one journal line (None for a torn or corrupt write)"""
+        try:
+            return json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return None
+
+    @staticmethod
+    def _apply(users: dict[str, dict], record) -> None:
+        if not isinstance(record, list) or len(record) != 3:
+            return
+        op, username, value = record
+        if op == 'add' and username not in users:
+            users[username] = new_user_record(value)
+        elif op == 'result' and isinstance(users.get(username), dict):
+            apply_result(users[username], bool(value))
+
+    def _start_journal(self, snapshot_hash: str) -> None:
+        """Replace the journal with an empty one for the given snapshot"""
+        data: bytes = (json.dumps({'snapshot': snapshot_hash}) + "\n").encode()
+        self._write_next_journal(data)
+        self._install_next_journal(len(data), 0)
+
+    def _write_next_journal(self, data: bytes) -> None:
+        """Write (and fsync) the journal that _install_next_journal will switch to"""
+        with open(self.next_journal_path, 'wb') as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _install_next_journal(self, size: int, records: int) -> None:
+        """Rename the next journal into place and append to it from now on"""
+        if self._journal is not None:
+            self._journal.close()
+        os.replace(self.next_journal_path, self.journal_path)
+        self._journal = open(self.journal_path, 'ab')
+        self._journal_ino = os.fstat(self._journal.fileno()).st_ino
+        self._generation += 1
+        self._offset = size
+        self._journal_records = records
+        self._unsynced = 0
+
+    def _append(self, record: list) -> None:
+        """Write one record (caller holds the file lock and has caught up)"""
+        line: bytes = (json.dumps(record) + "\n").encode()
+        try:
+            self._journal.write(line)
+            self._journal.flush()
+            self._offset += len(line)
+            if self._tail is not None:
+                self._tail.append(record)
+            self._journal_records += 1
+            self._unsynced += 1
+            if (self._unsynced >= self.fsync_every
+                    or time.monotonic() - self._last_sync >= self.fsync_interval):
+                self.sync()
+        except (IOError, TypeError, ValueError) as e:
+            raise UserStoreError(str(e)) from e
+
+        if self._journal_records >= self.compact_after and not self._compacting:
+            self._compacting = True
+            self._compact_thread = threading.Thread(target=self._background_compact, daemon=True)
+            self._compact_thread.start()
+
+    def sync(self) -> None:
+        """fsync journal records written since the last sync"""
+        with self._lock:
+            if self._journal is not None and self._unsynced:
+                os.fsync(self._journal.fileno())
+            self._unsynced = 0
+            self._last_sync = time.monotonic()
+
+    def compact(self) -> None:
+        """Write the current users as a new snapshot and start an empty journal
+
+        The snapshot is serialised without holding any lock, so games (in this
+        or other processes) can keep recording results meanwhile; those
+        records are carried over into the new journal.
+        """
+        with self._lock, self.lock:
+            users = self._ensure_loaded()
+            frozen: dict[str, dict] = {name: dict(data) for name, data in users.items()}
+            frozen_generation: int = self._generation
+            self._tail = []
+
+        snapshot_temp: str = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            raw: bytes = json.dumps(frozen, indent=2).encode()
+            with open(snapshot_temp, 'wb') as file:
+                file.write(raw)
+                file.flush()
+                os.fsync(file.fileno())
+
+            with self._lock, self.lock:
+                self._catch_up()
+                if self._users is None or self._generation != frozen_generation:
+                    # Someone else compacted while we were writing; keep theirs
+                    os.remove(snapshot_temp)
+                    self._ensure_loaded()
+                    return
+
+                lines: list[str] = [json.dumps({'snapshot': hashlib.sha1(raw).hexdigest()})]
+                lines += [json.dumps(record) for record in self._tail]
+                journal_data: bytes = ("\n".join(lines) + "\n").encode()
+
+                # If we stop between the two renames, the old journal no longer
+                # matches the snapshot and the next journal is picked up instead
+                self._write_next_journal(journal_data)
+                os.replace(snapshot_temp, self.path)
+                self._install_next_journal(len(journal_data), len(self._tail))
+        except (IOError, TypeError, ValueError) as e:
+            raise UserStoreError(str(e)) from e
+        finally:
+            self._tail = None
+
+    def _background_compact(self) -> None:
+        try:
+            self.compact()
+        except UserStoreError as e:
+            print(f"Error compacting user journal: {e}")
+        finally:
+            self._compacting = False
+
+    def get_user(self, username: str) -> Optional[dict]:
+        with self._lock:
+            user_data = self._ensure_loaded().get(username)
+            return dict(user_data) if isinstance(user_data, dict) else None
+
+    def add_user(self, username: str, password: str) -> bool:
+        with self._lock, self.lock:
+            users = self._ensure_loaded()
+            if username in users:
+                return False
+            self._append(['add', username, password])
+            users[username] = new_user_record(password)
+            return True
+
+    def record_result(self, username: str, won: bool) -> Optional[dict]:
+        with self._lock, self.lock:
+            users = self._ensure_loaded()
+            if not isinstance(users.get(username), dict):
+                return None
+            self._append(['result', username, int(won)])
+            return dict(apply_result(users[username], won))
+
+    def all_users(self) -> dict[str, dict]:
+        with self._lock:
+            users = self._ensure_loaded()
+            return {name: dict(data) for name, data in users.items() if isinstance(data, dict)}
+
+    def close(self) -> None:
+        if self._compact_thread is not None:
+            self._compact_thread.join()
+            self._compact_thread = None
+        with self._lock:
+            if self._journal is not None:
+                self.sync()
+                self._journal.close()
+                self._journal = None
+            self._users = None
+
+
+class ShardedUserStore(UserStore):
+    """Users split across N JSON shard files by a stable hash of the username
+
+    register, login and stats updates read and rewrite only the one shard
+    the user hashes to. Each shard is a JsonUserStore, so it gets the same
+    locking and mtime-validated cache. The shard count is recorded in
+    `<directory>/meta.json`.
+    """
+
+    def __init__(self, directory: str = USERS_DIR, shards: Optional[int] = None,
+                 migrate_from: Optional[str] = USERS_FILE) -> None:
+        self.directory: str = directory
+        meta_path: str = os.path.join(directory, "meta.json")
+
+        if not os.path.exists(meta_path):
+            if migrate_from and os.path.exists(migrate_from):
+                # First run: split the existing users.json
+                reshard(migrate_from, directory, shards or USER_SHARDS)
+            else:
+                write_shard_meta(directory, shards or USER_SHARDS)
+
+        try:
+            with open(meta_path, 'r') as file:
+                self.shard_count: int = int(json.load(file)['shards'])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            raise UserStoreError(f"Invalid shard metadata in {meta_path}: {e}") from e
+        if shards is not None and shards != self.shard_count:
+            raise UserStoreError(
+                f"{directory} has {self.shard_count} shards, not {shards}; reshard it first"
+            )
+
+        self._shards: list[JsonUserStore] = [
+            JsonUserStore(shard_path(directory, index)) for index in range(self.shard_count)
+        ]
+
+    def shard_for(self, username: str) -> JsonUserStore:
+        return self._shards[shard_index(username, self.shard_count)]
+
+    def get_user(self, username: str) -> Optional[dict]:
+        return self.shard_for(username).get_user(username)
+
+    def add_user(self, username: str, password: str) -> bool:
+        return self.shard_for(username).add_user(username, password)
+
+    def record_result(self, username: str, won: bool) -> Optional[dict]:
+        return self.shard_for(username).record_result(username, won)
+
+    def all_users(self) -> dict[str, dict]:
+        users: dict[str, dict] = {}
+        for shard in self._shards:
+            users.update(shard.all_users())
+        return users
+
+
+def shard_index(username: str, shard_count: int) -> int:
+    """Stable shard number for a username (unlike hash(), the same in every process)"""
+    return zlib.crc32(username.encode('utf-8')) % shard_count
+
+
+def shard_path(directory: str, index: int) -> str:
+    return os.path.join(directory, f"shard-{index:04d}.json")
+
+
+def write_shard_meta(directory: str, shards: int) -> None:
+    os.makedirs(directory, exist_ok=True)
+    write_atomic(os.path.join(directory, "meta.json"), json.dumps({'shards': shards}).encode())
+
+
+def reshard(source: str, directory: str, shards: int) -> int:
+    """Split a users.json file, or an existing shard directory, into `shards` shards
+
+    The new shards are built in a temporary directory and swapped in with
+    renames, so `directory` may be the source itself. Returns the number of users.
+    """
+    if shards < 1:
+        raise ValueError("shards must be at least 1")
+    if os.path.isdir(source):
+        users = ShardedUserStore(source, migrate_from=None).all_users()
+    else:
+        users = JsonUserStore(source).all_users()
+
+    grouped: list[dict[str, dict]] = [{} for _ in range(shards)]
+    for username, user_data in users.items():
+        grouped[shard_index(username, shards)][username] = user_data
+
+    building: str = f"{directory}.reshard-tmp"
+    shutil.rmtree(building, ignore_errors=True)
+    os.makedirs(building)
+    for index, shard_users in enumerate(grouped):
+        write_atomic(shard_path(building, index), json.dumps(shard_users, indent=2).encode())
+    # Written last: a directory without meta.json is never mistaken for a complete store
+    write_shard_meta(building, shards)
+
+    if os.path.exists(directory):
+        retired: str = f"{directory}.reshard-old"
+        shutil.rmtree(retired, ignore_errors=True)
+        os.replace(directory, retired)
+        os.replace(building, directory)
+        shutil.rmtree(retired, ignore_errors=True)
+    else:
+        os.replace(building, directory)
+    return len(users)
+
+
+class SqliteUserStore(UserStore):
+    """Users in a SQLite table keyed by username; stats updates touch one row"""
+
+    def __init__(self, path: str = USERS_DB, migrate_from: Optional[str] = USERS_FILE) -> None:
+        self.path: str = path
+        self._lock = threading.Lock()
+        try:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS users ("
+                " username TEXT PRIMARY KEY,"
+                " password TEXT NOT NULL,"
+                " wins INTEGER NOT NULL DEFAULT 0,"
+                " losses INTEGER NOT NULL DEFAULT 0,"
+                " plays INTEGER NOT NULL DEFAULT 0)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            raise UserStoreError(str(e)) from e
+
+        if migrate_from and os.path.exists(migrate_from):
+            self._migrate_once(migrate_from)
+
+    def _migrate_once(self, json_path: str) -> None:
+        """Import users.json the first time this database is opened"""
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'migrated_from'").fetchone()
+        if row is not None:
+            return
+        count: int = self.import_users(JsonUserStore(json_path).all_users())
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_from', ?)",
+                (os.path.abspath(json_path),),
+            )
+            self._conn.commit()
+        if count:
+            print(f"Migrated {count} users from {json_path} to {self.path}")
+
+    def import_users(self, users: dict[str, dict]) -> int:
+        """Insert users that don't exist yet; returns how many were added"""
+        rows = []
+        for username, user_data in users.items():
+            user_data = normalize_user_record(dict(user_data))
+            rows.append((username, user_data['password'], user_data['wins'],
+                         user_data['losses'], user_data['plays']))
+        with self._lock:
+            try:
+                before: int = self._conn.total_changes
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO users (username, password, wins, losses, plays)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.commit()
+                return self._conn.total_changes - before
+            except sqlite3.Error as e:
+                raise UserStoreError(str(e)) from e
+
+    def _fetch(self, username: str) -> Optional[dict]:
+        row = self._conn.execute(
+            "SELECT password, wins, losses, plays FROM users WHERE username = ?", (username,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {'password': row[0], 'wins': row[1], 'losses': row[2], 'plays': row[3]}
+
+    def get_user(self, username: str) -> Optional[dict]:
+        with self._lock:
+            try:
+                return self._fetch(username)
+            except sqlite3.Error as e:
+                raise UserStoreError(str(e)) from e
+
+    def add_user(self, username: str, password: str) -> bool:
+        with self._lock:
+            try:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO users (username, password) VALUES (?, ?)",
+                    (username, password),
+                )
+                self._conn.commit()
+                return cursor.rowcount == 1
+            except sqlite3.Error as e:
+                raise UserStoreError(str(e)) from e
+
+    def record_result(self, username: str, won: bool) -> Optional[dict]:
+        column: str = 'wins' if won else 'losses'
+        with self._lock:
+            try:
+                cursor = self._conn.execute(
+                    f"UPDATE users SET plays = plays + 1, {column} = {column} + 1"
+                    " WHERE username = ?",
+                    (username,),
+                )
+                self._conn.commit()
+                if cursor.rowcount == 0:
+                    return None
+                return self._fetch(username)
+            except sqlite3.Error as e:
+                raise UserStoreError(str(e)) from e
+
+    def all_users(self) -> dict[str, dict]:
+        with self._lock:
+            try:
+                rows = self._conn.execute(
+                    "SELECT username, password, wins, losses, plays FROM users"
+                ).fetchall()
+            except sqlite3.Error as e:
+                raise UserStoreError(str(e)) from e
+        return {
+            row[0]: {'password': row[1], 'wins': row[2], 'losses': row[3], 'plays': row[4]}
+            for row in rows
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def migrate_json_to_sqlite(json_path: str = USERS_FILE, db_path: str = USERS_DB) -> int:
+    """Copy users from a JSON file into a SQLite store; returns how many were added"""
+    store = SqliteUserStore(db_path, migrate_from=None)
+    try:
+        return store.import_users(JsonUserStore(json_path).all_users())
+    finally:
+        store.close()
+
+
+def create_user_store(backend: str = USER_STORE_BACKEND) -> UserStore:
+    """Build the store for a backend name"""
+    if backend == "json":
+        return JsonUserStore(USERS_FILE, group_commit_window=GROUP_COMMIT_MS / 1000)
+    if backend == "journal":
+        return JournalUserStore(USERS_FILE)
+    if backend == "sharded":
+        return ShardedUserStore(USERS_DIR)
+    if backend == "sqlite":
+        return SqliteUserStore(USERS_DB)
+    raise ValueError(f"Unknown user store backend: {backend}")
+
+
+_user_store: Optional[UserStore] = None
+
+
+def get_user_store() -> UserStore:
+    """Return the shared store for the configured backend"""
+    global _user_store
+    if _user_store is None:
+        _user_store = create_user_store()
+    return _user_store
+
+
+def main(argv: list[str]) -> int:
+    if argv and argv[0] == "compact":
+        store = JournalUserStore(argv[1] if len(argv) > 1 else USERS_FILE)
+        store.compact()
+        store.close()
+        print(f"Compacted journal into {store.path}")
+        return 0
+    if argv and argv[0] == "reshard" and len(argv) == 4:
+        count: int = reshard(argv[1], argv[2], int(argv[3]))
+        print(f"Resharded {count} users into {argv[3]} shards in {argv[2]}")
+        return 0
+    if not argv or argv[0] != "migrate":
+        print("Usage: python user_store.py migrate [USERS_JSON] [USERS_DB]")
+        print("       python user_store.py compact [USERS_JSON]")
+        print("       python user_store.py reshard SOURCE DEST_DIR SHARDS")
+        return 1
+    json_path: str = argv[1] if len(argv) > 1 else USERS_FILE
+    db_path: str = argv[2] if len(argv) > 2 else USERS_DB
+    print(f"Migrated {migrate_json_to_sqlite(json_path, db_path)} users to {db_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,184 @@
+# word_cache.py
+# Persistent, length-indexed cache of words returned by WORD_API
+#
+# Reads are served from per-length word lists loaded once per process (one
+# range scan of the length index each); recency updates are kept in memory
+# and written back in batches, so handing out a word never opens a write
+# transaction.
+
+import atexit
+import os
+import random
+import sqlite3
+import threading
+import time
+from typing import Iterable, Optional
+
+CACHE_FILE: str = os.environ.get("HANGMAN_WORD_CACHE", "word_cache.db")
+
+# Most words kept on disk before the least recently used ones are evicted
+MAX_WORDS: int = 20000
+
+# Words not served or re-fetched for this long are dropped (None keeps them forever)
+MAX_AGE_SECONDS: Optional[float] = 90 * 24 * 60 * 60
+
+# Served words whose last_used is written back in one transaction
+TOUCH_BATCH: int = 256
+
+
+class WordCache:
+    """SQLite-backed word cache with LRU/age eviction, opened on first use"""
+
+    def __init__(self, path: str = CACHE_FILE, max_words: int = MAX_WORDS,
+                 max_age: Optional[float] = MAX_AGE_SECONDS) -> None:
+        self.path: str = path
+        self.max_words: int = max_words
+        self.max_age: Optional[float] = max_age
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        # Cached words per length, loaded on first use
+        self._by_length: dict[int, list[str]] = {}
+        # Words served since the last write-back, with when they were served
+        self._touched: dict[str, float] = {}
+        self._exit_hook: bool = False
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database and create the schema the first time it's needed"""
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS words ("
+                " word TEXT PRIMARY KEY,"
+                " length INTEGER NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS words_length ON words (length)")
+            conn.execute("CREATE INDEX IF NOT EXISTS words_last_used ON words (last_used)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def add_words(self, words: Iterable[str]) -> None:
+        """Store words, refreshing the timestamp of ones already cached"""
+        now: float = time.time()
+        rows = [(word, len(word), now) for word in words]
+        if not rows:
+            return
+        with self._lock:
+            try:
+                conn = self._connection()
+                self._write_touched(conn)
+                conn.executemany(
+                    "INSERT INTO words (word, length, last_used) VALUES (?, ?, ?)"
+                    " ON CONFLICT(word) DO UPDATE SET last_used = excluded.last_used",
+                    rows,
+                )
+                evicted: int = self._evict(conn)
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"Error saving words to cache: {e}")
+                evicted = 1
+            # Reload the changed lengths (every length after an eviction) when next needed
+            if evicted:
+                self._by_length.clear()
+            for _, length, _ in rows:
+                self._by_length.pop(length, None)
+
+    def _words(self, length: int) -> list[str]:
+        """Cached words of one length (caller holds the lock)"""
+        words: Optional[list[str]] = self._by_length.get(length)
+        if words is None:
+            try:
+                rows = self._connection().execute(
+                    "SELECT word FROM words WHERE length = ?", (length,)
+                ).fetchall()
+            except sqlite3.Error as e:
+                print(f"Error reading word cache: {e}")
+                return []
+            words = self._by_length[length] = [row[0] for row in rows]
+        return words
+
+    def random_word(self, length: int) -> Optional[str]:
+        """Return a random cached word of the given length, or None if there are none"""
+        with self._lock:
+            words: list[str] = self._words(length)
+            if not words:
+                return None
+            word: str = random.choice(words)
+            self._touch(word)
+            return word
+
+    def word_at(self, length: int, index: int) -> Optional[str]:
+        """The index-th cached word of the given length (None if out of range)"""
+        with self._lock:
+            words: list[str] = self._words(length)
+            if not 0 <= index < len(words):
+                return None
+            self._touch(words[index])
+            return words[index]
+
+    def _touch(self, word: str) -> None:
+        """Note that a word was served (caller holds the lock)"""
+        self._touched[word] = time.time()
+        if not self._exit_hook:
+            self._exit_hook = True
+            atexit.register(self.flush)
+        if len(self._touched) >= TOUCH_BATCH:
+            try:
+                conn = self._connection()
+                self._write_touched(conn)
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"Error updating word cache: {e}")
+
+    def _write_touched(self, conn: sqlite3.Connection) -> None:
+        if self._touched:
+            conn.executemany("UPDATE words SET last_used = ? WHERE word = ?",
+                             [(used, word) for word, used in self._touched.items()])
+            self._touched.clear()
+
+    def flush(self) -> None:
+        """Write back when buffered words were last served"""
+        with self._lock:
+            if not self._touched:
+                return
+            try:
+                conn = self._connection()
+                self._write_touched(conn)
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"Error updating word cache: {e}")
+
+    def count(self, length: Optional[int] = None) -> int:
+        """Number of cached words, optionally only those of one length"""
+        with self._lock:
+            if length is not None:
+                return len(self._words(length))
+            return self._connection().execute("SELECT COUNT(*) FROM words").fetchone()[0]
+
+    def _evict(self, conn: sqlite3.Connection) -> int:
+        """Drop expired words, then the least recently used ones above max_words; returns how many"""
+        before: int = conn.total_changes
+        if self.max_age is not None:
+            conn.execute("DELETE FROM words WHERE last_used < ?", (time.time() - self.max_age,))
+
+        excess: int = conn.execute("SELECT COUNT(*) FROM words").fetchone()[0] - self.max_words
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM words WHERE word IN"
+                " (SELECT word FROM words ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+        return conn.total_changes - before
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._by_length.clear()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Shared cache used by retrieve_word_fn
+word_cache = WordCache()
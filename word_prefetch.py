@@ -0,0 +1,116 @@
+import queue
+import threading
+from typing import Iterable, Optional
+import retrieve_word_fn
+from retrieve_word_fn import fetch_remote_word, get_local_word
+
+
+class WordPrefetcher:
+    """Keep a small queue of ready words per length, refilled in the background"""
+
+    def __init__(self, queue_size: int = 5, retry_delay: float = 5.0) -> None:
+        self.queue_size: int = queue_size
+        # Seconds to wait before retrying after the API fails
+        self.retry_delay: float = retry_delay
+        self.queues: dict[int, queue.Queue] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, lengths: Iterable[int]) -> None:
+        """Start prefetching words for the given lengths (safe to call repeatedly)"""
+        with self._lock:
+            for length in lengths:
+                if length not in self.queues:
+                    self.queues[length] = queue.Queue(maxsize=self.queue_size)
+
+            # Nothing to fetch offline; take_word serves local words
+            if retrieve_word_fn.OFFLINE:
+                return
+
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="word-prefetcher", daemon=True
+                )
+                self._thread.start()
+        self._wakeup.set()
+
+    def stop(self) -> None:
+        """Stop the background thread"""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def get_word(self, length: int) -> str:
+        """Return a prefetched word, falling back to the local list if none is ready"""
+        return self.take_word(length)[0]
+
+    def take_word(self, length: int) -> tuple[str, str]:
+        """Like get_word, but also say where the word came from ('network' or 'local')"""
+        word_queue: Optional[queue.Queue] = self.queues.get(length)
+        try:
+            if word_queue is None:
+                raise queue.Empty
+            word: str = word_queue.get_nowait()
+            source: str = 'network'
+            with self._lock:
+                self.hits += 1
+        except queue.Empty:
+            with self._lock:
+                self.misses += 1
+            # Never wait on the network here; the woken background thread refills the queue
+            word, source = get_local_word(length), 'local'
+
+        # Let the background thread top the queue back up
+        self._wakeup.set()
+        return word, source
+
+    def stats(self) -> dict[str, object]:
+        """Return hit/miss counters and the number of ready words per length"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'ready': {length: q.qsize() for length, q in self.queues.items()},
+            }
+
+    def _fill_once(self) -> bool:
+        """Fetch one word for every length that isn't full; False if the API failed"""
+        for length, word_queue in list(self.queues.items()):
+            if self._stopped.is_set():
+                return True
+            if word_queue.full():
+                continue
+            word: Optional[str] = fetch_remote_word(length)
+            if word is None:
+                return False
+            try:
+                word_queue.put_nowait(word)
+            except queue.Full:
+                pass
+        return True
+
+    def _needs_refill(self) -> bool:
+        return any(not q.full() for q in list(self.queues.values()))
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.clear()
+            ok: bool = self._fill_once()
+
+            if not ok:
+                # API is unavailable, back off before trying again
+                self._wakeup.wait(self.retry_delay)
+            elif not self._needs_refill():
+                # Everything is full, sleep until a word is taken
+                self._wakeup.wait()
+
+
+# Shared prefetcher used by the game
+prefetcher = WordPrefetcher()